@@ -0,0 +1,26 @@
+"""Benchmarks for blueprint.
+
+Run a benchmark with `python -m benchmarks.NAME` from the repo root.
+"""
+
+from timeit import Timer
+
+
+def best(func, repeat=5, min_time=0.2) -> float:
+    """Return the fastest time in seconds of a single call to func."""
+    timer = Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def report(title: str, rows: list[tuple[str, float]], baseline: str = None):
+    """Print a table of timings, relative to the baseline row if given."""
+    times = dict(rows)
+    base = times.get(baseline)
+    width = max(len(name) for name, _ in rows)
+
+    print(title)
+    for name, secs in rows:
+        ratio = f"  {base / secs:6.2f}x" if base else ""
+        print(f"  {name:<{width}}  {secs * 1e6:12.2f} us{ratio}")
@@ -0,0 +1,228 @@
+"""Time Project.make() and PythonProject.make() end to end and per step.
+
+The poetry and asdf executables are replaced by local stubs that sleep for a
+configurable time, so results do not depend on the network or on what is
+installed, and can be compared between commits.
+
+Usage:
+    python -m benchmarks.make run [--output FILE] [--repeat N] [--latency SECS]
+    python -m benchmarks.make compare BASELINE CURRENT [--threshold RATIO]
+"""
+
+import json
+import platform
+import sys
+from argparse import ArgumentParser
+from os import environ
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+bp = breakpoint
+
+# the poetry stub, {python} and {latency} are filled in
+POETRY = """#!{python}
+import sys, time
+from pathlib import Path
+
+args = sys.argv[1:]
+path = Path.cwd()
+if args[:1] == ["--directory"]:
+    path, args = Path(args[1]), args[2:]
+
+if args == ["--version"]:
+    print("Poetry (version 0.0.0+stub)")
+    sys.exit()
+
+time.sleep({latency}[args[0] if args[0] in ("lock", "install") else "default"])
+
+if args[:2] == ["env", "info"]:
+    print(path / ".venv")
+elif args == ["lock"]:
+    (path / "poetry.lock").write_text("# stub lock file\\n")
+"""
+
+# the asdf stub, {python}, {latency} and {pyroot} are filled in
+ASDF = """#!{python}
+import sys, time
+
+time.sleep({latency}["default"])
+if sys.argv[1:3] == ["where", "python"]:
+    print({pyroot!r})
+"""
+
+TYPES = {
+    "basic": {},
+    "python": {"python": True},
+}
+
+
+def install_stubs(root: Path, latency: float, resolve_latency: float) -> Path:
+    """Write the stub toolchain to root and return the directory to add to $PATH.
+
+    Arguments:
+        root (Path): directory to write the stubs to
+        latency (float): seconds that each stub call takes
+        resolve_latency (float): seconds that `poetry lock` and `poetry
+                                 install` take
+    """
+    bindir, pyroot = root / "bin", root / "python"
+    bindir.mkdir()
+    (pyroot / "bin").mkdir(parents=True)
+    (pyroot / "bin" / "python").symlink_to(sys.executable)
+
+    latencies = {
+        "default": latency,
+        "lock": resolve_latency,
+        "install": resolve_latency,
+    }
+    stubs = {"poetry": POETRY, "asdf": ASDF}
+    for name, source in stubs.items():
+        exe = bindir / name
+        exe.write_text(source.format(
+            python=sys.executable, latency=latencies, pyroot=str(pyroot)
+        ))
+        exe.chmod(0o755)
+
+    return bindir
+
+
+def measure(kind: str, dest: Path) -> dict:
+    """Make one project of kind in dest and return the seconds each step took."""
+    from blueprint.project_factory import ProjectFactory
+    from blueprint.sources import SourceIndex
+    from blueprint.toolchain import toolchain
+    from blueprint.trace import tracer
+
+    toolchain.clear()
+    SourceIndex.clear()
+    tracer.clear()
+    tracer.enabled = True
+    try:
+        ProjectFactory("bench-project", dest, **TYPES[kind]).make()
+    finally:
+        tracer.enabled = False
+
+    times = {}
+    for event in tracer.events:
+        if event["cat"] in ("project", "step"):
+            times[event["name"]] = event["dur"] / 1e6
+    return times
+
+
+def run(repeat: int, latency: float, resolve_latency: float) -> dict:
+    """Return the fastest time of each step for each project type."""
+    results = {}
+
+    with TemporaryDirectory(prefix="blueprint-bench-") as tmp:
+        tmp = Path(tmp)
+        bindir = install_stubs(tmp, latency, resolve_latency)
+        saved = environ.copy()
+
+        try:
+            environ["PATH"] = f"{bindir}:{environ['PATH']}"
+            environ["ASDF_DATA_DIR"] = str(tmp / "asdf")
+            environ.pop("BLUEPRINT_LOOKUP_CACHE", None)
+
+            for kind in TYPES:
+                best = {}
+                for i in range(repeat):
+                    # start from cold caches every time
+                    dest = tmp / f"{kind}-{i}"
+                    dest.mkdir()
+                    environ["BLUEPRINT_CACHE_DIR"] = str(tmp / f"cache-{kind}-{i}")
+
+                    for name, secs in measure(kind, dest).items():
+                        best[name] = min(secs, best.get(name, secs))
+                results[kind] = best
+        finally:
+            environ.clear()
+            environ.update(saved)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "latency": latency,
+            "resolve_latency": resolve_latency,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float, min_delta: float):
+    """Print each step's change and return the steps that regressed.
+
+    A step regresses if it is more than threshold (a ratio) and min_delta
+    seconds slower than in the baseline.
+    """
+    regressions = []
+
+    for kind, steps in current["results"].items():
+        print(kind)
+        base_steps = baseline["results"].get(kind, {})
+        width = max(len(name) for name in steps)
+
+        for name, secs in sorted(steps.items(), key=lambda item: -item[1]):
+            base = base_steps.get(name)
+            if base is None:
+                print(f"  {name:<{width}}  {secs * 1e3:10.2f} ms  (new)")
+                continue
+
+            change = (secs - base) / base if base else 0.0
+            flag = ""
+            if change > threshold and secs - base > min_delta:
+                flag = "  REGRESSION"
+                regressions.append(f"{kind}.{name}")
+            print(f"  {name:<{width}}  {secs * 1e3:10.2f} ms  {change:+7.1%}{flag}")
+
+    return regressions
+
+
+def main(argv=None):
+    """Run or compare benchmarks."""
+    parser = ArgumentParser(prog="python -m benchmarks.make", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_cmd = commands.add_parser("run", help="time making each project type")
+    run_cmd.add_argument("--output", "-o", type=Path,
+                         help="write the results to this JSON file")
+    run_cmd.add_argument("--repeat", "-r", type=int, default=3,
+                         help="times to make each project type (default: 3)")
+    run_cmd.add_argument("--latency", type=float, default=0.02,
+                         help="seconds each stub call takes (default: 0.02)")
+    run_cmd.add_argument("--resolve-latency", type=float, default=0.2,
+                         help="seconds poetry lock/install take (default: 0.2)")
+
+    compare_cmd = commands.add_parser("compare", help="flag regressions")
+    compare_cmd.add_argument("baseline", type=Path)
+    compare_cmd.add_argument("current", type=Path)
+    compare_cmd.add_argument("--threshold", type=float, default=0.1,
+                             help="slowdown ratio to flag (default: 0.1)")
+    compare_cmd.add_argument("--min-delta", type=float, default=0.005,
+                             help="ignore changes under these seconds "
+                                  "(default: 0.005)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        data = run(args.repeat, args.latency, args.resolve_latency)
+        for kind, steps in data["results"].items():
+            print(kind)
+            for name, secs in sorted(steps.items(), key=lambda item: -item[1]):
+                print(f"  {name:<24}  {secs * 1e3:10.2f} ms")
+        if args.output:
+            args.output.write_text(json.dumps(data, indent=2) + "\n")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    current = json.loads(args.current.read_text())
+    regressions = compare(baseline, current, args.threshold, args.min_delta)
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
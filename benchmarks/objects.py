@@ -0,0 +1,76 @@
+"""Compare attr and Object with the versions before the descriptor rewrite.
+
+Both the blueprint package and the copies that are installed into new Python
+projects are measured, each against the legacy version.
+
+Usage: python -m benchmarks.objects
+"""
+
+from importlib.util import module_from_spec, spec_from_file_location
+
+from benchmarks import best, legacy, report
+from blueprint import ROOT
+from blueprint import attr as package_attr
+from blueprint import object as package_object
+
+# the operations are so fast that timings vary a lot between runs
+REPEAT = 15
+
+TEMPLATES = ROOT / "sources" / "python" / "${SNAKE_NAME}"
+
+
+def load(name: str):
+    """Return the module in the python project templates called name."""
+    spec = spec_from_file_location(f"template_{name}", TEMPLATES / f"{name}.py")
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_class(attr_module, object_module, slots=False):
+    """Return an Object subclass with attrs built from the given modules."""
+    namespace = {
+        "age": attr_module.attr("age"),
+        "name": attr_module.attr("name"),
+    }
+    if slots:
+        namespace["__slots__"] = ("_age", "_name")
+        return type("Person", (object_module.SlottedObject,), namespace)
+    return type("Person", (object_module.Object,), namespace)
+
+
+def measure(cls) -> dict:
+    """Return the timings of attribute access, repr and eq for cls."""
+    person, other = cls(age=42, name="bill"), cls(age=42, name="bill")
+
+    def set_age():
+        person.age = 43
+
+    return {
+        "get": best(lambda: person.age, repeat=REPEAT),
+        "set": best(set_age, repeat=REPEAT),
+        "repr": best(lambda: repr(person), repeat=REPEAT),
+        "eq": best(lambda: person == other, repeat=REPEAT),
+    }
+
+
+def main():
+    """Print timings for each operation and implementation."""
+    implementations = {
+        "package": (package_attr, package_object),
+        "templates": (load("attr"), load("object")),
+    }
+    timings = {"legacy": measure(make_class(legacy, legacy))}
+    for title, (attr_module, object_module) in implementations.items():
+        timings[title] = measure(make_class(attr_module, object_module))
+        timings[f"{title} (slots)"] = measure(
+            make_class(attr_module, object_module, slots=True)
+        )
+
+    for op in ("get", "set", "repr", "eq"):
+        rows = [(name, times[op]) for name, times in timings.items()]
+        report(op, rows, baseline="legacy")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Compare the compiled template engine with string.Template.safe_substitute().
+
+Usage: python -m benchmarks.templates
+"""
+
+from os import environ
+from string import Template as StringTemplate
+from tempfile import TemporaryDirectory
+
+from benchmarks import best, report
+from blueprint.template import Template, render
+
+MAPPING = {
+    "DASH_NAME": "my-project",
+    "TITLE_NAME": "My Project",
+    "SNAKE_NAME": "my_project",
+    "PASCAL_NAME": "MyProject",
+    "VERSION": "0.0.1",
+    "SUMMARY": "My project that does stuff.",
+}
+
+PARAGRAPH = (
+    "# ${TITLE_NAME}\n\n> ${SUMMARY}\n\n"
+    "Install ${DASH_NAME} ${VERSION} then `import ${SNAKE_NAME}` and use the\n"
+    "${PASCAL_NAME} class. Prices are in $$ and ${UNKNOWN} is left alone.\n"
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod\n"
+    "tempor incididunt ut labore et dolore magna aliqua.\n\n"
+)
+
+SIZES = {
+    "small (1 paragraph)": 1,
+    "medium (100 paragraphs)": 100,
+    "large (10,000 paragraphs)": 10_000,
+}
+
+
+def cold(text: str, persist=False) -> str:
+    """Render text the way a new run does, before anything is compiled."""
+    Template._compiled.clear()
+    return render(text, MAPPING, persist)
+
+
+def main():
+    """Print timings for each template size."""
+    for title, count in SIZES.items():
+        text = PARAGRAPH * count
+        template = Template(text)
+
+        assert template.render(MAPPING) == StringTemplate(text).safe_substitute(MAPPING)
+
+        rows = [
+            ("string.Template (per call)",
+             best(lambda: StringTemplate(text).safe_substitute(MAPPING))),
+            ("compiled Template.render",
+             best(lambda: template.render(MAPPING))),
+            ("render() in a new run",
+             best(lambda: cold(text))),
+            ("render() in a new run, persisted",
+             best(lambda: cold(text, persist=True))),
+        ]
+        report(title, rows, baseline="string.Template (per call)")
+
+
+if __name__ == "__main__":
+    # keep the saved templates out of the user's cache
+    with TemporaryDirectory() as tmp:
+        environ["BLUEPRINT_CACHE_DIR"] = tmp
+        main()
@@ -3,8 +3,6 @@
 from enum import Enum
 from pathlib import Path
 
-from more_itertools import first
-
 __version__ = "0.0.1"
 
 ROOT = Path(__file__).parent.parent
@@ -48,6 +46,8 @@ class BlueprintError(BaseException):
     @property
     def message(self):
         """Human readable exception message."""
+        from more_itertools import first
+
         return first(self.args, self.default_message)
 
     @property
@@ -2,6 +2,7 @@
 
 from functools import cached_property
 
+from blueprint.batch import Batch, BatchResult
 from blueprint.object import Object
 from blueprint.project import Project
 from blueprint.project_factory import ProjectFactory
@@ -23,3 +24,18 @@ class App(Object):
     def project(self) -> Project:
         """Project that is being created."""
         return ProjectFactory(self.name, self.dest, **self.kwargs)
+
+    def make_many(self, specs, jobs=None) -> list[BatchResult]:
+        """Make a project for each spec in parallel across a pool of workers.
+
+        Arguments:
+            specs (list[dict]|Batch): project specs or a loaded Batch
+            jobs (int): maximum number of projects to make at the same time
+        """
+        batch = specs
+        if not isinstance(batch, Batch):
+            batch = Batch([Batch.validate(spec) for spec in specs])
+
+        if jobs:
+            batch.jobs = jobs
+        return batch.run()
@@ -0,0 +1,158 @@
+"""Batch project generation from a manifest."""
+
+import json
+from os import cpu_count
+from pathlib import Path
+
+from blueprint import AccessError, BlueprintError, UserError
+from blueprint.names import ProjectNames
+from blueprint.object import Object
+from blueprint.project_factory import ProjectFactory
+
+bp = breakpoint
+
+
+class BatchResult(Object):
+    """The outcome of making one project in a batch."""
+
+    def __init__(self, name=None, path=None, error=None, **kwargs):
+        """Create object."""
+        self.name = name
+        self.path = path
+        self.error = error
+        super().__init__(**kwargs)
+
+    @property
+    def ok(self) -> bool:
+        """Return True if the project was made without errors."""
+        return not self.error
+
+
+def make_project(spec: dict) -> BatchResult:
+    """Make a single project from a spec in a worker process."""
+    spec = spec.copy()
+    name = spec.pop("name")
+    dest = spec.pop("dest", None)
+    path = None
+
+    if spec.pop("type", "basic") == "python":
+        spec["python"] = True
+
+    try:
+        project = ProjectFactory(name, dest, **spec)
+        path = project.path
+        project.make()
+    except BlueprintError as e:
+        return BatchResult(name, path, e.message)
+    except Exception as e:
+        return BatchResult(name, path, f"{e.__class__.__name__}: {e}")
+
+    return BatchResult(name, path)
+
+
+class Batch(Object):
+    """A list of projects to make in parallel."""
+
+    TYPES = ("basic", "python")
+
+    def __init__(self, specs=None, jobs=None, **kwargs):
+        """Create object.
+
+        Arguments:
+            specs (list[dict]): project specs with ProjectFactory() arguments
+            jobs (int): maximum number of projects to make at the same time
+        """
+        self.specs = specs or []
+        self.jobs = jobs
+        super().__init__(**kwargs)
+
+    @classmethod
+    def load(cls, manifest, dest=None, **kwargs) -> "Batch":
+        """Create a Batch from a TOML or JSON manifest file.
+
+        The manifest is either a list of project specs (JSON only) or a table
+        with a list of specs under the "project" key and an optional default
+        "dest" for all projects. Relative destinations in the manifest are
+        relative to the manifest file.
+
+        Arguments:
+            manifest (Path): path to the manifest file
+            dest (Path): destination for all projects, relative to the current
+                         directory. The manifest may not set one as well.
+        """
+        manifest = Path(manifest)
+
+        try:
+            text = manifest.read_text()
+        except OSError as e:
+            raise AccessError(f"Cannot read manifest: '{manifest}' ({e.strerror})")
+
+        try:
+            if manifest.suffix == ".json":
+                data = json.loads(text)
+            else:
+                import toml
+
+                data = toml.loads(text)
+        except ValueError as e:
+            raise UserError(f"Invalid manifest: '{manifest}' ({e})")
+
+        if isinstance(data, list):
+            data = {"project": data}
+
+        projects = data.get("project", []) if isinstance(data, dict) else None
+        if not isinstance(projects, list):
+            raise UserError(f"Invalid manifest, expected a list of projects: "
+                            f"'{manifest}'")
+
+        if dest is not None:
+            dest = Path.cwd() / dest
+
+        specs, paths = [], {}
+        for i, spec in enumerate(projects, 1):
+            if not isinstance(spec, dict):
+                raise UserError(f"Project {i} in the manifest is not a table: {spec!r}")
+
+            if dest is not None and ("dest" in spec or "dest" in data):
+                raise UserError(f"Project {i} in the manifest has a dest, so --dest "
+                                f"cannot be used as well")
+
+            spec = cls.validate({"dest": data.get("dest", "."), **spec})
+            spec["dest"] = dest or manifest.parent / spec["dest"]
+
+            # projects at the same path would be made over each other
+            path = spec["dest"] / ProjectNames(spec["name"]).dash
+            if path in paths:
+                raise UserError(f"Projects {paths[path]} and {i} in the manifest "
+                                f"would both be made at: '{path}'")
+            paths[path] = i
+
+            specs.append(spec)
+
+        return cls(specs, **kwargs)
+
+    @classmethod
+    def validate(cls, spec: dict) -> dict:
+        """Return spec if it is a valid project spec."""
+        if not spec.get("name") or not isinstance(spec["name"], str):
+            raise UserError(f"Project spec is missing a name: {spec!r}")
+
+        if spec.get("type", "basic") not in cls.TYPES:
+            raise UserError(f"Invalid project type: {spec['type']!r}")
+
+        return spec
+
+    @property
+    def workers(self) -> int:
+        """Return the size of the worker pool."""
+        return max(1, min(self.jobs or cpu_count() or 1, len(self.specs)))
+
+    def run(self) -> list[BatchResult]:
+        """Make all projects and return a result for each in spec order."""
+        from concurrent.futures import ProcessPoolExecutor
+
+        if not self.specs:
+            return []
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(make_project, self.specs))
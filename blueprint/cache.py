@@ -0,0 +1,77 @@
+"""On-disk caches that are shared between runs."""
+
+import json
+from contextlib import contextmanager
+from fcntl import LOCK_EX, LOCK_NB, LOCK_UN, flock
+from hashlib import sha256
+from os import environ
+from pathlib import Path
+
+from blueprint.object import Object
+
+bp = breakpoint
+
+
+def cache_root() -> Path:
+    """Return the root directory for all blueprint caches.
+
+    Set $BLUEPRINT_CACHE_DIR to override the default of
+    $XDG_CACHE_HOME/blueprint.
+    """
+    if environ.get("BLUEPRINT_CACHE_DIR"):
+        return Path(environ["BLUEPRINT_CACHE_DIR"])
+
+    xdg = environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(xdg) / "blueprint"
+
+
+def digest(*parts) -> str:
+    """Return a short stable hash of JSON serializable parts."""
+    data = json.dumps(parts, sort_keys=True, default=str)
+    return sha256(data.encode()).hexdigest()[:20]
+
+
+class Cache(Object):
+    """A directory of cache entries."""
+
+    NAME = "cache"
+
+    def __init__(self, root=None, **kwargs):
+        """Create object.
+
+        Arguments:
+            root (Path): cache directory, defaults to a NAME subdirectory of
+                         cache_root()
+        """
+        self.root = Path(root) if root else cache_root() / self.NAME
+        super().__init__(**kwargs)
+
+    def path(self, key: str) -> Path:
+        """Return the path to the cache entry for key."""
+        return self.root / key
+
+    @contextmanager
+    def lock(self, key: str):
+        """Hold an exclusive lock on the entry for key across processes."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / f"{key}.lock", "w") as fh:
+            flock(fh, LOCK_EX)
+            try:
+                yield
+            finally:
+                flock(fh, LOCK_UN)
+
+    def is_locked(self, key: str) -> bool:
+        """Return True if another process holds the lock on the entry for key."""
+        try:
+            fh = open(self.root / f"{key}.lock", "r")
+        except FileNotFoundError:
+            return False
+
+        with fh:
+            try:
+                flock(fh, LOCK_EX | LOCK_NB)
+            except BlockingIOError:
+                return True
+            flock(fh, LOCK_UN)
+            return False
@@ -1,26 +1,47 @@
 """Command Line Interface."""
 
 from collections import namedtuple
+from functools import cache
 from pathlib import Path
 from sys import exit as sys_exit
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated
 
-from rich.console import Console
 from typer import Argument, BadParameter, Context, Option, Typer, confirm
 
-from blueprint import BlueprintError, UserError
-from blueprint.app import App
+from blueprint import BlueprintError, SysExit, UserError
 from blueprint.object import Object
-from blueprint.python_project import PythonProject
+from blueprint.toolchain import DEFAULT_PYV, DEFAULT_PYV_CONSTRAINT, toolchain
+from blueprint.trace import tracer
+
+# the project modules are imported by the commands that need them, so that
+# `bp --help` and the other commands start without them
+if TYPE_CHECKING:
+    from blueprint.app import App
 
-console = Console()
-errors = Console(stderr=True)
 cli = Typer()
 new = Typer()
+wheelhouse = Typer()
+pool = Typer()
 Opts = Object()
 Global = namedtuple("Global", ["name", "param", "default"], defaults=[None])
 
 
+@cache
+def console():
+    """Return the console for standard output, created on first use."""
+    from rich.console import Console
+
+    return Console()
+
+
+@cache
+def errors():
+    """Return the console for error output, created on first use."""
+    from rich.console import Console
+
+    return Console(stderr=True)
+
+
 def exit(status: int = 0):
     """Exit with status code."""
     raise sys_exit(int(status))
@@ -31,18 +52,60 @@ def error(ex: Exception):
     if isinstance(ex, BlueprintError):
         ex = ex.message
 
-    errors.print(f"[red]Error[/red] {ex}")
+    errors().print(f"[red]Error[/red] {ex}")
 
 
-def verify(app: App):
+def verify(app: "App"):
     """Ask the user to confirm that they want to proceed."""
-    prompt = f"Create {app.project.type} project at '{app.project.path}'?"
+    action = "Resume" if app.project.resume else "Create"
+    prompt = f"{action} {app.project.type} project at '{app.project.path}'?"
     if not confirm(prompt):
         exit()
 
 
+def explain(app: "App"):
+    """Print the steps that make the project in the order they run, then exit."""
+    console().print(
+        f"Steps to make {app.project.type} project at '{app.project.path}':"
+    )
+    for line in app.project.scheduler.explain():
+        console().print(f"  {line}", highlight=False)
+    exit()
+
+
+def make(app: "App", trace: Path = None):
+    """Make the project, writing a trace of how long each part took if asked."""
+    tracer.clear()
+    tracer.enabled = bool(trace)
+    try:
+        app.project.make()
+    finally:
+        tracer.enabled = False
+        if trace:
+            tracer.write(trace)
+            console().print(f"Wrote trace to '{trace}'", highlight=False)
+
+
+def summarize(results: list):
+    """Print a success/failure line for each project made in a batch."""
+    for res in results:
+        if res.ok:
+            console().print(f"[green]Created[/green] {res.name} at '{res.path}'")
+        else:
+            errors().print(f"[red]Failed[/red]  {res.name}: {res.error}")
+
+    failed = len([res for res in results if not res.ok])
+    console().print(f"{len(results) - failed} created, {failed} failed.")
+
+
 def dest_exists(path: Path):
-    """Confirm the destination directory exists."""
+    """Confirm the destination directory exists, defaulting to the current one.
+
+    The default is looked up here instead of when the module is imported, since
+    `bp serve` imports it once and runs commands from many directories.
+    """
+    if path is None:
+        return Path.cwd()
     if not path.is_dir():
         raise BadParameter(f"No such directory: {path}")
     return path
@@ -68,7 +131,6 @@ Opts.dest = Global(
         rich_help_panel="Project",
         callback=dest_exists
     )],
-    Path.cwd()
 )
 
 Opts.summary = Global(
@@ -91,6 +153,101 @@ Opts.license = Global(
     "MIT",
 )
 
+Opts.explain = Global(
+    "explain",
+    Annotated[bool, Option(
+        "--explain",
+        help="Show the steps that would be taken and exit.",
+    )],
+    False,
+)
+
+Opts.commit = Global(
+    "git_commit",
+    Annotated[bool, Option(
+        "--commit",
+        help="Commit the generated files to git.",
+        rich_help_panel="Project",
+    )],
+    False,
+)
+
+Opts.snapshot = Global(
+    "snapshot",
+    Annotated[bool, Option(
+        "--snapshot",
+        help="Copy the project from a cached one made with the same options.",
+        rich_help_panel="Toolchain",
+    )],
+    False,
+)
+
+Opts.resume = Global(
+    "resume",
+    Annotated[bool, Option(
+        "--resume",
+        help="Finish a project that failed part way, skipping the steps that "
+             "were done.",
+    )],
+    False,
+)
+
+Opts.trace = Global(
+    "trace",
+    Annotated[Path, Option(
+        "--trace",
+        show_default=False,
+        help="Write how long each step took to a Chrome trace JSON file.",
+        dir_okay=False,
+    )],
+)
+
+
+@new.callback(invoke_without_command=True)
+def new_default(
+    ctx: Context,
+    batch: Annotated[Path, Option(
+        "--batch", "-b",
+        show_default=False,
+        help="TOML or JSON manifest of projects to create.",
+        rich_help_panel="Batch",
+        exists=True,
+        dir_okay=False,
+    )] = None,
+    dest: Opts.dest.param = Opts.dest.default,
+    jobs: Annotated[int, Option(
+        "--jobs", "-j",
+        show_default="CPU count",
+        help="Number of projects to create at the same time.",
+        rich_help_panel="Batch",
+        min=1,
+    )] = None,
+):
+    """Create a new project."""
+    if ctx.invoked_subcommand:
+        return
+
+    if not batch:
+        console().print(ctx.get_help())
+        exit()
+
+    # dest_exists() fills in the current directory if --dest was not given
+    if ctx.get_parameter_source("dest").name == "DEFAULT":
+        dest = None
+
+    from blueprint.app import App
+    from blueprint.batch import Batch
+
+    specs = Batch.load(batch, dest)
+    if not confirm(f"Create {len(specs.specs)} projects?"):
+        exit()
+
+    results = App().make_many(specs, jobs)
+    summarize(results)
+
+    if not all(res.ok for res in results):
+        exit(SysExit.GENERIC)
+
 
 @new.command()
 def basic(
@@ -99,11 +256,28 @@ def basic(
     dest: Opts.dest.param = Opts.dest.default,
     summary: Opts.summary.param = Opts.summary.default,
     license: Opts.license.param = Opts.license.default,
+    git_commit: Opts.commit.param = Opts.commit.default,
+    snapshot: Opts.snapshot.param = Opts.snapshot.default,
+    resume: Opts.resume.param = Opts.resume.default,
+    explain_steps: Opts.explain.param = Opts.explain.default,
+    trace: Opts.trace.param = Opts.trace.default,
 ):
     """Create a basic new project."""
-    app = App(name, dest, summary=summary, license=license)
+    from blueprint.app import App
+
+    app = App(
+        name,
+        dest,
+        summary=summary,
+        license=license,
+        git_commit=git_commit,
+        snapshot=snapshot,
+        resume=resume,
+    )
+    if explain_steps:
+        explain(app)
     verify(app)
-    app.project.make()
+    make(app, trace)
 
 
 @new.command()
@@ -116,14 +290,46 @@ def python(
         "--pyv", "-P",
         help="Python version to use.",
         rich_help_panel="Project",
-    )] = PythonProject.DEFAULT_PYV,
+    )] = DEFAULT_PYV,
     pyv_constraint: Annotated[str, Option(
         "--pyv-constraint", "-C",
         help="Supported Python versions.",
         rich_help_panel="Project",
-    )] = PythonProject.DEFAULT_PYV_CONSTRAINT,
+    )] = DEFAULT_PYV_CONSTRAINT,
+    venv_cache: Annotated[bool, Option(
+        "--venv-cache/--no-venv-cache",
+        help="Clone a cached virtual env with the dev dependencies installed.",
+        rich_help_panel="Toolchain",
+    )] = False,
+    lock_cache: Annotated[bool, Option(
+        "--lock-cache/--no-lock-cache",
+        help="Reuse a cached poetry.lock for the same dependencies.",
+        rich_help_panel="Toolchain",
+    )] = True,
+    refresh_lock: Annotated[bool, Option(
+        "--refresh-lock",
+        help="Resolve dependencies again and update the cached poetry.lock.",
+        rich_help_panel="Toolchain",
+    )] = False,
+    git_commit: Opts.commit.param = Opts.commit.default,
+    snapshot: Opts.snapshot.param = Opts.snapshot.default,
+    use_wheelhouse: Annotated[bool, Option(
+        "--wheelhouse/--no-wheelhouse",
+        help="Install the dev dependencies from the local wheelhouse.",
+        rich_help_panel="Toolchain",
+    )] = False,
+    venv_pool: Annotated[bool, Option(
+        "--venv-pool/--no-venv-pool",
+        help="Use a virtual env made ahead of time, see `bp pool fill`.",
+        rich_help_panel="Toolchain",
+    )] = False,
+    resume: Opts.resume.param = Opts.resume.default,
+    explain_steps: Opts.explain.param = Opts.explain.default,
+    trace: Opts.trace.param = Opts.trace.default,
 ):
     """Create Python project."""
+    from blueprint.app import App
+
     app = App(
         name,
         dest,
@@ -131,18 +337,267 @@ def python(
         license=license,
         pyv=pyv,
         pyv_constraint=pyv_constraint,
+        venv_cache=venv_cache,
+        lock_cache=lock_cache,
+        refresh_lock=refresh_lock,
+        git_commit=git_commit,
+        snapshot=snapshot,
+        wheelhouse=use_wheelhouse,
+        venv_pool=venv_pool,
+        resume=resume,
         python=True
     )
+    if explain_steps:
+        explain(app)
     verify(app)
-    app.project.make()
+    make(app, trace)
 
 
 cli.add_typer(new, name="new")
 
 
+# subcommand: update
+# =====================================================================================
+
+# status -> (label, color) of the files that update reports
+UPDATE_STATUS = {
+    "added": ("Added", "green"),
+    "updated": ("Updated", "green"),
+    "conflict": ("Conflict", "red"),
+    "modified": ("Modified", "yellow"),
+    "removed": ("Removed", "yellow"),
+}
+
+
+@cli.command()
+def update(
+    path: Annotated[Path, Argument(
+        help="Project to update.",
+        exists=True,
+        file_okay=False,
+    )] = Path("."),
+    force: Annotated[bool, Option(
+        "--force", "-f",
+        help="Overwrite files that have been edited since they were generated.",
+    )] = False,
+    dry_run: Annotated[bool, Option(
+        "--dry-run", "-n",
+        help="Show what would be updated without changing any files.",
+    )] = False,
+):
+    """Install the templates that changed since a project was created."""
+    from blueprint.project_factory import ProjectFactory
+
+    project = ProjectFactory.load(path)
+    results = project.update(force=force, dry_run=dry_run)
+
+    for status, (label, color) in UPDATE_STATUS.items():
+        for file in results[status]:
+            console().print(f"[{color}]{label:<9}[/{color}] {file}", highlight=False)
+
+    counts = ", ".join(
+        f"{len(results[status])} {status}"
+        for status in ("added", "updated", "conflict", "unchanged")
+    )
+    console().print(counts)
+
+    if results["conflict"]:
+        errors().print("Use --force to overwrite files with conflicts.")
+        exit(SysExit.GENERIC)
+
+
+# subcommand: wheelhouse
+# =====================================================================================
+
+@wheelhouse.command("build")
+def wheelhouse_build(
+    pyv: Annotated[str, Option(
+        "--pyv", "-P",
+        help="Python version to build wheels for.",
+    )] = DEFAULT_PYV,
+    root: Annotated[Path, Option(
+        "--dir", "-d",
+        show_default="$BLUEPRINT_WHEELHOUSE or ~/.cache/blueprint/wheelhouse",
+        help="Directory to save the wheels in.",
+        file_okay=False,
+    )] = None,
+):
+    """Lock the Python dev dependencies and fetch or build wheels for them."""
+    from tempfile import TemporaryDirectory
+
+    from blueprint.python_project import PythonProject
+    from blueprint.wheelhouse import Wheelhouse
+
+    with TemporaryDirectory() as tmp:
+        project = PythonProject("wheelhouse", tmp, pyv=pyv)
+        wheels = project.build_wheelhouse(root)
+
+    console().print(
+        f"Saved {len(wheels)} wheels to '{Wheelhouse(root).path(pyv)}'",
+        highlight=False,
+    )
+
+
+cli.add_typer(wheelhouse, name="wheelhouse", help="Manage the local wheelhouse.")
+
+
+# subcommand: pool
+# =====================================================================================
+
+Opts.pool_root = Global(
+    "root",
+    Annotated[Path, Option(
+        "--dir", "-d",
+        show_default="~/.cache/blueprint/venv-pool",
+        help="Directory of the pool.",
+        file_okay=False,
+    )],
+)
+
+
+@pool.command("fill")
+def pool_fill(
+    pyvs: Annotated[list[str], Option(
+        "--pyv", "-P",
+        help="Python version to make virtual envs for, can be repeated.",
+    )] = [DEFAULT_PYV],
+    size: Annotated[int, Option(
+        "--size", "-n",
+        show_default="$BLUEPRINT_VENV_POOL_SIZE or 2",
+        help="Number of virtual envs to keep for each Python version.",
+        min=0,
+    )] = None,
+    max_age: Annotated[float, Option(
+        "--max-age",
+        show_default="$BLUEPRINT_VENV_POOL_MAX_AGE or 7",
+        help="Days after which a virtual env is replaced.",
+        min=0,
+    )] = None,
+    root: Opts.pool_root.param = Opts.pool_root.default,
+):
+    """Make virtual envs ahead of time for `bp new python --venv-pool`."""
+    from blueprint.venv_pool import VenvPool
+
+    venv_pool = VenvPool(root, size=size, max_age=max_age)
+    for pyv in pyvs:
+        python = f"{toolchain.asdf_where(pyv)}/bin/python"
+        entries = venv_pool.fill(python, pyv)
+        console().print(
+            f"{len(entries)} virtual envs for Python {pyv} in "
+            f"'{venv_pool.path(pyv)}'",
+            highlight=False,
+        )
+
+
+@pool.command("clear")
+def pool_clear(
+    root: Opts.pool_root.param = Opts.pool_root.default,
+):
+    """Remove every virtual env in the pool."""
+    from shutil import rmtree
+
+    from blueprint.venv_pool import VenvPool
+
+    venv_pool = VenvPool(root)
+    rmtree(venv_pool.root, ignore_errors=True)
+    console().print(f"Removed '{venv_pool.root}'", highlight=False)
+
+
+cli.add_typer(pool, name="pool", help="Manage the pool of ready made virtual envs.")
+
+
+# subcommand: rollout
+# =====================================================================================
+
+@cli.command()
+def rollout(
+    paths: Annotated[list[str], Argument(
+        help="Projects, directories to search for projects, or glob patterns.",
+        show_default=False,
+    )],
+    jobs: Annotated[int, Option(
+        "--jobs", "-j",
+        show_default="CPU count",
+        help="Number of projects to update at the same time.",
+        min=1,
+    )] = None,
+    force: Annotated[bool, Option(
+        "--force", "-f",
+        help="Overwrite files that have been edited since they were generated.",
+    )] = False,
+    dry_run: Annotated[bool, Option(
+        "--dry-run", "-n",
+        help="Show what would be updated without changing any files.",
+    )] = False,
+):
+    """Update every project found in PATHS with the changed templates."""
+    from blueprint.rollout import Rollout, discover
+
+    projects = discover(paths)
+    if not projects:
+        raise UserError(f"No blueprint projects found in: {', '.join(paths)}")
+
+    results = Rollout(projects, jobs, force=force, dry_run=dry_run).run()
+
+    labels = {
+        "updated": "[green]Updated[/green] ",
+        "conflict": "[red]Conflict[/red]",
+        "failed": "[red]Failed[/red]  ",
+    }
+    counts = {status: 0 for status in ("updated", "conflict", "skipped", "failed")}
+    for res in results:
+        counts[res.status] += 1
+        if res.status == "failed":
+            errors().print(f"{labels['failed']} {res.path}: {res.error}")
+        elif res.status != "skipped":
+            shown = ("conflict",) if res.status == "conflict" else (
+                "added", "updated", "removed"
+            )
+            files = [file for status in shown for file in res.files[status]]
+            console().print(
+                f"{labels[res.status]} {res.path}: {', '.join(files)}",
+                highlight=False,
+            )
+
+    console().print(", ".join(f"{n} {status}" for status, n in counts.items()))
+
+    if counts["conflict"] or counts["failed"]:
+        exit(SysExit.GENERIC)
+
+
+# subcommand: serve
+# =====================================================================================
+
+@cli.command()
+def serve(
+    path: Annotated[Path, Option(
+        "--socket",
+        show_default="$BLUEPRINT_SOCKET or ~/.cache/blueprint/bp.sock",
+        help="Unix socket to listen on.",
+        dir_okay=False,
+    )] = None,
+):
+    """Keep blueprint loaded and run the new and update commands sent by bp."""
+    from blueprint.daemon import Daemon
+
+    daemon = Daemon(path)
+    daemon.serve(
+        ready=lambda: console().print(
+            f"Listening on '{daemon.path}', press Ctrl+C to stop.", highlight=False
+        )
+    )
+
+
 @cli.callback()
-def default():
+def default(
+    lookup_cache: Annotated[bool, Option(
+        "--lookup-cache",
+        envvar="BLUEPRINT_LOOKUP_CACHE",
+        help="Save asdf/poetry lookups to disk and reuse them in later runs.",
+    )] = False,
+):
     """Create a new project from a blueprint."""
+    toolchain.persist = lookup_cache
 
 
 def run():
@@ -0,0 +1,334 @@
+"""Long running server that `bp` commands are forwarded to.
+
+`bp serve` imports everything, builds the source indexes, compiles the
+templates and looks up the toolchain once, then listens on a Unix socket.
+The `bp` entry point sends `new` and `update` commands to it along with its
+working directory, environment and standard streams. The daemon forks a
+child for each command, which runs it with the warm state and reports the
+exit status back. When no daemon is running the command runs in-process.
+
+This module is imported on every `bp` run, so it only imports what the
+client needs at the top.
+"""
+
+import json
+import os
+import signal
+import socket
+import sys
+import traceback
+from pathlib import Path
+
+from blueprint import BlueprintError, SysExit, UserError
+from blueprint.cache import cache_root
+from blueprint.object import Object
+
+bp = breakpoint
+
+# commands that are sent to the daemon
+FORWARD = ("new", "update")
+
+# standard streams passed from the client to the daemon
+STREAMS = (0, 1, 2)
+
+
+def socket_path() -> Path:
+    """Return the daemon socket path, $BLUEPRINT_SOCKET or in the cache."""
+    path = os.environ.get("BLUEPRINT_SOCKET")
+    return Path(path) if path else cache_root() / "bp.sock"
+
+
+def command(args: list) -> str:
+    """Return the name of the command in args, skipping global options."""
+    return next((arg for arg in args if not arg.startswith("-")), None)
+
+
+def forward(args: list, path=None):
+    """Run the command in args in the daemon and return its exit status.
+
+    Return None if the daemon is not running or the streams can't be sent.
+    """
+    if not hasattr(socket, "send_fds"):
+        return None
+
+    try:
+        for fd in STREAMS:
+            os.fstat(fd)
+    except OSError:
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path or socket_path()))
+    except OSError:
+        sock.close()
+        return None
+
+    request = {"args": args, "cwd": os.getcwd(), "env": dict(os.environ)}
+    pid = None
+    with sock, sock.makefile("rb") as replies:
+        try:
+            socket.send_fds(sock, [b"\0"], list(STREAMS))
+            sock.sendall(json.dumps(request).encode())
+            sock.shutdown(socket.SHUT_WR)
+
+            for line in replies:
+                reply = json.loads(line)
+                pid = reply.get("pid", pid)
+                if "status" in reply:
+                    return reply["status"]
+        except KeyboardInterrupt:
+            if pid:
+                os.kill(pid, signal.SIGINT)
+            return 130
+        except OSError:
+            pass
+
+    print("Error the blueprint daemon did not finish the command", file=sys.stderr)
+    return int(SysExit.GENERIC)
+
+
+def main():
+    """Entry point of `bp`: forward the command to the daemon or run it here."""
+    args = sys.argv[1:]
+    if command(args) in FORWARD:
+        status = forward(args)
+        if status is not None:
+            sys.exit(status)
+
+    from blueprint.cli import run
+
+    run()
+
+
+def run_command(args: list) -> int:
+    """Run the command line interface with args and return the exit status."""
+    from blueprint.cli import run
+
+    sys.argv = ["bp", *args]
+    try:
+        run()
+    except SystemExit as e:
+        return int(e.code or 0)
+    return 0
+
+
+def warm():
+    """Do the work that every command needs, once, before serving."""
+    from blueprint.cli import console, errors
+    from blueprint.project import Project
+    from blueprint.python_project import PythonProject
+    from blueprint.template import Template
+    from blueprint.toolchain import toolchain
+
+    import rich.console  # noqa: F401
+    try:
+        import git  # noqa: F401
+    except ImportError:
+        pass
+
+    # consoles check the terminal when they are made, so each command makes its
+    # own with the streams of its client
+    console.cache_clear()
+    errors.cache_clear()
+
+    for klass in (Project, PythonProject):
+        index = klass.source_index()
+        for file in index.listing:
+            if index.needs_render(file):
+                text = index.resolve(file).read_text(encoding="utf-8")
+                Template.get(text, toolchain.persist)
+
+    for lookup in (
+        toolchain.poetry_version,
+        lambda: toolchain.asdf_where(PythonProject.DEFAULT_PYV),
+    ):
+        try:
+            lookup()
+        except (Exception, BlueprintError):
+            # not installed, the command will report it if it is needed
+            pass
+
+
+def sources_stamp() -> tuple:
+    """Return the modification times of the sources and the toolchain.
+
+    That is of everything in the source directories, and of the files that the
+    toolchain lookups came from, so that an upgraded poetry or Python is
+    looked up again.
+    """
+    from blueprint.python_project import PythonProject
+    from blueprint.toolchain import mtime, toolchain
+
+    stamp = []
+    for layer in PythonProject.layers():
+        for root, dirs, files in os.walk(layer):
+            for name in [*dirs, *files]:
+                path = os.path.join(root, name)
+                stamp.append((path, os.stat(path).st_mtime_ns))
+    stamp.extend((path, mtime(path)) for path in toolchain.paths())
+    return tuple(stamp)
+
+
+class Daemon(Object):
+    """Server that runs forwarded commands in children of a warm process."""
+
+    # connections waiting to be accepted
+    BACKLOG = 64
+
+    def __init__(self, path=None, **kwargs):
+        """Create object.
+
+        Arguments:
+            path (Path): socket path, defaults to socket_path()
+        """
+        self.path = Path(path or socket_path())
+        self.sock = None
+        self.stamp = None
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        """Daemon(path='...')."""
+        return f"{self.__class__.__name__}(path={str(self.path)!r})"
+
+    def running(self) -> bool:
+        """Return True if another daemon is listening on the socket."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(str(self.path))
+            except OSError:
+                return False
+        return True
+
+    def bind(self):
+        """Listen on the socket, replacing one left behind by a dead daemon."""
+        if self.running():
+            raise UserError(f"A blueprint daemon is already running on: {self.path}")
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.unlink(missing_ok=True)
+
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.sock.bind(str(self.path))
+        except OSError as e:
+            self.sock.close()
+            raise UserError(f"Cannot listen on: {self.path} ({e.strerror})")
+
+        # only the user that started the daemon may send it commands
+        self.path.chmod(0o600)
+        self.sock.listen(self.BACKLOG)
+
+    def refresh(self):
+        """Warm up again if the source directories changed since the last time."""
+        from blueprint.sources import SourceIndex
+        from blueprint.toolchain import toolchain
+
+        if sources_stamp() != self.stamp:
+            SourceIndex.clear()
+            toolchain.clear()
+            warm()
+            # after warm() so that it includes the toolchain lookups
+            self.stamp = sources_stamp()
+
+    def serve(self, ready=None):
+        """Accept commands until the daemon is stopped.
+
+        Arguments:
+            ready (Callable): called once the socket is listening
+        """
+        self.bind()
+
+        def stop(signum, frame):
+            raise SystemExit(0)
+
+        signal.signal(signal.SIGTERM, stop)
+
+        try:
+            self.refresh()
+            if ready:
+                ready()
+
+            while True:
+                conn, _ = self.sock.accept()
+                self.reap()
+                self.refresh()
+                sys.stdout.flush()
+                sys.stderr.flush()
+                if os.fork() == 0:
+                    self.sock.close()
+                    self.child(conn)
+                conn.close()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    @staticmethod
+    def reap():
+        """Collect the exit status of children that finished."""
+        try:
+            while os.waitpid(-1, os.WNOHANG)[0]:
+                pass
+        except ChildProcessError:
+            pass
+
+    def close(self):
+        """Stop listening and remove the socket."""
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+            self.path.unlink(missing_ok=True)
+
+    @staticmethod
+    def receive(conn) -> tuple[dict, list]:
+        """Return the request and the stream file descriptors sent on conn.
+
+        The request is None if the connection was closed without sending one,
+        like running() does.
+        """
+        _, fds, _, _ = socket.recv_fds(conn, 1, len(STREAMS))
+        if not fds:
+            return None, []
+
+        data = b""
+        while chunk := conn.recv(65536):
+            data += chunk
+        return json.loads(data), fds
+
+    def child(self, conn):
+        """Run the command sent on conn in this forked child, then exit."""
+        status = int(SysExit.SOFTWARE)
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+
+            request, fds = self.receive(conn)
+            if request is None:
+                status = 0
+                return
+
+            for fd, stream in zip(fds, STREAMS):
+                os.dup2(fd, stream)
+                os.close(fd)
+            sys.stdout.reconfigure(line_buffering=os.isatty(1))
+
+            os.chdir(request["cwd"])
+            # toolchain lookups are keyed by the variables they depend on, so
+            # those that the daemon made with another $PATH are not reused
+            os.environ.clear()
+            os.environ.update(request["env"])
+            conn.sendall(json.dumps({"pid": os.getpid()}).encode() + b"\n")
+
+            status = run_command(request["args"])
+        except BaseException:
+            # what the interpreter would do with an uncaught exception
+            traceback.print_exc()
+            status = 1
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                conn.sendall(json.dumps({"status": status}).encode() + b"\n")
+            finally:
+                os._exit(status)
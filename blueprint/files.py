@@ -0,0 +1,89 @@
+"""File operations for installing sources into a project."""
+
+import os
+from codecs import getincrementaldecoder
+from hashlib import sha256
+from pathlib import Path
+from shutil import copyfile, copymode
+
+bp = breakpoint
+
+CHUNK_SIZE = 1024 * 1024
+
+# only available on Linux
+copy_file_range = getattr(os, "copy_file_range", None)
+
+# bytes that start a template variable or block tag
+MARKERS = (b"$", b"{%")
+
+
+def needs_render(path: Path) -> bool:
+    """Return True if path is a text file that contains template syntax.
+
+    Files that are not valid UTF-8 or contain NUL bytes are treated as binary
+    and never rendered. The file is read in chunks so that large files do not
+    need to fit in memory.
+    """
+    decoder = getincrementaldecoder("utf-8")()
+    found, tail = False, b""
+
+    with open(path, "rb") as fh:
+        while chunk := fh.read(CHUNK_SIZE):
+            if b"\0" in chunk:
+                return False
+
+            try:
+                decoder.decode(chunk)
+            except UnicodeDecodeError:
+                return False
+
+            # keep the last byte in case a marker is split between chunks
+            window = tail + chunk
+            found = found or any(marker in window for marker in MARKERS)
+            tail = chunk[-1:]
+
+    try:
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return False
+
+    return found
+
+
+def copy_file(src: Path, dest: Path):
+    """Copy the contents and mode bits of src to dest without decoding them.
+
+    Uses copy_file_range() so the kernel can copy (or reflink, on filesystems
+    that support it) without the data passing through Python, and falls back
+    to shutil.copyfile() where that is not supported.
+    """
+    if not copy_file_range:
+        copyfile(src, dest)
+        copymode(src, dest)
+        return
+
+    with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+        remaining = os.fstat(fsrc.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if not copied:
+                    break
+                remaining -= copied
+        except OSError:
+            # not supported between these files, copy the whole file instead
+            remaining = -1
+
+    if remaining:
+        copyfile(src, dest)
+
+    copymode(src, dest)
+
+
+def file_hash(path: Path) -> str:
+    """Return the sha256 hex digest of the contents of path."""
+    digest = sha256()
+    with open(path, "rb") as fh:
+        while chunk := fh.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
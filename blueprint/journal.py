@@ -0,0 +1,97 @@
+"""Record of the steps that were done while making a project.
+
+The journal is saved in the project at .blueprint/journal.json as each step
+finishes or fails, and removed once the project is made. `bp new --resume`
+reads it to skip the steps that were already done with the same inputs, so
+that a retry only redoes the work that failed.
+"""
+
+import json
+from os import getpid
+from pathlib import Path
+from threading import Lock
+
+from blueprint import UserError
+from blueprint.manifest import DIRNAME
+from blueprint.object import Object
+
+bp = breakpoint
+
+# bump when the journal format changes
+VERSION = 1
+
+
+class Journal(Object):
+    """The status and input hash of each step that made a project."""
+
+    FILENAME = "journal.json"
+
+    def __init__(self, path=None, steps=None, **kwargs):
+        """Create object.
+
+        Arguments:
+            path (Path): project directory
+            steps (dict): step name -> {"status", "inputs", "error"}
+        """
+        self.path = Path(path)
+        self.steps = steps or {}
+        self.lock = Lock()
+        super().__init__(**kwargs)
+
+    def __eq__(self, other):
+        """Journals are equal if they are for the same path and steps."""
+        return (isinstance(other, self.__class__) and
+                (self.path, self.steps) == (other.path, other.steps))
+
+    @property
+    def file(self) -> Path:
+        """Path to the journal file."""
+        return self.path / DIRNAME / self.FILENAME
+
+    @classmethod
+    def load(cls, path) -> "Journal":
+        """Return the journal of the project at path, or an empty one."""
+        path = Path(path)
+        file = path / DIRNAME / cls.FILENAME
+
+        try:
+            data = json.loads(file.read_text())
+        except FileNotFoundError:
+            return cls(path)
+        except (OSError, ValueError) as e:
+            raise UserError(f"Invalid journal: '{file}' ({e})")
+
+        if data.get("version") != VERSION:
+            raise UserError(f"Unsupported journal version: '{file}'")
+
+        return cls(path, data["steps"])
+
+    def save(self):
+        """Write the journal file."""
+        self.file.parent.mkdir(exist_ok=True)
+        data = {"version": VERSION, "steps": self.steps}
+        tmp = self.file.with_suffix(f".{getpid()}.tmp")
+        tmp.write_text(json.dumps(data, indent=2) + "\n")
+        tmp.replace(self.file)
+
+    def record(self, name: str, inputs: str, status: str, error=None):
+        """Record the status of step name with inputs and save the journal.
+
+        Nothing is saved until the project directory exists.
+        """
+        with self.lock:
+            self.steps[name] = {"status": status, "inputs": inputs}
+            if error:
+                self.steps[name]["error"] = error
+            if self.path.is_dir():
+                self.save()
+
+    def remove(self):
+        """Delete the journal file."""
+        with self.lock:
+            self.file.unlink(missing_ok=True)
+
+    def completed(self, name: str, inputs: str) -> bool:
+        """Return True if step name was done with the same inputs."""
+        entry = self.steps.get(name, {})
+        return entry.get("status") == "done" and entry.get("inputs") == inputs
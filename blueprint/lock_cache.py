@@ -0,0 +1,47 @@
+"""Cache of poetry.lock files that are reused by new projects."""
+
+from os import getpid
+from pathlib import Path
+from shutil import copyfile
+
+from blueprint.cache import Cache, digest
+
+bp = breakpoint
+
+
+class LockCache(Cache):
+    """Resolved poetry.lock files.
+
+    Entries are keyed by the dependency list, the Python constraint and the
+    poetry version, which is everything that goes into resolving the lock file
+    of a newly generated project.
+    """
+
+    NAME = "locks"
+    FILENAME = "poetry.lock"
+
+    def key(self, deps: list, pyv_constraint: str, poetry_version: str) -> str:
+        """Return the cache key for the inputs to poetry lock."""
+        return digest(sorted(deps), pyv_constraint, poetry_version)
+
+    def fetch(self, key: str, lockfile: Path) -> bool:
+        """Copy the cached lock file for key to lockfile.
+
+        Return False if there is no cached lock file.
+        """
+        cached = self.path(key) / self.FILENAME
+        if not cached.is_file():
+            return False
+
+        copyfile(cached, lockfile)
+        return True
+
+    def store(self, key: str, lockfile: Path):
+        """Save lockfile as the cached lock file for key."""
+        entry = self.path(key)
+        entry.mkdir(parents=True, exist_ok=True)
+
+        # replaced in one step so that other processes never see a partial file
+        tmp = entry / f"{self.FILENAME}.{getpid()}.tmp"
+        copyfile(lockfile, tmp)
+        tmp.replace(entry / self.FILENAME)
@@ -0,0 +1,120 @@
+"""Record of how each file in a generated project was made.
+
+The manifest is saved in the project at .blueprint/manifest.json and lets
+`bp update` tell which templates changed since the project was made and which
+generated files the user has edited since.
+"""
+
+import json
+from os import getpid, stat
+from pathlib import Path
+
+from blueprint import UserError
+from blueprint.files import file_hash
+from blueprint.object import Object
+
+bp = breakpoint
+
+# directory in a generated project for blueprint's own files
+DIRNAME = ".blueprint"
+
+# bump when the manifest format changes
+VERSION = 1
+
+
+def jsonable(data):
+    """Return data as it would be after saving it as JSON and loading it again."""
+    return json.loads(json.dumps(data, default=str))
+
+
+class Manifest(Object):
+    """The template source and output of every file in a generated project."""
+
+    FILENAME = "manifest.json"
+
+    def __init__(self, path=None, type=None, options=None, substitutions=None,
+                 files=None, **kwargs):
+        """Create object.
+
+        Arguments:
+            path (Path): project directory
+            type (str): project type
+            options (dict): arguments to make the same project again
+            substitutions (dict): template variables the files were made with
+            files (dict): source file -> {"path", "source", "output", "size",
+                          "mtime_ns"} of the file it was installed to
+        """
+        self.path = Path(path)
+        self.type = type
+        self.options = options or {}
+        self.substitutions = substitutions or {}
+        self.files = files or {}
+        super().__init__(**kwargs)
+
+    @property
+    def file(self) -> Path:
+        """Path to the manifest file."""
+        return self.path / DIRNAME / self.FILENAME
+
+    @classmethod
+    def load(cls, path) -> "Manifest":
+        """Return the manifest of the project at path."""
+        path = Path(path)
+        file = path / DIRNAME / cls.FILENAME
+
+        try:
+            data = json.loads(file.read_text())
+        except FileNotFoundError:
+            raise UserError(f"Not a blueprint project (no {DIRNAME}/"
+                            f"{cls.FILENAME}): '{path}'")
+        except (OSError, ValueError) as e:
+            raise UserError(f"Invalid manifest: '{file}' ({e})")
+
+        if data.get("version") != VERSION:
+            raise UserError(f"Unsupported manifest version: '{file}'")
+
+        data.pop("version")
+        return cls(path, **data)
+
+    def save(self):
+        """Write the manifest file."""
+        self.file.parent.mkdir(exist_ok=True)
+        data = {
+            "version": VERSION,
+            "type": self.type,
+            "options": self.options,
+            "substitutions": self.substitutions,
+            "files": dict(sorted(self.files.items())),
+        }
+        tmp = self.file.with_suffix(f".{getpid()}.tmp")
+        tmp.write_text(json.dumps(data, indent=2, default=str) + "\n")
+        tmp.replace(self.file)
+
+    def record(self, file: str, dest: str, source_hash: str):
+        """Record that source file with source_hash was installed to dest."""
+        st = stat(self.path / dest)
+        self.files[file] = {
+            "path": dest,
+            "source": source_hash,
+            "output": file_hash(self.path / dest),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        }
+
+    def modified(self, file: str) -> bool:
+        """Return True if the output of file was changed or removed since.
+
+        The contents are only hashed if the size or mtime has changed.
+        """
+        entry = self.files[file]
+        dest = self.path / entry["path"]
+
+        try:
+            st = stat(dest)
+        except FileNotFoundError:
+            return True
+
+        if (st.st_size, st.st_mtime_ns) == (entry["size"], entry["mtime_ns"]):
+            return False
+
+        return file_hash(dest) != entry["output"]
@@ -0,0 +1,49 @@
+"""The variants of a project name that are used in templates."""
+
+bp = breakpoint
+
+DASH_TABLE = str.maketrans("_ ", "--")
+SNAKE_TABLE = str.maketrans("- ", "__")
+TITLE_TABLE = str.maketrans("-_", "  ")
+
+
+class ProjectNames:
+    """Immutable set of the variants of a project name, computed once.
+
+    Example: ProjectNames("my_project").pascal == "MyProject"
+    """
+
+    __slots__ = ("name", "dash", "snake", "title", "pascal")
+
+    def __init__(self, name: str):
+        """Compute the variants of name."""
+        title = name.translate(TITLE_TABLE).title()
+        lower = name.lower()
+
+        set_slot = object.__setattr__
+        set_slot(self, "name", name)
+        set_slot(self, "dash", lower.translate(DASH_TABLE))
+        set_slot(self, "snake", lower.translate(SNAKE_TABLE))
+        set_slot(self, "title", title)
+        set_slot(self, "pascal", title.replace(" ", ""))
+
+    def __setattr__(self, name, value):
+        """Prevent changes."""
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name):
+        """Prevent changes."""
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __repr__(self):
+        """ProjectNames(name='...', dash='...', ...)."""
+        attrs = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__)
+        return f"{self.__class__.__name__}({attrs})"
+
+    def __eq__(self, other):
+        """Names are equal if they were made from the same name."""
+        return isinstance(other, self.__class__) and self.name == other.name
+
+    def __hash__(self):
+        """Hash of the name."""
+        return hash(self.name)
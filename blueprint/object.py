@@ -1,20 +1,152 @@
 """Custom base object class."""
 
+from operator import attrgetter
 
-class Object():
-    """Arbitrary object class."""
+# value of a slot that has not been set
+UNSET = object()
+
+
+def slot_names(cls) -> tuple:
+    """Return the names of the slots of cls and its parents, in that order."""
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        for name in [slots] if isinstance(slots, str) else slots:
+            if name in ("__dict__", "__weakref__"):
+                continue
+            # private names are mangled like any other attribute
+            if name.startswith("__") and not name.endswith("__"):
+                name = f"_{klass.__name__.lstrip('_')}{name}"
+            names.append(name)
+
+    return tuple(dict.fromkeys(names))
+
+
+class SlottedObject():
+    """Base object class for subclasses that keep their attributes in __slots__.
+
+    Instances only take the attributes named in the __slots__ of their class
+    and its parents, and have no __dict__. Use Object for instances that take
+    any attribute. The instances are smaller and their attributes are quicker
+    to set, but repr() and == are slower than for an Object.
+    """
+
+    __slots__ = ()
+
+    # set for each subclass, see __init_subclass__()
+    _slot_names = ()
+    _slot_values = None
+
+    def __init_subclass__(cls, **kwargs):
+        """Look up the slots of the subclass once and pick methods to suit them.
+
+        Classes whose instances keep their attributes only in a __dict__ or only
+        in slots get a __repr__ and __eq__ that skip the checks for the other,
+        unless they define their own.
+        """
+        super().__init_subclass__(**kwargs)
+        cls._slot_names = slot_names(cls)
+        cls._slot_values = attrgetter(*cls._slot_names) if cls._slot_names else None
+
+        layout = (bool(cls._slot_names), bool(cls.__dictoffset__))
+        methods = {
+            (False, True): (SlottedObject._dict_repr, SlottedObject._dict_eq),
+            (True, False): (SlottedObject._slots_repr, SlottedObject._slots_eq),
+        }.get(layout, (SlottedObject.__repr__, SlottedObject.__eq__))
+
+        for name, method in zip(("__repr__", "__eq__"), methods):
+            if getattr(cls, name) in SlottedObject._METHODS[name]:
+                setattr(cls, name, method)
 
     def __init__(self, **kwargs):
         """Set all keyword args as attributes."""
         for k, v in kwargs.items():
             setattr(self, k, v)
 
+    def _attrs(self) -> dict:
+        """Return the attributes that are set, by name."""
+        if not self._slot_names:
+            return getattr(self, "__dict__", {})
+
+        attrs = {}
+        for name in self._slot_names:
+            value = getattr(self, name, UNSET)
+            if value is not UNSET:
+                attrs[name] = value
+        attrs.update(getattr(self, "__dict__", ()))
+        return attrs
+
     def __repr__(self):
         """Object(attr='value')."""
-        attrs = ", ".join([f"{k}={v!r}" for k, v in self.__dict__.items()])
+        attrs = ", ".join([f"{k}={v!r}" for k, v in self._attrs().items()])
         return f"{self.__class__.__name__}({attrs})"
 
     def __eq__(self, other):
         """Provide comparison oprators."""
-        return (isinstance(other, self.__class__) and
-                self.__dict__ == other.__dict__)
+        if not isinstance(other, self.__class__):
+            return False
+
+        # compare without building dicts when the attributes are all set
+        values = self._slot_values
+        try:
+            if values is None:
+                return self.__dict__ == other.__dict__
+            if other.__class__ is self.__class__:
+                return (values(self) == values(other) and
+                        getattr(self, "__dict__", None) ==
+                        getattr(other, "__dict__", None))
+        except AttributeError:
+            pass
+
+        return self._attrs() == other._attrs()
+
+    def _dict_repr(self):
+        """__repr__() for instances that only have a __dict__."""
+        attrs = ", ".join([f"{k}={v!r}" for k, v in self.__dict__.items()])
+        return f"{self.__class__.__name__}({attrs})"
+
+    def _dict_eq(self, other):
+        """__eq__() for instances that only have a __dict__."""
+        return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+    def _slots_repr(self):
+        """__repr__() for instances that only have slots."""
+        names = self._slot_names
+        try:
+            values = self._slot_values(self)
+        except AttributeError:
+            # some are not set
+            return SlottedObject.__repr__(self)
+
+        if len(names) == 1:
+            values = (values,)
+        attrs = ", ".join([f"{k}={v!r}" for k, v in zip(names, values)])
+        return f"{self.__class__.__name__}({attrs})"
+
+    def _slots_eq(self, other):
+        """__eq__() for instances that only have slots."""
+        if other.__class__ is self.__class__:
+            values = self._slot_values
+            try:
+                return values(self) == values(other)
+            except AttributeError:
+                pass
+        return SlottedObject.__eq__(self, other)
+
+
+# the implementations that __init_subclass__() may replace with one another
+SlottedObject._METHODS = {
+    "__repr__": (SlottedObject.__repr__, SlottedObject._dict_repr,
+                 SlottedObject._slots_repr),
+    "__eq__": (SlottedObject.__eq__, SlottedObject._dict_eq,
+               SlottedObject._slots_eq),
+}
+
+
+class Object(SlottedObject):
+    """Arbitrary object class.
+
+    Instances have a __dict__, so any attribute can be set, like
+    Object(a=1).a. Subclasses can still define __slots__ for attributes that
+    every instance sets, but to leave out the __dict__ use SlottedObject.
+    """
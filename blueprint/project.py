@@ -1,19 +1,45 @@
 """Module for a new project."""
 
+from copy import copy
+from functools import cached_property
 from pathlib import Path
 from re import compile as re_compile
-from string import Template
+from shutil import copymode
 from subprocess import run
 
-from git import Repo
-
-from blueprint import ROOT, AccessError, ProgramError
+from blueprint import ROOT, AccessError, ProgramError, UserError
 from blueprint.attr import attr
+from blueprint.cache import digest
+from blueprint.files import copy_file
+from blueprint.git import GitRepo
+from blueprint.journal import Journal
+from blueprint.manifest import Manifest, jsonable
+from blueprint.names import ProjectNames
 from blueprint.object import Object
+from blueprint.sources import SourceIndex
+from blueprint.steps import Scheduler
+from blueprint.substitutions import Substitutions
+from blueprint.template import render, render_file, variables
+from blueprint.toolchain import mtime, toolchain
+from blueprint.trace import tracer
 
 bp = breakpoint
 
 
+def substituted(name: str) -> attr:
+    """Return an attr for a value that templates use.
+
+    Setting it makes the project forget its cached substitutions.
+    """
+    private_name = f"_{name}"
+
+    def setter(self, value):
+        setattr(self, private_name, value)
+        self.forget()
+
+    return attr(name, setter=setter)
+
+
 class Project(Object):
     """A new project."""
 
@@ -21,14 +47,60 @@ class Project(Object):
     SOURCES = ROOT / "sources" / "bare"
     PROJECT_VERSION = "0.0.1"
 
+    # source files that create() installs, so install_all() skips them
+    CREATE_FILES = ()
+
+    # message of the initial commit when git_commit is set
+    GIT_MESSAGE = "Initial commit"
+
+    # number of threads install_all() renders and writes files with
+    INSTALL_JOBS = 8
+
+    # step name -> names of the steps it depends on
+    STEPS = {
+        "create": (),
+        "setup_git": ("create",),
+        "install_all": ("create",),
+    }
+
+    # steps that make the project from a snapshot instead
+    SNAPSHOT_STEPS = {
+        "restore_snapshot": (),
+        "setup_git": ("restore_snapshot",),
+    }
+
+    # substitutions that differ between projects made from the same snapshot
+    SNAPSHOT_VARIABLES = (
+        "DASH_NAME", "SNAKE_NAME", "TITLE_NAME", "PASCAL_NAME", "SUMMARY",
+    )
+
+    # template variable -> function that returns its value for a project,
+    # see variable() to add more
+    VARIABLES = {
+        "DASH_NAME": lambda project: project.dash_name,
+        "TITLE_NAME": lambda project: project.title_name,
+        "SNAKE_NAME": lambda project: project.snake_name,
+        "PASCAL_NAME": lambda project: project.pascal_name,
+        "VERSION": lambda project: project.PROJECT_VERSION,
+        "SUMMARY": lambda project: project.summary,
+        "LICENSE": lambda project: project.license,
+    }
+
+    # cached properties that are computed from the values templates use
+    DERIVED = ("substitutions", "step_inputs")
+
     type: str = "basic"
 
-    def __init__(self, name=None, dest=None, summary="", license="", **kwargs):
+    def __init__(self, name=None, dest=None, summary="", license="",
+                 git_commit=False, snapshot=False, resume=False, **kwargs):
         """Create a new project object."""
         self.name = name
         self.dest = dest
         self.summary = summary
         self.license = license
+        self.git_commit = git_commit
+        self.snapshot = snapshot
+        self.resume = resume
 
         super().__init__(**kwargs)
 
@@ -44,10 +116,59 @@ class Project(Object):
         self._dest = dest
     dest = attr("dest", setter=_dest_setter)
 
+    def _name_setter(self, value):
+        """Set name and compute its variants."""
+        self._name = value
+        self._names = ProjectNames(value) if value is not None else None
+        self.forget()
+    name = attr("name", setter=_name_setter)
+
+    summary = substituted("summary")
+    license = substituted("license")
+
+    def forget(self, *names):
+        """Drop the values of cached properties so they are computed again.
+
+        Arguments:
+            names (str): cached property names, defaults to DERIVED
+        """
+        cached = getattr(self, "__dict__", {})
+        for name in names or self.DERIVED:
+            cached.pop(name, None)
+
     @property
     def path(self):
-        """Path to the project directory."""
-        return self.dest / self.dash_name
+        """Path to the project directory.
+
+        Defaults to the dash_name directory in dest, but can be set to an
+        existing project that has been moved or renamed.
+        """
+        return self.__dict__.get("_path") or self.dest / self.dash_name
+
+    @path.setter
+    def path(self, value):
+        """Set the project directory."""
+        self._path = Path(value) if value else None
+
+    @property
+    def options(self) -> dict:
+        """Return the arguments needed to make the same project again."""
+        return {
+            "name": self.name,
+            "summary": self.summary,
+            "license": self.license,
+        }
+
+    def variant(self, **changes) -> "Project":
+        """Return a copy of this project with the attributes in changes."""
+        project = copy(self)
+        project.__dict__ = {
+            k: v for k, v in self.__dict__.items()
+            if not isinstance(getattr(self.__class__, k, None), cached_property)
+        }
+        for name, value in changes.items():
+            setattr(project, name, value)
+        return project
 
     def create(self):
         """Create the project."""
@@ -59,7 +180,7 @@ class Project(Object):
 
         Example: MyProject
         """
-        return self.title_name.replace(" ", "")
+        return self._names.pascal
 
     @property
     def dash_name(self):
@@ -67,7 +188,7 @@ class Project(Object):
 
         Example: my-project
         """
-        return self.name.lower().translate(str.maketrans("_ ", "--"))
+        return self._names.dash
 
     @property
     def snake_name(self):
@@ -75,7 +196,7 @@ class Project(Object):
 
         Example: my_project
         """
-        return self.name.lower().translate(str.maketrans("- ", "__"))
+        return self._names.snake
 
     @property
     def title_name(self):
@@ -83,51 +204,124 @@ class Project(Object):
 
         Example: My Project
         """
-        return self.name.translate(str.maketrans("-_", "  ")).title()
+        return self._names.title
 
-    def source_path(self, file):
-        """Return the path to a source file."""
-        for klass in self.__class__.mro():
+    @classmethod
+    def layers(cls) -> tuple[Path]:
+        """Return the SOURCES dirs of this class and its parents, in that order."""
+        layers = []
+        for klass in cls.mro():
             if not issubclass(klass, Project):
                 break
 
-            path = klass.SOURCES / file
-            if path.exists():
-                return path
+            if klass.SOURCES not in layers:
+                layers.append(klass.SOURCES)
+
+        return tuple(layers)
+
+    @classmethod
+    def source_index(cls) -> SourceIndex:
+        """Return the index of all source files that this project type installs."""
+        return SourceIndex.get(cls.layers(), persist=toolchain.persist)
+
+    def source_path(self, file):
+        """Return the path to a source file."""
+        path = self.source_index().resolve(file)
+        if path:
+            return path
 
         klass = self.__class__.__name__
         raise ProgramError(f"Could not find source file: {file} in class: {klass}")
 
     def install(self, file):
         """Copy a file or create an empty directory from the source to the dest."""
-        src = self.source_path(file)
-        dest_filename = Template(file).safe_substitute(self.substitutions)
-        dest = self.path / dest_filename
+        with tracer.span(str(file), "install"):
+            src = self.source_path(file)
+            index = self.source_index()
+            substitutions = self.substitutions
+            dest = self.path / self.render_path(file, substitutions)
+
+            if index.is_dir(file):
+                dest.mkdir(parents=True, exist_ok=True)
+                return
+
+            if not index.needs_render(file):
+                copy_file(src, dest)
+                return
+
+            render_file(src, dest, substitutions, persist=toolchain.persist)
+            copymode(src, dest)
+
+    def render_path(self, file, substitutions=None) -> str:
+        """Return the path in the project that source file is installed to."""
+        return render(
+            str(file), substitutions or self.substitutions, toolchain.persist
+        )
 
-        if src.is_dir():
-            dest.mkdir(parents=True)
-            return
+    @classmethod
+    def variable(cls, name: str, func=None):
+        """Register a template variable for this project type and its subclasses.
 
-        src_text = src.read_text()
-        text = Template(src_text).safe_substitute(**self.substitutions)
-        dest.write_text(text)
+        Can be used as a decorator:
 
-    @property
-    def substitutions(self):
-        """Return a mapping of the file substitutions for installing files."""
-        return {
-            "DASH_NAME": self.dash_name,
-            "TITLE_NAME": self.title_name,
-            "SNAKE_NAME": self.snake_name,
-            "PASCAL_NAME": self.pascal_name,
-            "VERSION": self.PROJECT_VERSION,
-            "SUMMARY": self.summary,
-        }
+            @PythonProject.variable("YEAR")
+            def year(project):
+                return date.today().year
+
+        Arguments:
+            name (str): variable name used in templates
+            func (Callable): takes the project and returns the value
+        """
+        def register(func):
+            if "VARIABLES" not in cls.__dict__:
+                cls.VARIABLES = {}
+            cls.VARIABLES[name] = func
+            return func
+
+        return register(func) if func else register
+
+    @classmethod
+    def variables(cls) -> dict:
+        """Return the registered template variables of this class and its parents."""
+        registry = {}
+        for klass in reversed(cls.mro()):
+            registry.update(klass.__dict__.get("VARIABLES", {}))
+        return registry
+
+    @cached_property
+    def substitutions(self) -> Substitutions:
+        """Return a mapping of the file substitutions for installing files.
+
+        Values are computed the first time they are used, then reused until
+        an attribute that templates use, like name or summary, is changed.
+        """
+        return Substitutions(self, self.variables())
 
     def install_all(self):
-        """Install all dotfiles from sources into the new project directory."""
-        self.install("README.md")
-        self.install(".todo")
+        """Install everything from the layered sources into the project directory.
+
+        Directories are created first, then files are rendered or copied in a
+        thread pool. Files in CREATE_FILES are skipped since create() already
+        installed them.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        index = self.source_index()
+        substitutions = self.substitutions
+        files = []
+
+        for file in index.listing:
+            if file in self.CREATE_FILES:
+                continue
+
+            if index.is_dir(file):
+                dest = self.path / self.render_path(file, substitutions)
+                dest.mkdir(parents=True, exist_ok=True)
+            else:
+                files.append(file)
+
+        with ThreadPoolExecutor(max_workers=self.INSTALL_JOBS) as pool:
+            list(pool.map(self.install, files))
 
     def run(self, command: list, capture_output=True, text=True, **kwargs):
         """Run a CLI command."""
@@ -148,10 +342,12 @@ class Project(Object):
         if params.get("shell"):
             command = " ".join(command)
 
-        res = run(command, **params)
+        cmd = command if isinstance(command, str) else " ".join(command)
+        with tracer.span(cmd.split(" ")[0], "run", command=cmd) as span:
+            res = run(command, **params)
+            span["returncode"] = res.returncode
 
         if res.returncode:
-            cmd = " ".join(command)
             err = ""
             if hasattr(res, "stderr"):
                 err = res.stderr
@@ -161,12 +357,229 @@ class Project(Object):
 
         return res
 
+    async def arun(self, command: list, timeout=None, on_line=None, **kwargs):
+        """Run a CLI command without blocking the event loop.
+
+        Arguments:
+            command (list[str]): program and arguments
+            timeout (float): seconds before the command is killed
+            on_line (Callable[[str, str], None]): called with "stdout" or
+                "stderr" and each line of output as it is read
+        """
+        from blueprint.runner import AsyncRunner
+
+        cwd = kwargs.pop("cwd", self.path)
+        runner = AsyncRunner(timeout=timeout, on_line=on_line)
+        return await runner.run(command, cwd=cwd, **kwargs)
+
+    @property
+    def scheduler(self) -> Scheduler:
+        """Scheduler for the steps that make the project."""
+        steps = dict(self.SNAPSHOT_STEPS if self.snapshot else self.STEPS)
+        # record the files once every other step has written them
+        steps["save_manifest"] = tuple(steps)
+        if self.git_commit:
+            # commit once every other step has written its files
+            steps["commit_git"] = tuple(steps)
+        return Scheduler(steps)
+
     def make(self):
-        """Make the project end-to-end."""
-        self.create()
-        self.setup()
-        self.install_all()
+        """Make the project end-to-end, running independent steps concurrently.
+
+        Each step is recorded in the journal as it finishes or fails, and the
+        journal is removed once they all succeed. If resume is set, steps that
+        were done before with the same inputs are skipped, and a project that
+        was already made is left alone.
+        """
+        if self.resume and self.path.exists() and not self.journal.file.is_file():
+            if Manifest(self.path).file.is_file():
+                # made by an earlier run that finished
+                return
+            raise UserError(f"Nothing to resume, no project was started at: "
+                            f"'{self.path}'")
+
+        with tracer.span("make", "project", type=self.type, path=str(self.path)):
+            self.scheduler.run(self.run_step)
+
+        # only needed to resume a make() that did not finish
+        self.journal.remove()
+
+    @property
+    def journal_inputs(self) -> dict:
+        """Return everything besides the steps themselves that the steps use."""
+        index = self.source_index()
+        return {
+            "type": self.type,
+            "options": self.options,
+            "substitutions": dict(self.substitutions),
+            "git_commit": self.git_commit,
+            "snapshot": self.snapshot,
+            "sources": sorted(
+                (rel, mtime(entry[0])) for rel, entry in index.entries.items()
+            ),
+        }
+
+    @cached_property
+    def journal(self) -> Journal:
+        """Journal of the steps that made the project."""
+        return Journal.load(self.path) if self.resume else Journal(self.path)
+
+    @cached_property
+    def step_inputs(self) -> dict:
+        """Return the input hash of each step.
+
+        The hash of a step includes those of the steps it depends on, so a step
+        is done again if anything it comes after is.
+        """
+        scheduler = self.scheduler
+        inputs = digest(self.journal_inputs)
+        hashes = {}
+        for level in scheduler.levels:
+            for name in level:
+                requires = [hashes[x] for x in scheduler.steps[name]]
+                hashes[name] = digest(name, inputs, requires)
+        return hashes
+
+    def run_step(self, name: str):
+        """Run the step method called name and record it in the journal."""
+        inputs = self.step_inputs[name]
+        if self.resume and self.journal.completed(name, inputs):
+            with tracer.span(name, "step", skipped=True):
+                return
+
+        with tracer.span(name, "step"):
+            try:
+                result = getattr(self, name)()
+            except BaseException as e:
+                self.journal.record(
+                    name, inputs, "failed", f"{e.__class__.__name__}: {e}"
+                )
+                raise
+
+        self.journal.record(name, inputs, "done")
+        return result
 
     def setup(self):
-        """Take setup steps."""
-        Repo.init(self.path)
+        """Run the steps in STEPS besides create() and install_all() in order."""
+        names = set(self.STEPS) - {"create", "install_all"}
+        steps = {
+            name: tuple(x for x in requires if x in names)
+            for name, requires in self.STEPS.items() if name in names
+        }
+        Scheduler(steps, jobs=1).run(lambda name: getattr(self, name)())
+
+    def setup_git(self):
+        """Initialize the git repo.
+
+        The .git directory is written directly unless that fails, in which case
+        GitPython is used instead.
+        """
+        try:
+            GitRepo(self.path).init()
+        except OSError:
+            from git import Repo
+
+            Repo.init(self.path)
+
+    def save_manifest(self) -> Manifest:
+        """Record the template source and output of every installed file."""
+        index = self.source_index()
+        substitutions = self.substitutions
+        manifest = Manifest(
+            self.path, self.type, self.options, jsonable(dict(substitutions))
+        )
+
+        for file in index.listing:
+            dest = self.render_path(file, substitutions)
+            if not index.is_dir(file) and (self.path / dest).is_file():
+                manifest.record(file, dest, index.hash(file))
+
+        manifest.save()
+        return manifest
+
+    def update(self, force=False, dry_run=False) -> dict[str, list[str]]:
+        """Install the templates that changed since the project was made.
+
+        Only files whose template or variables changed are installed. A file
+        the user edited since is a conflict and is left alone unless force is
+        set.
+
+        Returns the project paths of files by status: "added", "updated",
+        "conflict", "modified" (edited by the user, but unchanged in the
+        blueprint), "removed" (no longer in the blueprint) and "unchanged".
+
+        Arguments:
+            force (bool): overwrite files that the user edited
+            dry_run (bool): report what would be done without changing files
+        """
+        manifest = Manifest.load(self.path)
+        index = self.source_index()
+        substitutions = self.substitutions
+        current = jsonable(dict(substitutions))
+        changed = {
+            var for var in current.keys() | manifest.substitutions.keys()
+            if current.get(var) != manifest.substitutions.get(var)
+        }
+        results = {status: [] for status in
+                   ("added", "updated", "conflict", "modified", "removed", "unchanged")}
+
+        for file in index.listing:
+            dest = self.render_path(file, substitutions)
+            if index.is_dir(file):
+                if not dry_run:
+                    (self.path / dest).mkdir(parents=True, exist_ok=True)
+                continue
+
+            entry = manifest.files.get(file)
+            uses_changed = changed and index.needs_render(file) and (
+                variables(index.resolve(file).read_text(encoding="utf-8")) & changed
+            )
+
+            if (entry and entry["source"] == index.hash(file)
+                    and entry["path"] == dest and not uses_changed):
+                status = "modified" if manifest.modified(file) else "unchanged"
+                results[status].append(dest)
+                continue
+
+            if entry:
+                conflict = manifest.modified(file)
+            else:
+                conflict = (self.path / dest).exists()
+
+            if conflict and not force:
+                results["conflict"].append(dest)
+                continue
+
+            results["updated" if entry else "added"].append(dest)
+            if not dry_run:
+                (self.path / dest).parent.mkdir(parents=True, exist_ok=True)
+                self.install(file)
+                manifest.record(file, dest, index.hash(file))
+
+        for file in sorted(manifest.files.keys() - set(index.listing)):
+            results["removed"].append(manifest.files[file]["path"])
+            if not dry_run:
+                del manifest.files[file]
+
+        if not dry_run:
+            manifest.options = self.options
+            manifest.substitutions = current
+            manifest.save()
+
+        return results
+
+    @property
+    def snapshot_inputs(self) -> dict:
+        """Return what a snapshot depends on besides the substitutions."""
+        return {}
+
+    def restore_snapshot(self) -> dict:
+        """Copy the project from its snapshot, making the snapshot if needed."""
+        from blueprint.snapshot import SnapshotCache
+
+        cache = SnapshotCache()
+        return cache.restore(cache.get(self), self)
+
+    def commit_git(self):
+        """Commit all of the generated files."""
+        return GitRepo(self.path).commit(self.GIT_MESSAGE)
@@ -1,5 +1,8 @@
 """Image Factory module."""
 
+from pathlib import Path
+
+from blueprint.manifest import Manifest
 from blueprint.project import Project
 from blueprint.python_project import PythonProject
 
@@ -20,3 +23,16 @@ class ProjectFactory:
             klass = PythonProject
 
         return klass(name, dest, **kwargs)
+
+    @classmethod
+    def load(cls, path) -> Project:
+        """Return the Project object for the generated project at path."""
+        path = Path(path).resolve()
+        manifest = Manifest.load(path)
+        project = cls(
+            dest=path.parent,
+            python=manifest.type == "python",
+            **manifest.options,
+        )
+        project.path = path
+        return project
@@ -1,12 +1,19 @@
 """Module for a new python project."""
 
+from functools import cached_property
 from pathlib import Path
-from shutil import which
-
-import toml
-
-from blueprint import ROOT, AccessError
-from blueprint.project import Project
+from shutil import rmtree
+
+from blueprint import ROOT, AccessError, ProgramError
+from blueprint.attr import attr
+from blueprint.files import copy_file
+from blueprint.lock_cache import LockCache
+from blueprint.project import Project, substituted
+from blueprint.shell_command import ShellCommand
+from blueprint.toolchain import DEFAULT_PYV, DEFAULT_PYV_CONSTRAINT, toolchain
+from blueprint.venv_cache import VenvCache, relocate, rename_prompt
+from blueprint.venv_pool import VenvPool
+from blueprint.wheelhouse import Wheelhouse
 
 bp = breakpoint
 
@@ -16,11 +23,29 @@ class PythonProject(Project):
 
     POETRY_PROJECT_VERSION = "0.1.0"
     SOURCES = ROOT / "sources" / "python"
-    DEFAULT_PYV = "3.10.2"
-    DEFAULT_PYV_CONSTRAINT = ">=3.10.2"
+    DEFAULT_PYV = DEFAULT_PYV
+    DEFAULT_PYV_CONSTRAINT = DEFAULT_PYV_CONSTRAINT
+    CREATE_FILES = ("pyproject.toml",)
 
     type: str = "python"
 
+    STEPS = {
+        **Project.STEPS,
+        "setup_dot_python_version": ("create",),
+        "setup_venv_cache": ("create",),
+        "setup_venv_pool": ("setup_venv_cache",),
+        "setup_wheelhouse": ("setup_venv_pool",),
+        "setup_poetry_use": ("setup_wheelhouse",),
+        "setup_poetry_lock": ("setup_poetry_use",),
+        "setup_poetry_install": ("setup_poetry_lock", "install_all"),
+    }
+
+    SNAPSHOT_STEPS = {
+        **Project.SNAPSHOT_STEPS,
+        "setup_poetry_use": ("restore_snapshot",),
+        "setup_poetry_install_snapshot": ("setup_poetry_use",),
+    }
+
     DEV_DEPENDENCIES = [
         "black",
         "flake8",
@@ -37,32 +62,53 @@ class PythonProject(Project):
         "pytest",
     ]
 
+    VARIABLES = {
+        "PYV": lambda project: project.pyv,
+        "PYV_CONSTRAINT": lambda project: project.pyv_constraint,
+        "AUTHOR": lambda project: project.author,
+        "DEV_DEPENDENCIES": lambda project: project.DEV_DEPENDENCIES,
+    }
+
+    pyv = substituted("pyv")
+    pyv_constraint = substituted("pyv_constraint")
+
     def __init__(self, name=None, dest=None,
-                 pyv=None, pyv_constraint=None, **kwargs):
-        """Create object."""
+                 pyv=None, pyv_constraint=None, venv_cache=False,
+                 lock_cache=True, refresh_lock=False, wheelhouse=False,
+                 venv_pool=False, author=None, **kwargs):
+        """Create object.
+
+        Arguments:
+            author (str): author in pyproject.toml, defaults to the one in the
+                          git config
+        """
+        self.author = author
         self.pyv = pyv or self.DEFAULT_PYV
         self.pyv_constraint = pyv_constraint or self.DEFAULT_PYV_CONSTRAINT
+        self.venv_cache = venv_cache
+        self.lock_cache = lock_cache
+        self.refresh_lock = refresh_lock
+        self.wheelhouse = wheelhouse
+        self.venv_pool = venv_pool
         super().__init__(name, dest, **kwargs)
 
     @classmethod
     @property
     def poetry_exe(cls):
         """Return the path to the poetry executable."""
-        return which("poetry")
+        return toolchain.which("poetry")
 
-    def create(self):
-        """Create the project using poetry."""
-        if self.path.exists():
+    def check_path(self):
+        """Raise an AccessError if the project directory exists, unless resuming."""
+        if self.path.exists() and not self.resume:
             raise AccessError(f"Directory already exists: {self.path}")
-        command = [
-            "poetry",
-            "--directory",
-            str(self.dest),
-            "new",
-            f"--name={self.dash_name}",
-            str(self.path)
-        ]
-        return self.run(command, cwd=self.dest)
+
+    def create(self):
+        """Create the project directory layout and pyproject.toml file."""
+        self.check_path()
+        (self.path / self.snake_name).mkdir(parents=True, exist_ok=True)
+        (self.path / "tests").mkdir(exist_ok=True)
+        self.setup_pyproject()
 
     def setup_dot_python_version(self):
         """Install the python version to .python-version file."""
@@ -77,19 +123,89 @@ class PythonProject(Project):
         """Return the location to the correct python executable."""
         if not self.pyv:
             return
-        command = [
-            "asdf",
-            "where",
-            "python",
-            self.pyv,
-        ]
-        res = self.run(command)
-        pyroot = res.stdout.strip()
+        pyroot = toolchain.asdf_where(self.pyv)
         return f"{pyroot}/bin/python"
 
+    @property
+    def in_project_venv(self) -> Path:
+        """Path to the virtual env that poetry uses if it is in the project."""
+        return self.path / ".venv"
+
+    def setup_venv_cache(self):
+        """Clone a cached virtual env with the dev dependencies into the project."""
+        if not self.venv_cache:
+            return
+
+        cache = VenvCache()
+        entry = cache.get(self.python_where, self.pyv, self.DEV_DEPENDENCIES)
+        return cache.clone(entry, self.in_project_venv)
+
+    def setup_venv_pool(self):
+        """Move a virtual env made ahead of time into the project.
+
+        If one was taken, the pool is filled again in the background. If it was
+        empty, poetry makes the virtual env as usual.
+        """
+        if not self.venv_pool or self.in_project_venv.exists():
+            return
+
+        python = self.python_where
+        if not python:
+            return
+
+        pool = VenvPool()
+        venv = pool.claim(python, self.pyv, self.in_project_venv, self.dash_name)
+        if venv:
+            pool.refill(self.pyv)
+        return venv
+
+    def setup_wheelhouse(self):
+        """Install the dev dependencies from the local wheelhouse into the venv.
+
+        The lock file the wheels were built from is copied into the project,
+        and the wheels are unpacked straight into the in-project virtual env, so
+        that `poetry install` finds every locked package already installed.
+        """
+        if not self.wheelhouse:
+            return
+
+        wheelhouse = Wheelhouse()
+        if not wheelhouse.is_built(
+            self.pyv, self.DEV_DEPENDENCIES, self.pyv_constraint
+        ):
+            raise ProgramError(
+                f"The wheelhouse in {wheelhouse.path(self.pyv)} was not built for "
+                f"these dev dependencies and Python {self.pyv_constraint}, "
+                f"run `bp wheelhouse build --pyv {self.pyv}` first"
+            )
+
+        venv = self.in_project_venv
+        if not venv.is_dir():
+            ShellCommand(self.python_where, "-m", "venv", str(venv)).run()
+
+        wheelhouse.install(venv, self.pyv)
+        copy_file(wheelhouse.lockfile(self.pyv), self.lockfile)
+
+    def build_wheelhouse(self, root=None) -> list[Path]:
+        """Lock the dev dependencies, then build the wheelhouse at those versions.
+
+        Arguments:
+            root (Path): wheelhouse directory, see Wheelhouse
+        """
+        self.create()
+        self.setup_poetry_lock()
+        return Wheelhouse(root).build(
+            self.python_where, self.pyv, self.DEV_DEPENDENCIES,
+            self.pyv_constraint, self.lockfile,
+        )
+
     def setup_poetry_use(self):
         """Tell poetry which python executable to use."""
-        if not self.python_where:
+        python = self.python_where
+        if self.in_project_venv.is_dir():
+            python = str(self.in_project_venv / "bin" / "python")
+
+        if not python:
             return
 
         command = [
@@ -98,34 +214,127 @@ class PythonProject(Project):
             str(self.path),
             "env",
             "use",
-            self.python_where,
+            python,
         ]
-        return self.run(command)
+        res = self.run(command)
+        self.forget("venv_path")
+        return res
 
     def setup_poetry_install(self):
         """Install project and dependencies in venv."""
         command = ["poetry", "--directory", str(self.path), "install"]
         return self.run(command)
 
-    def setup_dev_dependencies(self):
-        """Install poetry dev dependencies."""
-        command = [
-            "poetry",
-            "--directory",
-            str(self.path),
-            "add",
-            "--group",
-            "dev",
-            *self.DEV_DEPENDENCIES,
-        ]
+    @property
+    def options(self) -> dict:
+        """Return the arguments needed to make the same project again."""
+        return {
+            **super().options,
+            "pyv": self.pyv,
+            "pyv_constraint": self.pyv_constraint,
+            # so that updating under another git user does not change it
+            "author": self.author,
+        }
+
+    @property
+    def journal_inputs(self) -> dict:
+        """Return everything besides the steps themselves that the steps use."""
+        return {
+            **super().journal_inputs,
+            "venv_cache": self.venv_cache,
+            "lock_cache": self.lock_cache,
+            "refresh_lock": self.refresh_lock,
+            "wheelhouse": self.wheelhouse,
+            "venv_pool": self.venv_pool,
+        }
+
+    @property
+    def snapshot_inputs(self) -> dict:
+        """Return what a snapshot depends on besides the substitutions."""
+        return {
+            "poetry": self.poetry_version,
+            "venv_cache": self.venv_cache,
+            "wheelhouse": self.wheelhouse,
+        }
+
+    def restore_snapshot(self) -> dict:
+        """Copy the project from its snapshot and relocate its virtual env."""
+        from blueprint.snapshot import SnapshotCache
+
+        self.check_path()
+        metadata = super().restore_snapshot()
+        venv = self.in_project_venv
+        if not venv.is_dir():
+            return metadata
+
+        relocate(venv, Path(metadata["path"]) / venv.name, venv)
+        rename_prompt(venv, SnapshotCache.renames(metadata, self))
+
+        # the snapshot project itself is installed again under its real name
+        root = metadata["names"]["SNAKE_NAME"]
+        for path in venv.glob(f"lib/python*/site-packages/{root}[-.]*"):
+            if path.is_dir():
+                rmtree(path)
+            else:
+                path.unlink()
+
+        return metadata
+
+    def setup_poetry_install_snapshot(self):
+        """Install the project in the virtual env restored from a snapshot.
+
+        If the virtual env is not in the project it was not part of the
+        snapshot, so the dependencies are installed from the restored lock file.
+        """
+        command = ["poetry", "--directory", str(self.path), "install"]
+        if self.in_project_venv.is_dir():
+            command.append("--only-root")
         return self.run(command)
 
+    @property
+    def poetry_version(self) -> str:
+        """Return the version of poetry."""
+        return toolchain.poetry_version()
+
+    @property
+    def lockfile(self) -> Path:
+        """Path to the poetry.lock file."""
+        return self.path / "poetry.lock"
+
+    def setup_poetry_lock(self):
+        """Resolve the dependencies in pyproject.toml to a poetry.lock file.
+
+        If lock_cache is set, reuse the lock file from a previous project with
+        the same dependencies, Python constraint and poetry version, or save
+        this one for next time. Set refresh_lock to resolve it again anyway.
+
+        If wheelhouse is set the lock file was copied from the wheelhouse.
+        """
+        if self.wheelhouse:
+            return
+
+        if self.lock_cache:
+            cache = LockCache()
+            key = cache.key(
+                self.DEV_DEPENDENCIES, self.pyv_constraint, self.poetry_version
+            )
+            if not self.refresh_lock and cache.fetch(key, self.lockfile):
+                return
+
+        command = ["poetry", "--directory", str(self.path), "lock"]
+        res = self.run(command)
+
+        if self.lock_cache:
+            cache.store(key, self.lockfile)
+
+        return res
+
     @property
     def pyproject(self):
         """Path to the pyproject.toml file."""
         return self.path / "pyproject.toml"
 
-    @property
+    @cached_property
     def venv_path(self) -> Path:
         """Return the path to this projects virtual environment."""
         command = [
@@ -139,71 +348,35 @@ class PythonProject(Project):
         res = self.run(command)
         return Path(res.stdout.strip())
 
-    def install_all(self):
-        """Install all dotfiles from sources into the new project directory."""
-        self.install(".env")
-        self.install("setup.cfg")
-        self.install("${SNAKE_NAME}/__init__.py")
-        self.install("${SNAKE_NAME}/object.py")
-        self.install("${SNAKE_NAME}/attr.py")
-        self.install("tests/test_${SNAKE_NAME}.py")
-        super().install_all()
-
-    def setup_poetry_init(self):
-        """Generate initial pyproject.toml file."""
-        command = [
-            "poetry",
-            "--directory",
-            str(self.path),
-            "init",
-            f"--name={self.dash_name}",
-            f"--python={self.pyv_constraint}",
-            "--no-interaction",
-        ]
-
-        if self.summary:
-            command.append(f"--description={self.summary}")
-
-        if self.license:
-            command.append(f"--license={self.license}")
-
-        if self.pyproject.is_file():
-            self.pyproject.unlink()
-
-        return self.run(command)
-
-    def setup(self):
-        """Set up Python project."""
-        super().setup()
-        self.setup_dot_python_version()
-        self.setup_poetry_init()
-        self.setup_pyproject()
-        self.setup_dev_dependencies()
-        self.setup_poetry_use()
-        self.setup_poetry_install()
+    def _author_getter(self):
+        """Return the author, looked up in the git config if it was not given."""
+        if self._author is None:
+            self._author = self.git_author()
+        return self._author
+
+    def _author_setter(self, value):
+        """Set author and forget the substitutions made with the old one."""
+        self._author = value
+        self.forget()
+    author = attr("author", getter=_author_getter, setter=_author_setter)
+
+    def git_author(self) -> str:
+        """Return the author from the git config the same way poetry init does.
+
+        If git is missing or has no user.name the author is left empty.
+        """
+        command = ShellCommand("git", "config", "--get-regexp", r"^user\.(name|email)$")
+        try:
+            res = command.run()
+        except (FileNotFoundError, ProgramError):
+            return ""
+        user = dict(line.split(" ", 1) for line in res.stdout.splitlines())
+
+        name, email = user.get("user.name"), user.get("user.email")
+        if name and email:
+            return f"{name} <{email}>"
+        return name or ""
 
     def setup_pyproject(self):
-        """Add more config info to pyproject.toml."""
-        with open(self.pyproject) as f:
-            specs = toml.load(f)
-
-        # add/modify toml contents
-        specs["tool"]["poetry"]["version"] = self.PROJECT_VERSION
-        specs["tool"]["pytest"] = {}
-        specs["tool"]["black"] = {}
-        specs["tool"]["pytest"]["ini_options"] = {
-            "testpaths": ["tests"],
-            "addopts": "-vvx",
-        }
-        specs["tool"]["black"]["line-length"] = "88"
-
-        # put the sections in the correct order
-        order = [{"tool": {x: specs["tool"][x]}} for x in ("poetry", "pytest", "black")]
-        order.append({"build-system": specs["build-system"]})
-
-        # convert sections to toml then join them together
-        sections = [toml.dumps(x) for x in order]
-        text = "\n".join(sections)
-
-        # save the pyproject.toml file
-        self.pyproject.write_text(text)
+        """Write the pyproject.toml file."""
+        self.install("pyproject.toml")
@@ -0,0 +1,135 @@
+"""Update many generated projects with the latest templates in parallel."""
+
+from glob import glob, has_magic
+from os import cpu_count, scandir
+from pathlib import Path
+
+from blueprint import BlueprintError
+from blueprint.manifest import DIRNAME, Manifest
+from blueprint.object import Object, SlottedObject
+from blueprint.project_factory import ProjectFactory
+
+bp = breakpoint
+
+# directories that are never searched for projects
+SKIP_DIRS = {".git", ".venv", "node_modules", "__pycache__"}
+
+
+class RolloutResult(SlottedObject):
+    """The outcome of updating one project in a rollout."""
+
+    __slots__ = ("path", "files", "error")
+
+    def __init__(self, path=None, files=None, error=None, **kwargs):
+        """Create object.
+
+        Arguments:
+            path (Path): project directory
+            files (dict[str, list[str]]): files by status from Project.update()
+            error (str): message if the project could not be updated
+        """
+        self.path = path
+        self.files = files or {}
+        self.error = error
+        super().__init__(**kwargs)
+
+    @property
+    def status(self) -> str:
+        """Return "failed", "conflict", "updated" or "skipped" (up to date)."""
+        if self.error:
+            return "failed"
+        if self.files.get("conflict"):
+            return "conflict"
+        if any(self.files.get(x) for x in ("added", "updated", "removed")):
+            return "updated"
+        return "skipped"
+
+
+def is_project(path: Path) -> bool:
+    """Return True if path is a project made by blueprint."""
+    return (path / DIRNAME / Manifest.FILENAME).is_file()
+
+
+def discover(paths) -> list[Path]:
+    """Return the projects in or under paths, which may be glob patterns.
+
+    Directories are searched recursively, but not inside of projects.
+    """
+    found, todo = [], []
+    for path in paths:
+        path = str(path)
+        matches = sorted(glob(path)) if has_magic(path) else [path]
+        todo.extend(Path(match) for match in matches)
+
+    while todo:
+        path = todo.pop(0)
+        if is_project(path):
+            found.append(path.resolve())
+            continue
+
+        try:
+            with scandir(path) as it:
+                subdirs = sorted(
+                    Path(entry.path) for entry in it
+                    if entry.is_dir(follow_symlinks=False)
+                    and entry.name not in SKIP_DIRS
+                )
+        except (NotADirectoryError, FileNotFoundError, PermissionError):
+            continue
+        todo[:0] = subdirs
+
+    return list(dict.fromkeys(found))
+
+
+def update_project(path: Path, force=False, dry_run=False) -> RolloutResult:
+    """Update a single project in a worker process."""
+    try:
+        files = ProjectFactory.load(path).update(force=force, dry_run=dry_run)
+    except BlueprintError as e:
+        return RolloutResult(path, error=e.message)
+    except Exception as e:
+        return RolloutResult(path, error=f"{e.__class__.__name__}: {e}")
+
+    return RolloutResult(path, files)
+
+
+class Rollout(Object):
+    """Template changes to apply to many projects."""
+
+    def __init__(self, projects=None, jobs=None, force=False, dry_run=False,
+                 **kwargs):
+        """Create object.
+
+        Arguments:
+            projects (list[Path]): project directories, see discover()
+            jobs (int): maximum number of projects to update at the same time
+            force (bool): overwrite files that were edited in a project
+            dry_run (bool): report what would change without changing files
+        """
+        self.projects = projects or []
+        self.jobs = jobs
+        self.force = force
+        self.dry_run = dry_run
+        super().__init__(**kwargs)
+
+    @property
+    def workers(self) -> int:
+        """Return the size of the worker pool."""
+        return max(1, min(self.jobs or cpu_count() or 1, len(self.projects)))
+
+    def run(self) -> list[RolloutResult]:
+        """Update all projects and return a result for each, in order."""
+        from concurrent.futures import ProcessPoolExecutor
+
+        if not self.projects:
+            return []
+
+        count = len(self.projects)
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(
+                update_project,
+                self.projects,
+                [self.force] * count,
+                [self.dry_run] * count,
+                chunksize=max(1, count // (self.workers * 4)),
+            ))
@@ -0,0 +1,119 @@
+"""Run CLI commands with asyncio so that many can be awaited at the same time."""
+
+import asyncio
+from subprocess import CompletedProcess
+from typing import Callable
+
+from blueprint import ProgramError
+from blueprint.object import Object
+from blueprint.trace import tracer
+
+bp = breakpoint
+
+# longest line of output that can be streamed
+LINE_LIMIT = 1024 * 1024
+
+
+class AsyncRunner(Object):
+    """Runs CLI commands as asyncio subprocesses.
+
+    Errors are reported the same way as Project.run(): a ProgramError with
+    the exit code and stderr if a command fails. Commands that take longer
+    than the timeout, write a line longer than LINE_LIMIT, or whose task is
+    cancelled, are killed.
+    """
+
+    def __init__(self, timeout=None, on_line=None, **kwargs):
+        """Create object.
+
+        Arguments:
+            timeout (float): default seconds a command may run for
+            on_line (Callable[[str, str], None]): called with the stream name
+                ("stdout" or "stderr") and each line of output as it is read
+        """
+        self.timeout = timeout
+        self.on_line = on_line
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        """AsyncRunner(timeout=None)."""
+        return f"{self.__class__.__name__}(timeout={self.timeout!r})"
+
+    async def read(self, name: str, stream, on_line: Callable) -> str:
+        """Return everything read from stream, passing each line to on_line."""
+        lines = []
+        while line := await stream.readline():
+            line = line.decode(errors="replace")
+            lines.append(line)
+            if on_line:
+                on_line(name, line)
+        return "".join(lines)
+
+    async def run(self, command: list, cwd=None, timeout=None, on_line=None,
+                  **kwargs) -> CompletedProcess:
+        """Run command and return its result once it exits.
+
+        Arguments:
+            command (list[str]): program and arguments
+            cwd (Path): directory to run the command in
+            timeout (float): seconds the command may run for, defaults to
+                             self.timeout
+            on_line (Callable[[str, str], None]): defaults to self.on_line
+            kwargs: passed to asyncio.create_subprocess_exec()
+        """
+        command = [str(arg) for arg in command]
+        cmd = " ".join(command)
+        timeout = timeout if timeout is not None else self.timeout
+        on_line = on_line or self.on_line
+
+        with tracer.span(command[0], "run", command=cmd) as span:
+            proc = await asyncio.create_subprocess_exec(
+                *command,
+                cwd=cwd,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=LINE_LIMIT,
+                **kwargs,
+            )
+
+            try:
+                stdout, stderr, _ = await asyncio.wait_for(
+                    asyncio.gather(
+                        self.read("stdout", proc.stdout, on_line),
+                        self.read("stderr", proc.stderr, on_line),
+                        proc.wait(),
+                    ),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                await self.kill(proc)
+                raise ProgramError(f"Timed out after {timeout}s CLI command {cmd!r}")
+            except asyncio.CancelledError:
+                await self.kill(proc)
+                raise
+            except (ValueError, asyncio.LimitOverrunError):
+                await self.kill(proc)
+                raise ProgramError(
+                    f"Output line longer than {LINE_LIMIT} bytes from CLI command "
+                    f"{cmd!r}"
+                )
+
+            span["returncode"] = proc.returncode
+
+        if proc.returncode:
+            raise ProgramError(
+                f"Failed CLI command [{proc.returncode}] {cmd!r}: {stderr!r}"
+            )
+
+        return CompletedProcess(command, proc.returncode, stdout, stderr)
+
+    @staticmethod
+    async def kill(proc):
+        """Kill proc if it is still running and wait for it to exit."""
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+        await proc.wait()
@@ -1,8 +1,11 @@
 """ShellCommand class."""
 
 from shutil import which
+from subprocess import run as run_process
 
+from blueprint import ProgramError
 from blueprint.object import Object
+from blueprint.trace import tracer
 
 bp = breakpoint
 
@@ -54,3 +57,20 @@ class ShellCommand(Object):
         if not self.program:
             return
         return [self.program, *self.args]
+
+    def run(self):
+        """Run the command and return the result.
+
+        Raise a ProgramError if it exits with a non-zero status.
+        """
+        cmd = " ".join(self.command)
+        with tracer.span(self.command[0], "run", command=cmd) as span:
+            res = run_process(self.command, **self.run_params)
+            span["returncode"] = res.returncode
+
+        if res.returncode:
+            raise ProgramError(
+                f"Failed CLI command [{res.returncode}] {cmd!r}: {res.stderr!r}"
+            )
+
+        return res
@@ -0,0 +1,176 @@
+"""Cache of fully made projects that new projects are copied from.
+
+Projects of the same type and options differ only in the variables derived
+from their name and summary. A snapshot is a project that was made once with
+placeholder values for those variables. New projects are copied from it, with
+the placeholders in paths renamed and only the templates that use those
+variables rendered again.
+"""
+
+import json
+from os import getpid, readlink, symlink, walk
+from pathlib import Path
+from shutil import rmtree
+
+from blueprint.cache import Cache, digest
+from blueprint.files import copy_file
+from blueprint.manifest import DIRNAME
+from blueprint.template import ENGINE_VERSION, variables
+from blueprint.toolchain import mtime
+from blueprint.venv_cache import link_or_copy
+
+bp = breakpoint
+
+# placeholder values that a snapshot is made with
+SENTINEL_NAME = "bpsnapshot-zqx"
+SENTINEL_SUMMARY = "bpsnapshot summary zqx"
+
+
+class SnapshotCache(Cache):
+    """Projects made once for each project type and set of options."""
+
+    NAME = "snapshots"
+    METADATA = "blueprint-snapshot.json"
+    TREE = "tree"
+
+    # top level directories of a project that are not part of its snapshot
+    EXCLUDE = (".git", DIRNAME)
+
+    # top level directories that are hardlinked instead of copied
+    LINK = (".venv",)
+
+    def key(self, project) -> str:
+        """Return the cache key for everything but the name of project."""
+        index = project.source_index()
+        stamps = sorted((rel, mtime(entry[0])) for rel, entry in index.entries.items())
+        substitutions = {
+            var: value for var, value in project.substitutions.items()
+            if var not in project.SNAPSHOT_VARIABLES
+        }
+        return digest(
+            project.__class__.__name__,
+            substitutions,
+            project.snapshot_inputs,
+            stamps,
+            ENGINE_VERSION,
+        )
+
+    def get(self, project) -> Path:
+        """Return the snapshot entry for project, making it if needed."""
+        key = self.key(project)
+        entry = self.path(key)
+
+        with self.lock(key):
+            if not (entry / self.METADATA).is_file():
+                self.bake(entry, project)
+
+        return entry
+
+    @staticmethod
+    def render_files(project) -> list[str]:
+        """Return the source files of project that use the snapshot variables."""
+        index = project.source_index()
+        names = set(project.SNAPSHOT_VARIABLES)
+        return [
+            file for file in index.listing
+            if index.needs_render(file)
+            and variables(index.resolve(file).read_text(encoding="utf-8")) & names
+        ]
+
+    def bake(self, entry: Path, project):
+        """Make a copy of project with the placeholder values at entry."""
+        tmp = entry.with_name(f"{entry.name}.{getpid()}.tmp")
+        if tmp.exists():
+            rmtree(tmp)
+        tmp.mkdir(parents=True)
+
+        baker = project.variant(
+            name=SENTINEL_NAME,
+            summary=SENTINEL_SUMMARY,
+            dest=tmp,
+            path=None,
+            snapshot=False,
+            git_commit=False,
+        )
+        baker.make()
+
+        for name in self.EXCLUDE:
+            rmtree(baker.path / name, ignore_errors=True)
+
+        substitutions = baker.substitutions
+        render = self.render_files(baker)
+        metadata = {
+            "path": str(baker.path),
+            "names": {var: substitutions[var] for var in project.SNAPSHOT_VARIABLES},
+            "render": render,
+            "rendered": [baker.render_path(file) for file in render],
+        }
+
+        # written last so an interrupted bake is never used
+        baker.path.rename(tmp / self.TREE)
+        (tmp / self.METADATA).write_text(json.dumps(metadata, indent=2))
+
+        if entry.exists():
+            rmtree(entry)
+        tmp.rename(entry)
+
+    @staticmethod
+    def renames(metadata: dict, project) -> list[tuple[str, str]]:
+        """Return (placeholder, name) pairs for project, longest placeholder first.
+
+        Longer placeholders go first so that ones containing others are
+        replaced whole.
+        """
+        substitutions = project.substitutions
+        return sorted(
+            ((old, substitutions[var]) for var, old in metadata["names"].items()),
+            key=lambda item: -len(item[0]),
+        )
+
+    def restore(self, entry: Path, project) -> dict:
+        """Copy the snapshot at entry to the path of project and return its metadata.
+
+        Paths are renamed to use the names of project, and the templates that
+        use the snapshot variables are installed again.
+        """
+        metadata = json.loads((entry / self.METADATA).read_text())
+        tree = entry / self.TREE
+        names = self.renames(metadata, project)
+        skip = set(metadata["rendered"])
+
+        def rename(rel: str) -> str:
+            if rel.split("/", 1)[0] in self.LINK:
+                return rel
+            for old, new in names:
+                rel = rel.replace(old, new)
+            return rel
+
+        project.path.mkdir(parents=True, exist_ok=True)
+
+        for root, dirs, files in walk(tree):
+            prefix = Path(root).relative_to(tree).as_posix()
+            prefix = "" if prefix == "." else f"{prefix}/"
+            link = prefix.split("/", 1)[0] in self.LINK
+
+            for name in [*dirs, *files]:
+                rel = f"{prefix}{name}"
+                src, dest = Path(root) / name, project.path / rename(rel)
+
+                if src.is_symlink():
+                    symlink(readlink(src), dest)
+                elif src.is_dir():
+                    dest.mkdir(exist_ok=True)
+                elif rel in skip:
+                    continue
+                elif link:
+                    link_or_copy(src, dest)
+                else:
+                    copy_file(src, dest)
+
+            # symlinked directories were copied as links above
+            dirs[:] = [name for name in dirs if not (Path(root) / name).is_symlink()]
+
+        for file in metadata["render"]:
+            project.install(file)
+
+        return metadata
@@ -0,0 +1,176 @@
+"""Index of the template sources that a project type installs."""
+
+import json
+from os import getpid, scandir, stat
+from pathlib import Path, PurePosixPath
+from threading import Lock
+
+from blueprint.cache import Cache, digest
+from blueprint.files import file_hash, needs_render
+from blueprint.object import Object
+
+bp = breakpoint
+
+# names in SOURCES dirs that are never installed
+IGNORE = {"__pycache__", ".DS_Store"}
+
+
+def scan(root: Path) -> tuple[dict, dict]:
+    """Walk root once and return its files and directories.
+
+    Returns a mapping of relative path to (is_dir, needs_render) for every
+    entry under root, and a mapping of relative path to mtime for root and
+    everything under it.
+    """
+    entries, mtimes = {}, {}
+    if not root.is_dir():
+        return entries, mtimes
+
+    mtimes["."] = stat(root).st_mtime
+    todo = [(root, "")]
+
+    while todo:
+        path, prefix = todo.pop()
+        with scandir(path) as it:
+            for entry in it:
+                if entry.name in IGNORE:
+                    continue
+
+                rel = f"{prefix}{entry.name}"
+                is_dir = entry.is_dir()
+                entries[rel] = (is_dir, not is_dir and needs_render(entry.path))
+                mtimes[rel] = entry.stat().st_mtime
+                if is_dir:
+                    todo.append((entry.path, f"{rel}/"))
+
+    return entries, mtimes
+
+
+class SourceIndexCache(Cache):
+    """Saved scans of source layers, valid while their mtimes are unchanged."""
+
+    NAME = "sources"
+
+    def file(self, layer: Path) -> Path:
+        """Return the path to the saved scan of layer."""
+        return self.root / f"{digest(str(layer))}.json"
+
+    def load(self, layer: Path) -> dict:
+        """Return the saved entries for layer, or None if it has changed."""
+        try:
+            data = json.loads(self.file(layer).read_text())
+        except (OSError, ValueError):
+            return None
+
+        for rel, saved in data["mtimes"].items():
+            try:
+                if stat(layer / rel).st_mtime != saved:
+                    return None
+            except OSError:
+                return None
+
+        return {rel: tuple(entry) for rel, entry in data["entries"].items()}
+
+    def save(self, layer: Path, entries: dict, mtimes: dict):
+        """Save the scan of layer."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.file(layer)
+        tmp = path.with_suffix(f".{getpid()}.tmp")
+        tmp.write_text(json.dumps({"mtimes": mtimes, "entries": entries}))
+        tmp.replace(path)
+
+
+class SourceIndex(Object):
+    """Map of each template path to its source across layered SOURCES dirs.
+
+    Layers are in order of precedence, so a file in the first layer overrides
+    the same file in the ones after it.
+    """
+
+    _indexes: dict = {}
+    _lock = Lock()
+
+    def __init__(self, layers=(), persist=False, **kwargs):
+        """Create object and scan the layers.
+
+        Arguments:
+            layers (tuple[Path]): SOURCES directories, most specific first
+            persist (bool): reuse saved scans of layers that have not changed
+        """
+        self.layers = tuple(layers)
+        self.persist = persist
+        self.entries = {}
+        self.hashes = {}
+        super().__init__(**kwargs)
+        self.build()
+
+    @classmethod
+    def get(cls, layers, persist=False) -> "SourceIndex":
+        """Return the index for layers, building it once per process."""
+        layers = tuple(layers)
+        with cls._lock:
+            if layers not in cls._indexes:
+                cls._indexes[layers] = cls(layers, persist)
+            return cls._indexes[layers]
+
+    @classmethod
+    def clear(cls):
+        """Forget all indexes built in this process."""
+        with cls._lock:
+            cls._indexes.clear()
+
+    def scan_layer(self, layer: Path) -> dict:
+        """Return the entries of layer, from the saved scan if possible."""
+        cache = SourceIndexCache() if self.persist else None
+        entries = cache.load(layer) if cache else None
+
+        if entries is None:
+            entries, mtimes = scan(layer)
+            if cache and mtimes:
+                cache.save(layer, entries, mtimes)
+
+        return entries
+
+    def build(self):
+        """Scan each layer and merge them, the first layers taking precedence."""
+        self.entries = {}
+        for layer in reversed(self.layers):
+            for rel, (is_dir, templated) in self.scan_layer(layer).items():
+                self.entries[rel] = (layer / rel, is_dir, templated)
+
+    @staticmethod
+    def normalize(file) -> str:
+        """Return file as a relative POSIX path string."""
+        return str(PurePosixPath(file))
+
+    def resolve(self, file) -> Path:
+        """Return the source path for file or None if no layer has it."""
+        entry = self.entries.get(self.normalize(file))
+        return entry[0] if entry else None
+
+    def is_dir(self, file) -> bool:
+        """Return True if the source for file is a directory."""
+        entry = self.entries.get(self.normalize(file))
+        return bool(entry and entry[1])
+
+    def needs_render(self, file) -> bool:
+        """Return True if the source for file contains template syntax."""
+        entry = self.entries.get(self.normalize(file))
+        return bool(entry and entry[2])
+
+    def hash(self, file) -> str:
+        """Return the sha256 hex digest of the source for file, computed once."""
+        file = self.normalize(file)
+        if file not in self.hashes:
+            self.hashes[file] = file_hash(self.entries[file][0])
+        return self.hashes[file]
+
+    @property
+    def listing(self) -> list[str]:
+        """Return every template path that would be installed, sorted."""
+        return sorted(self.entries)
+
+    def __repr__(self):
+        """SourceIndex(layers=(...), entries=N)."""
+        return (f"{self.__class__.__name__}"
+                f"(layers={self.layers!r}, entries={len(self.entries)})")
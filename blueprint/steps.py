@@ -0,0 +1,106 @@
+"""Dependency-graph scheduler for the steps that make a project."""
+
+from typing import Callable
+
+from blueprint import ProgramError
+from blueprint.object import Object
+
+bp = breakpoint
+
+
+class Scheduler(Object):
+    """Run steps concurrently as soon as the steps they depend on are done."""
+
+    def __init__(self, steps=None, jobs=None, **kwargs):
+        """Create object.
+
+        Arguments:
+            steps (dict[str, tuple]): mapping of step name to the names of the
+                                      steps that it depends on
+            jobs (int): maximum number of steps to run at the same time
+        """
+        self.steps = steps or {}
+        self.jobs = jobs
+        super().__init__(**kwargs)
+
+    def validate(self):
+        """Raise a ProgramError if a dependency is missing or circular."""
+        for name, requires in self.steps.items():
+            missing = [x for x in requires if x not in self.steps]
+            if missing:
+                raise ProgramError(
+                    f"Step {name!r} requires unknown step(s): {', '.join(missing)}"
+                )
+        self.levels
+
+    @property
+    def levels(self) -> list[list[str]]:
+        """Return the steps grouped by the earliest round they can run in."""
+        done, levels = set(), []
+        remaining = dict(self.steps)
+
+        while remaining:
+            ready = [
+                name for name, requires in remaining.items()
+                if done.issuperset(requires)
+            ]
+            if not ready:
+                raise ProgramError(
+                    f"Circular step dependencies: {', '.join(remaining)}"
+                )
+
+            levels.append(ready)
+            done.update(ready)
+            for name in ready:
+                remaining.pop(name)
+
+        return levels
+
+    def explain(self) -> list[str]:
+        """Return a line for each step with the steps it waits for."""
+        lines = []
+        for i, level in enumerate(self.levels, 1):
+            for name in level:
+                requires = self.steps[name]
+                after = f" <- {', '.join(requires)}" if requires else ""
+                lines.append(f"{i}. {name}{after}")
+        return lines
+
+    def run(self, call: Callable[[str], object]):
+        """Call call(name) for every step in dependency order.
+
+        Independent steps run concurrently in a thread pool. If a step raises
+        an exception no more steps are started, the running ones are waited
+        for, and the exception is re-raised.
+        """
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        self.validate()
+
+        done, running, error = set(), {}, None
+        pending = dict(self.steps)
+
+        with ThreadPoolExecutor(max_workers=self.jobs or len(self.steps) or 1) as pool:
+            while pending or running:
+                if not error:
+                    ready = [
+                        name for name, requires in pending.items()
+                        if done.issuperset(requires)
+                    ]
+                    for name in ready:
+                        pending.pop(name)
+                        running[pool.submit(call, name)] = name
+
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    if future.exception() is not None:
+                        error = error or future.exception()
+                    else:
+                        done.add(name)
+
+        if error:
+            raise error
@@ -0,0 +1,48 @@
+"""Template variables of a project, computed the first time they are used."""
+
+from collections.abc import Mapping
+from typing import Callable
+
+bp = breakpoint
+
+
+class Substitutions(Mapping):
+    """Read-only mapping of template variable names to their values.
+
+    Each value is computed from the project by its registered function the
+    first time it is looked up, then reused.
+    """
+
+    def __init__(self, project, registry: dict[str, Callable]):
+        """Create object.
+
+        Arguments:
+            project (Project): project to compute values from
+            registry (dict[str, Callable]): variable name -> function that takes
+                                            the project and returns its value
+        """
+        self.project = project
+        self.registry = registry
+        self.values = {}
+
+    def __getitem__(self, name: str):
+        """Return the value of variable name."""
+        try:
+            return self.values[name]
+        except KeyError:
+            pass
+
+        value = self.values[name] = self.registry[name](self.project)
+        return value
+
+    def __iter__(self):
+        """Iterate over the variable names."""
+        return iter(self.registry)
+
+    def __len__(self):
+        """Return the number of variables."""
+        return len(self.registry)
+
+    def __repr__(self):
+        """Substitutions(['DASH_NAME', ...])."""
+        return f"{self.__class__.__name__}({list(self.registry)!r})"
@@ -0,0 +1,474 @@
+"""Template engine that compiles each template once into a render function.
+
+Templates support the same ${VAR}, $VAR and $$ syntax as string.Template's
+safe_substitute(), plus:
+
+    ${VAR|filter}                       apply a filter (see FILTERS)
+    {% if VAR %}...{% else %}...{% endif %}
+    {% if not VAR %}...{% endif %}
+    {% for NAME in VAR %}...${NAME}...{% endfor %}
+    {%%                                 a literal {%
+
+Variables that are not in the mapping are left as-is, and so are unknown
+filters and tags. A block tag that is on a line by itself does not leave a
+blank line behind.
+
+Short templates without block tags are rendered in one pass, others are
+compiled once. Large template files are rendered a chunk at a time with
+render_file().
+"""
+
+import marshal
+import re
+from collections import ChainMap, OrderedDict
+from functools import lru_cache
+from hashlib import sha256
+from importlib.util import MAGIC_NUMBER
+from os import getpid
+from pathlib import Path
+from threading import Lock
+
+from blueprint import ProgramError
+from blueprint.cache import Cache, digest
+from blueprint.object import Object
+
+bp = breakpoint
+
+# bump when the generated code changes so that cached code is not reused
+ENGINE_VERSION = 3
+
+ID = r"[_a-z][_a-z0-9]*"
+TAG = r"(?:(?!%\}).)*?"
+
+PATTERN = re.compile(
+    rf"""
+    (?P<escaped_tag>\{{%%)
+    | (?P<line>^[ \t]*\{{%(?!%)\s*(?P<line_tag>{TAG})\s*%\}}[ \t]*(?:\n|\Z))
+    | \{{%(?!%)\s*(?P<tag>{TAG})\s*%\}}
+    | \$(?:
+        (?P<escaped>\$)
+        | \{{(?P<braced>{ID})(?:\|(?P<filter>{ID}))?\}}
+        | (?P<named>{ID})
+    )
+    """,
+    re.IGNORECASE | re.VERBOSE | re.MULTILINE | re.ASCII,
+)
+
+# a variable or $$, spelled out without IGNORECASE so that re can skip ahead
+# to each $
+FLAT_ID = r"[_a-zA-Z][_a-zA-Z0-9]*"
+VARIABLE = re.compile(rf"(\$(?:\$|\{{{FLAT_ID}(?:\|{FLAT_ID})?\}}|{FLAT_ID}))")
+
+BLOCK_TAG = re.compile(rf"\{{%(?!%)\s*{TAG}\s*%\}}")
+
+IF_TAG = re.compile(rf"if\s+(?P<negate>not\s+)?(?P<name>{ID})$", re.I | re.A)
+FOR_TAG = re.compile(rf"for\s+(?P<var>{ID})\s+in\s+(?P<name>{ID})$", re.I | re.A)
+
+# longest template without block tags that render() does not compile first
+DIRECT_SIZE = 4096
+
+# characters read at a time when rendering a file that is larger than this
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# longest variable token that is held back when it is split between chunks
+MAX_TOKEN = 1024
+
+# a variable or block tag at the end of a chunk that may continue in the next
+PARTIAL = re.compile(
+    r"\$+(?:\{[_a-z0-9]*(?:\|[_a-z0-9]*)?|[_a-z0-9]*)\Z|\{\Z",
+    re.IGNORECASE | re.ASCII,
+)
+
+# characters that must be escaped in a TOML basic string
+TOML_ESCAPES = {
+    **{chr(i): f"\\u{i:04X}" for i in (*range(0x20), 0x7F)},
+    "\b": "\\b", "\t": "\\t", "\n": "\\n", "\f": "\\f", "\r": "\\r",
+    '"': '\\"', "\\": "\\\\",
+}
+
+TOML_ESCAPE = re.compile("[%s]" % re.escape("".join(TOML_ESCAPES)))
+
+
+def toml_string(value) -> str:
+    """Return value as a quoted TOML basic string.
+
+    Unlike json.dumps() other characters are left as-is, since TOML does not
+    allow the surrogate pairs JSON uses for characters outside the BMP.
+    """
+    escaped = TOML_ESCAPE.sub(lambda m: TOML_ESCAPES[m.group()], str(value))
+    return f'"{escaped}"'
+
+
+FILTERS = {
+    "toml": toml_string,
+    "lower": lambda value: str(value).lower(),
+    "upper": lambda value: str(value).upper(),
+}
+
+
+def lookup(scope, name, raw, filter=None) -> str:
+    """Return the value of name in scope as a string, or raw if it is missing."""
+    try:
+        value = scope[name]
+    except KeyError:
+        return raw
+
+    if filter:
+        value = FILTERS[filter](value)
+
+    return str(value)
+
+
+def truthy(scope, name) -> bool:
+    """Return True if name is in scope and its value is truthy."""
+    try:
+        return bool(scope[name])
+    except KeyError:
+        return False
+
+
+def iterate(scope, name):
+    """Return the value of name in scope to loop over, or nothing."""
+    try:
+        return scope[name] or ()
+    except KeyError:
+        return ()
+
+
+def generate(text: str) -> str:
+    """Return the Python source of a render(scope) function for text."""
+    lines = ["def render(_s0):", "    _o = []", "    _a = _o.append"]
+    blocks, scopes, literal, pos, loops = [], ["_s0"], [], 0, 0
+
+    def flush():
+        # adjacent literal text is appended in one call
+        text = "".join(literal)
+        literal.clear()
+        if text:
+            lines.append("    " * (len(blocks) + 1) + f"_a({text!r})")
+
+    def emit(line):
+        flush()
+        lines.append("    " * (len(blocks) + 1) + line)
+
+    for match in PATTERN.finditer(text):
+        literal.append(text[pos:match.start()])
+        pos = match.end()
+
+        scope = scopes[-1]
+        tag = match.group("line_tag") or match.group("tag")
+        if tag:
+            flush()
+
+        if match.group("escaped"):
+            literal.append("$")
+
+        elif match.group("escaped_tag"):
+            literal.append("{%")
+
+        elif match.group("braced") or match.group("named"):
+            name = match.group("braced") or match.group("named")
+            filter = match.group("filter")
+            if filter and filter not in FILTERS:
+                literal.append(match.group(0))
+            else:
+                emit(f"_a(_get({scope}, {name!r}, {match.group(0)!r}, {filter!r}))")
+
+        elif IF_TAG.match(tag):
+            found = IF_TAG.match(tag)
+            negate = "not " if found.group("negate") else ""
+            emit(f"if {negate}_truthy({scope}, {found.group('name')!r}):")
+            blocks.append("if")
+            emit("pass")
+
+        elif FOR_TAG.match(tag):
+            found = FOR_TAG.match(tag)
+            loops += 1
+            inner = f"_s{loops}"
+            emit(f"for _v{loops} in _iter({scope}, {found.group('name')!r}):")
+            blocks.append("for")
+            emit(f"{inner} = _ChainMap({{{found.group('var')!r}: _v{loops}}}, {scope})")
+            scopes.append(inner)
+
+        elif tag == "else":
+            if not blocks or blocks[-1] != "if":
+                raise ProgramError("Template {% else %} without {% if %}")
+            blocks.pop()
+            emit("else:")
+            blocks.append("if")
+            emit("pass")
+
+        elif tag in ("endif", "endfor"):
+            if not blocks or blocks[-1] != tag[3:]:
+                raise ProgramError(f"Template {{% {tag} %}} without {{% {tag[3:]} %}}")
+            if blocks.pop() == "for":
+                scopes.pop()
+
+        else:
+            literal.append(match.group(0))
+
+    if blocks:
+        raise ProgramError(f"Template {{% {blocks[-1]} %}} is missing its end tag")
+
+    literal.append(text[pos:])
+    emit("return ''.join(_o)")
+    return "\n".join(lines) + "\n"
+
+
+def flatten(text: str):
+    """Return a flat program for text, or None if it has block tags.
+
+    A flat program is the literal parts of the text with a token between each
+    two, the (token, name, filter) of each distinct variable token, and the
+    (token, text) of the tokens that always render the same, like $$. It is
+    built and rendered without a Python step for each token, so that compiling
+    and rendering a template once costs less than safe_substitute().
+    """
+    # looking for one character is much faster than for "{%"
+    tags = "%" in text
+    if tags and BLOCK_TAG.search(text):
+        return None
+
+    parts = VARIABLE.split(text)
+    if tags and "{%%" in text:
+        # never part of a token, since it has no $
+        parts[::2] = [part.replace("{%%", "{%") for part in parts[::2]]
+
+    tokens = tuple(dict.fromkeys(parts[1::2]))
+    return ("flat", tuple(parts), *parse_tokens(tokens))
+
+
+@lru_cache(maxsize=1024)
+def parse_tokens(tokens: tuple) -> tuple[tuple, tuple]:
+    """Return the variables and constants of the distinct tokens of a template.
+
+    Templates of the same blueprint mostly use the same tokens, so each set is
+    only parsed once.
+    """
+    variables, constants = [], []
+    for token in tokens:
+        name, _, filter = token[1:].strip("{}").partition("|")
+        if token == "$$":
+            constants.append((token, "$"))
+        elif filter and filter not in FILTERS:
+            constants.append((token, token))
+        else:
+            variables.append((token, name, filter or None))
+    return tuple(variables), tuple(constants)
+
+
+def flat_renderer(parts: tuple, variables: tuple, constants: tuple):
+    """Return a render(scope) function for a flat program."""
+    def render(scope):
+        values = dict(constants)
+        for token, name, filter in variables:
+            try:
+                value = scope[name]
+            except KeyError:
+                values[token] = token
+                continue
+            values[token] = str(FILTERS[filter](value) if filter else value)
+        out = list(parts)
+        out[1::2] = map(values.__getitem__, parts[1::2])
+        return "".join(out)
+
+    return render
+
+
+def variables(text: str) -> set[str]:
+    """Return the names of the variables that text uses."""
+    names = set()
+    for match in PATTERN.finditer(text):
+        tag = match.group("line_tag") or match.group("tag")
+        if tag:
+            found = IF_TAG.match(tag) or FOR_TAG.match(tag)
+            if found:
+                names.add(found.group("name"))
+        elif not match.group("escaped") and not match.group("escaped_tag"):
+            names.add(match.group("braced") or match.group("named"))
+    return names
+
+
+class TemplateCache(Cache):
+    """Compiled template programs saved to disk, keyed by content hash."""
+
+    NAME = "templates"
+
+    @property
+    def tag(self) -> str:
+        """Return a tag for the Python bytecode and engine versions."""
+        return digest(MAGIC_NUMBER.hex(), ENGINE_VERSION)
+
+    def file(self, key: str):
+        """Return the path to the saved code for key."""
+        return self.root / f"{key}.{self.tag}.marshal"
+
+    def load(self, key: str):
+        """Return the saved program for key or None."""
+        try:
+            return marshal.loads(self.file(key).read_bytes())
+        except (OSError, ValueError, EOFError, TypeError):
+            return None
+
+    def save(self, key: str, program: tuple):
+        """Save the program for key."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.file(key)
+        tmp = path.with_suffix(f".{getpid()}.tmp")
+        tmp.write_bytes(marshal.dumps(program))
+        tmp.replace(path)
+
+
+class Template(Object):
+    """A template compiled into a render function.
+
+    Use Template.get() to reuse templates that have already been compiled in
+    this process or, if persist is set, in an earlier run.
+    """
+
+    # number of compiled templates kept in memory, least recently used first
+    MAX_COMPILED = 512
+
+    _compiled: OrderedDict = OrderedDict()
+    _lock = Lock()
+
+    def __init__(self, text="", persist=False, key=None, **kwargs):
+        """Create object and compile text.
+
+        Arguments:
+            text (str): template text
+            persist (bool): load and save the compiled program in the
+                            TemplateCache
+            key (str): sha256 hex digest of text, if it is already known
+        """
+        self.text = text
+        self.key = key or sha256(text.encode()).hexdigest()
+        self.persist = persist
+        self.func = self.compile()
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        """Template(key='...')."""
+        return f"{self.__class__.__name__}(key={self.key!r})"
+
+    @classmethod
+    def get(cls, text: str, persist=False) -> "Template":
+        """Return the compiled template for text, compiling it only once.
+
+        Arguments:
+            text (str): template text
+            persist (bool): load and save the compiled program in the
+                            TemplateCache
+        """
+        key = sha256(text.encode()).hexdigest()
+        with cls._lock:
+            template = cls._compiled.get(key)
+            if template:
+                cls._compiled.move_to_end(key)
+                return template
+
+            template = cls._compiled[key] = cls(text, persist, key)
+            if len(cls._compiled) > cls.MAX_COMPILED:
+                cls._compiled.popitem(last=False)
+            return template
+
+    @property
+    def program(self) -> tuple:
+        """Return the flat program or code object for the template."""
+        cache = TemplateCache() if self.persist else None
+        program = cache.load(self.key) if cache else None
+
+        if program is None:
+            program = flatten(self.text)
+            if not program:
+                filename = f"<template {self.key[:12]}>"
+                program = ("code", compile(generate(self.text), filename, "exec"))
+            if cache:
+                cache.save(self.key, program)
+
+        return program
+
+    def compile(self):
+        """Return the render function for the template."""
+        kind, *program = self.program
+        if kind == "flat":
+            return flat_renderer(*program)
+
+        namespace = {
+            "_get": lookup,
+            "_truthy": truthy,
+            "_iter": iterate,
+            "_ChainMap": ChainMap,
+        }
+        exec(program[0], namespace)
+        return namespace["render"]
+
+    def render(self, mapping) -> str:
+        """Return the template rendered with the values in mapping."""
+        return self.func(mapping)
+
+
+def render(text: str, mapping, persist=False) -> str:
+    """Render text with the values in mapping.
+
+    Templates up to DIRECT_SIZE characters without block tags are rendered in
+    one pass, which costs less than looking up or compiling a Template. Others
+    use a cached compiled template.
+    """
+    if len(text) <= DIRECT_SIZE:
+        if "$" not in text and "%" not in text:
+            return text
+        program = flatten(text)
+        if program:
+            return flat_renderer(*program[1:])(mapping)
+
+    return Template.get(text, persist).render(mapping)
+
+
+def split_partial(text: str) -> int:
+    """Return the index in text where a possibly incomplete token starts.
+
+    Everything before the index can be rendered without knowing what comes
+    next. A run of $ is kept together so that $$ escapes are not split up.
+    """
+    start = max(0, len(text) - MAX_TOKEN)
+    found = PARTIAL.search(text, start)
+    if not found:
+        return len(text)
+
+    cut = found.start()
+    while cut and text[cut - 1] == "$":
+        cut -= 1
+    return cut
+
+
+def render_file(src: Path, dest: Path, mapping, chunk_size=STREAM_CHUNK_SIZE,
+                persist=False):
+    """Render the template file src to dest.
+
+    Files up to chunk_size are rendered with a cached compiled template. Larger
+    files are read, rendered and written a chunk at a time so that memory use
+    does not depend on the size of the file. Block tags need the whole template,
+    so a large file that has them is rendered in memory instead.
+    """
+    if src.stat().st_size <= chunk_size:
+        text = render(src.read_text(encoding="utf-8"), mapping, persist)
+        dest.write_text(text, encoding="utf-8")
+        return
+
+    with open(src, encoding="utf-8") as fsrc, \
+         open(dest, "w", encoding="utf-8") as fdst:
+        carry = ""
+        while chunk := fsrc.read(chunk_size):
+            text = carry + chunk
+            cut = split_partial(text)
+            if "{%" in text[:cut]:
+                break
+            fdst.write(flat_renderer(*flatten(text[:cut])[1:])(mapping))
+            carry = text[cut:]
+        else:
+            fdst.write(flat_renderer(*flatten(carry)[1:])(mapping))
+            return
+
+    text = render(src.read_text(encoding="utf-8"), mapping, persist)
+    dest.write_text(text, encoding="utf-8")
@@ -0,0 +1,192 @@
+"""Memoized lookups of toolchain executables, locations and versions."""
+
+import json
+from os import environ, getpid
+from pathlib import Path
+from shutil import which
+from threading import Lock, RLock
+
+from blueprint.cache import Cache
+from blueprint.object import Object
+from blueprint.shell_command import ShellCommand
+from blueprint.trace import tracer
+
+bp = breakpoint
+
+# Python version that new projects use unless told otherwise, defined here so
+# the command line can show it without importing the project modules
+DEFAULT_PYV = "3.10.2"
+DEFAULT_PYV_CONSTRAINT = ">=3.10.2"
+
+
+def mtime(path) -> float:
+    """Return the mtime of path or None if it does not exist."""
+    try:
+        return Path(path).stat().st_mtime
+    except OSError:
+        return None
+
+
+def stamps(paths: list) -> list[tuple[str, float]]:
+    """Return the (path, mtime) pairs for paths."""
+    return [(str(path), mtime(path)) for path in paths]
+
+
+def is_fresh(stamps: list) -> bool:
+    """Return True if none of the paths in stamps changed since."""
+    return all(mtime(path) == stamp for path, stamp in stamps)
+
+
+class LookupCache(Cache):
+    """Lookup results saved to disk along with the mtimes they depend on."""
+
+    NAME = "lookups"
+
+    @property
+    def file(self) -> Path:
+        """Path to the JSON file that the lookups are saved in."""
+        return self.root / "lookups.json"
+
+    def load(self) -> dict:
+        """Return all saved lookups."""
+        try:
+            return json.loads(self.file.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def entry(self, key: str) -> dict:
+        """Return the saved {"value", "stamps"} for key, or None if out of date."""
+        entry = self.load().get(key)
+        if not entry or not is_fresh(entry["stamps"]):
+            return None
+        return entry
+
+    def get(self, key: str):
+        """Return the saved value for key, or None if missing or out of date."""
+        entry = self.entry(key)
+        return entry["value"] if entry else None
+
+    def set(self, key: str, value, paths: list):
+        """Save value for key, valid for as long as the mtimes of paths are.
+
+        The file is locked while it is read and written again, so that lookups
+        saved by other processes at the same time are kept.
+        """
+        with self.lock(self.file.stem):
+            data = self.load()
+            data[key] = {"value": value, "stamps": stamps(paths)}
+
+            tmp = self.file.with_suffix(f".{getpid()}.tmp")
+            tmp.write_text(json.dumps(data, indent=2))
+            tmp.replace(self.file)
+
+
+class Toolchain(Object):
+    """Answers from asdf, poetry and $PATH, looked up once per process.
+
+    Answers are looked up again when the files they came from change, and
+    lookup keys include the environment variables that the answer depends on.
+    If persist is set the answers are also saved to disk and reused by later
+    runs.
+    """
+
+    def __init__(self, persist=None, **kwargs):
+        """Create object.
+
+        Arguments:
+            persist (bool): save lookups to disk, defaults to True if
+                            $BLUEPRINT_LOOKUP_CACHE is set
+        """
+        if persist is None:
+            persist = bool(environ.get("BLUEPRINT_LOOKUP_CACHE"))
+
+        self.persist = persist
+        self.memo = {}
+        self.locks = {}
+        self.lock = Lock()
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        """Toolchain(persist=False)."""
+        return f"{self.__class__.__name__}(persist={self.persist!r})"
+
+    @property
+    def asdf_dir(self) -> Path:
+        """Return the asdf data directory."""
+        return Path(environ.get("ASDF_DATA_DIR") or Path.home() / ".asdf")
+
+    def lookup(self, key: str, func):
+        """Return the memoized value for key or call func() to look it up.
+
+        func returns the value and a list of paths that it depends on. Only
+        lookups of the same key wait for each other.
+        """
+        with self.key_lock(key):
+            if key in self.memo:
+                value, stamped = self.memo[key]
+                if is_fresh(stamped):
+                    return value
+
+            cache = LookupCache() if self.persist else None
+            entry = cache.entry(key) if cache else None
+
+            if entry:
+                value, stamped = entry["value"], entry["stamps"]
+            else:
+                with tracer.span(key, "lookup"):
+                    value, paths = func()
+                stamped = stamps(paths)
+                if cache and value is not None:
+                    cache.set(key, value, paths)
+
+            with self.lock:
+                self.memo[key] = (value, stamped)
+            return value
+
+    def key_lock(self, key: str) -> RLock:
+        """Return the lock for lookups of key."""
+        with self.lock:
+            return self.locks.setdefault(key, RLock())
+
+    def paths(self) -> list[str]:
+        """Return the paths that the memoized lookups depend on."""
+        with self.lock:
+            return sorted({
+                path for _, stamped in self.memo.values() for path, _ in stamped
+            })
+
+    def clear(self):
+        """Forget all memoized lookups in this process."""
+        with self.lock:
+            self.memo.clear()
+
+    def which(self, program: str) -> str:
+        """Return the path to program on $PATH."""
+        def find():
+            path = which(program)
+            return path, [path] if path else []
+
+        return self.lookup(f"which:{program}:{environ.get('PATH')}", find)
+
+    def asdf_where(self, pyv: str) -> str:
+        """Return the install directory of Python version pyv from asdf."""
+        def find():
+            res = ShellCommand("asdf", "where", "python", pyv).run()
+            pyroot = res.stdout.strip()
+            return pyroot, [self.asdf_dir / "installs" / "python", pyroot]
+
+        return self.lookup(
+            f"asdf_where:python:{pyv}:{self.asdf_dir}:{environ.get('PATH')}", find
+        )
+
+    def poetry_version(self) -> str:
+        """Return the poetry version string."""
+        def find():
+            res = ShellCommand("poetry", "--version").run()
+            exe = self.which("poetry")
+            return res.stdout.strip(), [exe] if exe else []
+
+        return self.lookup(f"poetry_version:{environ.get('PATH')}", find)
+
+
+toolchain = Toolchain()
@@ -0,0 +1,87 @@
+"""Timing spans for the steps that make a project, in Chrome trace format."""
+
+import json
+from contextlib import contextmanager
+from os import getpid
+from pathlib import Path
+from threading import Lock, get_ident
+from time import perf_counter_ns
+
+from blueprint.object import Object
+
+bp = breakpoint
+
+
+class Tracer(Object):
+    """Records how long each step, install and command takes.
+
+    Spans are only recorded while enabled is set. The result can be loaded in
+    chrome://tracing or https://ui.perfetto.dev.
+    """
+
+    def __init__(self, enabled=False, **kwargs):
+        """Create object.
+
+        Arguments:
+            enabled (bool): record spans
+        """
+        self.enabled = enabled
+        self.events = []
+        self.lock = Lock()
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        """Tracer(enabled=False, events=0)."""
+        return (f"{self.__class__.__name__}"
+                f"(enabled={self.enabled!r}, events={len(self.events)})")
+
+    @contextmanager
+    def span(self, name: str, cat: str, **args):
+        """Record the time spent in the with block.
+
+        Yields the args dict so that results, like an exit code, can be added
+        to it before the block ends. If the block raises an exception its
+        message is recorded as the error arg.
+        """
+        if not self.enabled:
+            yield args
+            return
+
+        start = perf_counter_ns()
+        try:
+            yield args
+        except BaseException as e:
+            args["error"] = f"{e.__class__.__name__}: {e}"
+            raise
+        finally:
+            end = perf_counter_ns()
+            event = {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": start / 1000,
+                "dur": (end - start) / 1000,
+                "pid": getpid(),
+                "tid": get_ident(),
+                "args": {k: v for k, v in args.items() if v is not None},
+            }
+            with self.lock:
+                self.events.append(event)
+
+    def clear(self):
+        """Forget all recorded spans."""
+        with self.lock:
+            self.events.clear()
+
+    def to_chrome(self) -> dict:
+        """Return the recorded spans as a Chrome trace-event document."""
+        with self.lock:
+            events = sorted(self.events, key=lambda event: event["ts"])
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Path):
+        """Write the recorded spans to path as Chrome trace-event JSON."""
+        Path(path).write_text(json.dumps(self.to_chrome(), indent=1, default=str))
+
+
+tracer = Tracer()
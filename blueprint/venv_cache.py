@@ -0,0 +1,151 @@
+"""Cache of prebuilt virtual environments that are cloned into new projects."""
+
+import json
+from os import link
+from pathlib import Path
+from shutil import copy2, copytree, rmtree
+
+from blueprint import ProgramError
+from blueprint.cache import Cache, digest
+from blueprint.shell_command import ShellCommand
+
+bp = breakpoint
+
+
+def link_or_copy(src, dest):
+    """Hardlink src to dest, or copy it if they are on different filesystems."""
+    try:
+        link(src, dest)
+    except OSError:
+        copy2(src, dest)
+
+
+def relocate(venv: Path, old: Path, new: Path):
+    """Rewrite the absolute paths in a virtual env that was moved from old to new.
+
+    Only the scripts in bin/ and pyvenv.cfg contain the venv prefix.
+    """
+    replacements = [(str(old).encode(), str(new).encode())]
+    for path in [venv / "pyvenv.cfg", *(venv / "bin").iterdir()]:
+        if not path.is_symlink() and path.is_file():
+            rewrite(path, replacements)
+
+
+def rename_prompt(venv: Path, names: list[tuple[str, str]]):
+    """Replace old names with new ones in the prompt of a moved virtual env.
+
+    The prompt is made from the directory name when the virtual env is created,
+    and is written to pyvenv.cfg and the activate scripts.
+
+    Arguments:
+        venv (Path): virtual env directory
+        names (list[tuple[str, str]]): (old, new) pairs, replaced in order
+    """
+    replacements = [(old.encode(), new.encode()) for old, new in names]
+    for path in [venv / "pyvenv.cfg", *(venv / "bin").glob("activate*")]:
+        if not path.is_symlink() and path.is_file():
+            rewrite(path, replacements)
+
+
+def rewrite(path: Path, replacements: list[tuple[bytes, bytes]]) -> bool:
+    """Replace each old bytes with new in the file at path.
+
+    The file is replaced rather than modified in place so that hardlinks to the
+    original are left alone. Returns True if the file changed.
+    """
+    data = changed = path.read_bytes()
+    for old, new in replacements:
+        changed = changed.replace(old, new)
+
+    if changed == data:
+        return False
+
+    mode = path.stat().st_mode
+    path.unlink()
+    path.write_bytes(changed)
+    path.chmod(mode)
+    return True
+
+
+class VenvCache(Cache):
+    """Virtual environments with a set of dependencies already installed.
+
+    Entries are keyed by Python version and dependency set, built once with the
+    interpreter for that version, then cloned with hardlinks into each new
+    project.
+    """
+
+    NAME = "venvs"
+    METADATA = "blueprint-venv.json"
+
+    def key(self, pyv: str, deps: list) -> str:
+        """Return the cache key for a Python version and dependency set."""
+        return digest(pyv, sorted(deps))
+
+    def metadata(self, python: str, pyv: str, deps: list) -> dict:
+        """Return the metadata that a fresh entry would have."""
+        return {
+            "pyv": pyv,
+            "deps": sorted(deps),
+            "python": str(python),
+            "python_mtime": Path(python).stat().st_mtime,
+        }
+
+    def is_stale(self, entry: Path, python: str, pyv: str, deps: list) -> bool:
+        """Return True if entry is missing, incomplete, or was built differently.
+
+        An entry is also stale if the interpreter it was built with has been
+        removed or reinstalled since.
+        """
+        metafile = entry / self.METADATA
+        if not metafile.is_file() or not (entry / "bin" / "python").exists():
+            return True
+
+        if not Path(python).exists():
+            return True
+
+        try:
+            built = json.loads(metafile.read_text())
+        except ValueError:
+            return True
+
+        return built != self.metadata(python, pyv, deps)
+
+    def build(self, entry: Path, python: str, pyv: str, deps: list):
+        """Create a virtual env at entry and install deps in it."""
+        if entry.exists():
+            rmtree(entry)
+
+        ShellCommand(str(python), "-m", "venv", str(entry)).run()
+
+        if deps:
+            ShellCommand(
+                str(entry / "bin" / "python"),
+                "-m", "pip", "install", "--disable-pip-version-check", "--quiet",
+                *deps,
+            ).run()
+
+        # written last so an interrupted build is seen as stale
+        metadata = self.metadata(python, pyv, deps)
+        (entry / self.METADATA).write_text(json.dumps(metadata, indent=2))
+
+    def get(self, python: str, pyv: str, deps: list) -> Path:
+        """Return the entry for pyv and deps, building it if it is stale."""
+        if not python:
+            raise ProgramError(f"No python executable for version: {pyv}")
+
+        key = self.key(pyv, deps)
+        entry = self.path(key)
+
+        with self.lock(key):
+            if self.is_stale(entry, python, pyv, deps):
+                self.build(entry, python, pyv, deps)
+
+        return entry
+
+    def clone(self, entry: Path, dest: Path) -> Path:
+        """Copy the virtual env at entry to dest and relocate it."""
+        copytree(entry, dest, symlinks=True, copy_function=link_or_copy)
+        (dest / self.METADATA).unlink()
+        relocate(dest, entry, dest)
+        return dest
@@ -0,0 +1,243 @@
+"""Virtual envs made ahead of time that new projects take instead of making one.
+
+The pool keeps up to size empty virtual envs for each Python version. A new
+project claims one by moving it into the project, and the pool is filled
+again in a background process so the next project does not wait either.
+"""
+
+import json
+import sys
+from os import environ, getpid, kill
+from pathlib import Path
+from shutil import copytree, rmtree
+from subprocess import DEVNULL, Popen
+from time import time, time_ns
+
+from blueprint import ROOT, ProgramError
+from blueprint.cache import Cache
+from blueprint.shell_command import ShellCommand
+from blueprint.venv_cache import relocate, rename_prompt
+
+bp = breakpoint
+
+
+def alive(pid: int) -> bool:
+    """Return True if the process with pid is running."""
+    try:
+        kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class VenvPool(Cache):
+    """Ready made virtual envs for each Python version.
+
+    Entries are directories named "{time_ns}-{pid}" in a directory for each
+    Python version. They are built under a ".tmp" name and renamed when ready,
+    and claimed by renaming them to a ".claimed-{pid}" name first, so that two
+    projects never get the same one.
+    """
+
+    NAME = "venv-pool"
+    METADATA = "blueprint-venv.json"
+
+    # number of virtual envs to keep for each Python version
+    SIZE = 2
+
+    # days after which a virtual env is removed instead of used
+    MAX_AGE = 7
+
+    def __init__(self, root=None, size=None, max_age=None, **kwargs):
+        """Create object.
+
+        Arguments:
+            root (Path): pool directory, defaults to a NAME subdirectory of
+                         cache_root()
+            size (int): virtual envs to keep for each Python version, defaults
+                        to $BLUEPRINT_VENV_POOL_SIZE or SIZE
+            max_age (float): days to keep a virtual env for, defaults to
+                             $BLUEPRINT_VENV_POOL_MAX_AGE or MAX_AGE
+        """
+        if size is None:
+            size = int(environ.get("BLUEPRINT_VENV_POOL_SIZE") or self.SIZE)
+        if max_age is None:
+            max_age = float(environ.get("BLUEPRINT_VENV_POOL_MAX_AGE") or self.MAX_AGE)
+
+        self.size = size
+        self.max_age = max_age
+        super().__init__(root, **kwargs)
+
+    def __repr__(self):
+        """VenvPool(root='...', size=2, max_age=7)."""
+        return (f"{self.__class__.__name__}(root={str(self.root)!r}, "
+                f"size={self.size!r}, max_age={self.max_age!r})")
+
+    def entries(self, pyv: str) -> list[Path]:
+        """Return the virtual envs that are ready for pyv, oldest first."""
+        try:
+            paths = list(self.path(pyv).iterdir())
+        except FileNotFoundError:
+            return []
+
+        return sorted(
+            (path for path in paths
+             if "." not in path.name and (path / self.METADATA).is_file()),
+            key=lambda path: int(path.name.split("-")[0]),
+        )
+
+    def metadata(self, python: str, pyv: str) -> dict:
+        """Return the metadata of the interpreter that entries are made with."""
+        return {
+            "pyv": pyv,
+            "python": str(python),
+            "python_mtime": Path(python).stat().st_mtime,
+        }
+
+    def is_stale(self, built: dict, python: str, pyv: str) -> bool:
+        """Return True if the entry with metadata built should not be used.
+
+        That is if it is older than max_age, or the interpreter it was made
+        with has been removed or reinstalled since.
+        """
+        if time() - built.get("created", 0) > self.max_age * 24 * 60 * 60:
+            return True
+
+        if not Path(python).exists():
+            return True
+
+        made = {k: built.get(k) for k in ("pyv", "python", "python_mtime")}
+        return made != self.metadata(python, pyv)
+
+    def read(self, entry: Path) -> dict:
+        """Return the metadata of entry."""
+        try:
+            return json.loads((entry / self.METADATA).read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def build(self, python: str, pyv: str) -> Path:
+        """Make a virtual env for pyv with python and return the entry."""
+        name = f"{time_ns()}-{getpid()}"
+        tmp = self.path(pyv) / f"{name}.tmp"
+        tmp.parent.mkdir(parents=True, exist_ok=True)
+
+        ShellCommand(str(python), "-m", "venv", str(tmp)).run()
+
+        # written last so an interrupted build is never claimed
+        metadata = {**self.metadata(python, pyv), "path": str(tmp), "created": time()}
+        (tmp / self.METADATA).write_text(json.dumps(metadata, indent=2))
+
+        entry = tmp.with_name(name)
+        tmp.rename(entry)
+        return entry
+
+    def evict(self, python: str, pyv: str) -> list[Path]:
+        """Remove stale entries, entries beyond size, and leftovers of dead builds.
+
+        Returns the paths that were removed.
+        """
+        try:
+            paths = list(self.path(pyv).iterdir())
+        except FileNotFoundError:
+            return []
+
+        removed = []
+        for path in paths:
+            name, _, state = path.name.partition(".")
+            if state == "tmp":
+                pid = name.split("-")[-1]
+            elif state.startswith("claimed-"):
+                pid = state.removeprefix("claimed-")
+            else:
+                continue
+            if pid.isdigit() and not alive(int(pid)):
+                removed.append(path)
+
+        ready = self.entries(pyv)
+        fresh = [
+            entry for entry in ready
+            if not self.is_stale(self.read(entry), python, pyv)
+        ]
+        removed.extend(entry for entry in ready if entry not in fresh)
+        # the newest are kept, since they will last the longest
+        removed.extend(fresh[:max(0, len(fresh) - self.size)])
+
+        for path in removed:
+            rmtree(path, ignore_errors=True)
+        return removed
+
+    def fill(self, python: str, pyv: str) -> list[Path]:
+        """Evict, then make virtual envs until there are size of them for pyv."""
+        if not python:
+            raise ProgramError(f"No python executable for version: {pyv}")
+
+        with self.lock(pyv):
+            self.evict(python, pyv)
+            while len(self.entries(pyv)) < self.size:
+                self.build(python, pyv)
+            return self.entries(pyv)
+
+    def refill(self, pyv: str) -> Popen:
+        """Start filling the pool for pyv in a process that outlives this one.
+
+        Returns None without starting one if the pool for pyv is being filled
+        already.
+        """
+        if self.is_locked(pyv):
+            return None
+
+        command = [
+            sys.executable, "-m", "blueprint.cli", "pool", "fill",
+            "--pyv", pyv,
+            "--size", str(self.size),
+            "--max-age", str(self.max_age),
+            "--dir", str(self.root),
+        ]
+        return Popen(
+            command, cwd=ROOT, stdin=DEVNULL, stdout=DEVNULL, stderr=DEVNULL,
+            start_new_session=True,
+        )
+
+    def claim(self, python: str, pyv: str, dest: Path, prompt=None) -> Path:
+        """Move a ready virtual env for pyv to dest and return it.
+
+        Returns None if the pool is empty.
+
+        Arguments:
+            python (str): path to the interpreter the virtual env must be made with
+            pyv (str): Python version
+            dest (Path): where to move the virtual env to
+            prompt (str): prompt to replace the build name with, defaults to the
+                          name of dest
+        """
+        for entry in self.entries(pyv):
+            claimed = entry.with_name(f"{entry.name}.claimed-{getpid()}")
+            try:
+                entry.rename(claimed)
+            except FileNotFoundError:
+                # claimed by another process first
+                continue
+
+            built = self.read(claimed)
+            if self.is_stale(built, python, pyv):
+                rmtree(claimed, ignore_errors=True)
+                continue
+
+            (claimed / self.METADATA).unlink()
+            try:
+                claimed.rename(dest)
+            except OSError:
+                # the pool is on another filesystem
+                copytree(claimed, dest, symlinks=True)
+                rmtree(claimed)
+
+            # the prompt is still the name it was built under
+            tmp = Path(built["path"])
+            relocate(dest, tmp, dest)
+            rename_prompt(dest, [(tmp.name, prompt or dest.name)])
+            return dest
+
+        return None
@@ -0,0 +1,239 @@
+"""Local directory of wheels that dev dependencies are installed from offline."""
+
+import csv
+import json
+from base64 import urlsafe_b64encode
+from configparser import ConfigParser
+from hashlib import sha256
+from os import environ
+from os.path import relpath
+from pathlib import Path
+from shutil import copyfile, rmtree
+from zipfile import ZipFile
+
+from blueprint import ProgramError
+from blueprint.cache import cache_root
+from blueprint.object import Object
+from blueprint.shell_command import ShellCommand
+
+bp = breakpoint
+
+CONSOLE_SCRIPT = """\
+#!{python}
+import sys
+from {module} import {name}
+if __name__ == "__main__":
+    sys.exit({call}())
+"""
+
+
+def site_packages(venv: Path) -> Path:
+    """Return the site-packages directory of the virtual env at venv."""
+    found = sorted(venv.glob("lib/python*/site-packages"))
+    if not found:
+        raise ProgramError(f"No site-packages directory in virtual env: {venv}")
+    return found[0]
+
+
+def locked_versions(lockfile: Path) -> dict[str, str]:
+    """Return the version of each package from an index in a poetry.lock file."""
+    import toml
+
+    return {
+        package["name"]: package["version"]
+        for package in toml.loads(lockfile.read_text()).get("package", [])
+        if package.get("source", {}).get("type", "legacy") == "legacy"
+    }
+
+
+def record_entry(path: Path, data: bytes, site: Path) -> tuple[str, str, int]:
+    """Return the RECORD row for a file at path with contents data."""
+    digest = urlsafe_b64encode(sha256(data).digest()).rstrip(b"=").decode()
+    return relpath(path, site), f"sha256={digest}", len(data)
+
+
+def install_wheel(wheel: Path, venv: Path):
+    """Unpack wheel into the virtual env at venv.
+
+    Files in the .data directory are moved to the matching venv directory,
+    scripts get the venv python in their shebang, and console scripts are
+    generated from the entry points. RECORD is written again to list the files
+    as installed, so that pip can uninstall them.
+    """
+    site, bindir = site_packages(venv), venv / "bin"
+    python = str(bindir / "python")
+    dist_info = None
+    record = []
+
+    with ZipFile(wheel) as zf:
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+
+            top, _, rest = info.filename.partition("/")
+            dest = site / info.filename
+            if top.endswith(".dist-info"):
+                dist_info = site / top
+            elif top.endswith(".data"):
+                scheme, _, rest = rest.partition("/")
+                dest = {
+                    "scripts": bindir,
+                    "headers": venv / "include",
+                    "data": venv,
+                }.get(scheme, site) / rest
+
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            data = zf.read(info)
+            if dest.parent == bindir and data.startswith(b"#!python"):
+                data = f"#!{python}".encode() + data[len(b"#!python"):]
+            dest.write_bytes(data)
+            record.append(record_entry(dest, data, site))
+
+            # keep the mode bits from the zip entry
+            mode = info.external_attr >> 16 & 0o777
+            if dest.parent == bindir:
+                mode |= 0o755
+            if mode:
+                dest.chmod(mode)
+
+    if not dist_info:
+        raise ProgramError(f"Invalid wheel, no .dist-info directory: {wheel}")
+
+    installer = dist_info / "INSTALLER"
+    installer.write_text("blueprint\n")
+    record.append(record_entry(installer, b"blueprint\n", site))
+
+    entry_points = dist_info / "entry_points.txt"
+    if entry_points.is_file():
+        parser = ConfigParser(delimiters=("=",))
+        parser.optionxform = str
+        parser.read(entry_points)
+        if parser.has_section("console_scripts"):
+            for script, target in parser.items("console_scripts"):
+                module, _, call = target.split("[")[0].strip().partition(":")
+                name = call.split(".")[0]
+                dest = bindir / script
+                data = CONSOLE_SCRIPT.format(
+                    python=python, module=module, name=name, call=call
+                ).encode()
+                dest.write_bytes(data)
+                dest.chmod(0o755)
+                record.append(record_entry(dest, data, site))
+
+    record_file = dist_info / "RECORD"
+    rows = [row for row in record if row[0] != relpath(record_file, site)]
+    with open(record_file, "w", newline="") as fh:
+        csv.writer(fh).writerows([*rows, (relpath(record_file, site), "", "")])
+
+
+class Wheelhouse(Object):
+    """Wheels for the dev dependencies of each Python version.
+
+    Wheels are built once with `bp wheelhouse build` at the versions in a
+    poetry.lock file, which is kept with them. New projects get a copy of the
+    lock file and the wheels are unpacked straight into their virtual env, so
+    neither locking nor installing needs any index access.
+    """
+
+    METADATA = "blueprint-wheelhouse.json"
+    LOCKFILE = "poetry.lock"
+
+    # number of wheels unpacked at the same time
+    JOBS = 8
+
+    def __init__(self, root=None, **kwargs):
+        """Create object.
+
+        Arguments:
+            root (Path): directory of wheelhouses, defaults to
+                         $BLUEPRINT_WHEELHOUSE or the blueprint cache
+        """
+        root = root or environ.get("BLUEPRINT_WHEELHOUSE")
+        self.root = Path(root) if root else cache_root() / "wheelhouse"
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        """Wheelhouse(root='...')."""
+        return f"{self.__class__.__name__}(root={str(self.root)!r})"
+
+    def path(self, pyv: str) -> Path:
+        """Return the directory of wheels for Python version pyv."""
+        return self.root / pyv
+
+    def wheels(self, pyv: str) -> list[Path]:
+        """Return the wheels for Python version pyv, if they finished building."""
+        path = self.path(pyv)
+        if not (path / self.METADATA).is_file():
+            return []
+        return sorted(path.glob("*.whl"))
+
+    def lockfile(self, pyv: str) -> Path:
+        """Return the poetry.lock file that the wheels for pyv were built from."""
+        return self.path(pyv) / self.LOCKFILE
+
+    def is_built(self, pyv: str, deps: list, pyv_constraint=None) -> bool:
+        """Return True if the wheels for pyv were built for deps.
+
+        If pyv_constraint is given, the lock file must also have been made for
+        it, since poetry refuses a lock file made for another one.
+        """
+        try:
+            built = json.loads((self.path(pyv) / self.METADATA).read_text())
+        except (OSError, ValueError):
+            return False
+
+        if pyv_constraint and built.get("pyv_constraint") != pyv_constraint:
+            return False
+        return built.get("deps") == sorted(deps)
+
+    def build(self, python: str, pyv: str, deps: list, pyv_constraint: str,
+              lockfile: Path) -> list[Path]:
+        """Fetch or build wheels for deps and everything they depend on.
+
+        The versions are pinned to those in lockfile, which is saved with the
+        wheels.
+
+        Arguments:
+            python (str): interpreter of Python version pyv to build them with
+            pyv (str): Python version
+            deps (list[str]): requirements
+            pyv_constraint (str): Python constraint lockfile was made for
+            lockfile (Path): poetry.lock file of a project with deps
+        """
+        path = self.path(pyv)
+        if path.exists():
+            rmtree(path)
+        path.mkdir(parents=True)
+
+        # pip evaluates the markers, so only the wheels for this platform are
+        # built, each at its locked version
+        constraints = path / "constraints.txt"
+        constraints.write_text("".join(
+            f"{name}=={version}\n"
+            for name, version in sorted(locked_versions(lockfile).items())
+        ))
+        ShellCommand(
+            str(python), "-m", "pip", "wheel", "--disable-pip-version-check",
+            "--quiet", "--wheel-dir", str(path), "--constraint", str(constraints),
+            *deps,
+        ).run()
+        copyfile(lockfile, self.lockfile(pyv))
+
+        # written last so an interrupted build is not used
+        metadata = {"deps": sorted(deps), "pyv_constraint": pyv_constraint}
+        (path / self.METADATA).write_text(json.dumps(metadata))
+        return self.wheels(pyv)
+
+    def install(self, venv: Path, pyv: str, jobs=None):
+        """Unpack every wheel for pyv into the virtual env at venv in parallel."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        wheels = self.wheels(pyv)
+        if not wheels:
+            raise ProgramError(
+                f"No wheels for Python {pyv} in {self.path(pyv)}, "
+                "run `bp wheelhouse build` first"
+            )
+
+        with ThreadPoolExecutor(max_workers=jobs or self.JOBS) as pool:
+            list(pool.map(lambda wheel: install_wheel(wheel, venv), wheels))
@@ -2,14 +2,16 @@
 
 
 class attr():
-    """Works like property() except with default getters/setters/deleters."""
+    """Works like property() except with default getters/setters/deleters.
 
-    def __new__(cls, name, **kwargs):
-        """Return the property for this attribute."""
-        obj = object.__new__(cls)
-        obj.__init__(name, **kwargs)
+    The defaults get, set and delete the private attribute, which is the name
+    with a leading underscore. Getting it before it is set returns None.
 
-        return property(obj.getter, obj.setter, obj.deleter, obj.doc)
+    An attr is a descriptor of its own rather than a property, so
+    isinstance(value, property) is False and there are no .getter(),
+    .setter() or .deleter() decorators. Pass the functions as keyword
+    arguments instead.
+    """
 
     def __init__(self, name, **kwargs):
         """Initialize attr object.
@@ -21,45 +23,50 @@ class attr():
             setter (func): setter function
             deleter (func): deleter function
             doc (str): docstring
+
+        Pass False for a getter, setter or deleter to leave it out.
         """
         self.name = name
-        self.doc = kwargs.pop("doc", f"{name} attribute")
         self.private_name = f"_{name}"
-        self.make_doer_methods(**kwargs)
-
-    def make_doer_methods(self, **kwargs):
-        """Assign the getter/setter/deleter attributes on this object."""
-        defaults = self.make_defaults()
-        for doer in ["getter", "setter", "deleter"]:
-            # get the method from either input or default method
-            method = kwargs.get(doer, defaults[doer])
-
-            # don't create an accessor if the kwarg value is False
-            if method is False:
-                method = None
-
-            if callable(method):
-                method.__name__ = self.name
-                method.__doc__ = self.doc
+        self.__doc__ = kwargs.pop("doc", f"{name} attribute")
+        self.fget = kwargs.get("getter")
+        self.fset = kwargs.get("setter")
+        self.fdel = kwargs.get("deleter")
 
-            # now set the accessor
-            setattr(self, doer, method)
+    def missing(self, obj, doer):
+        """Return the error for a getter, setter or deleter that was left out."""
+        return AttributeError(
+            f"attr {self.name!r} of {type(obj).__name__!r} object has no {doer}"
+        )
 
-    def make_defaults(parent):
-        """Generate the default methods."""
-        def getter(self):
-            self.__dict__.setdefault(parent.private_name, None)
-            return getattr(self, parent.private_name)
+    def __get__(self, obj, objtype=None):
+        """Return the value of the attribute."""
+        if obj is None:
+            return self
 
-        def setter(self, value):
-            self.__dict__.setdefault(parent.private_name, None)
-            setattr(self, parent.private_name, value)
+        fget = self.fget
+        if fget is None:
+            return getattr(obj, self.private_name, None)
+        if fget is False:
+            raise self.missing(obj, "getter")
+        return fget(obj)
 
-        def deleter(self):
-            delattr(self, parent.private_name)
+    def __set__(self, obj, value):
+        """Set the value of the attribute."""
+        fset = self.fset
+        if fset is None:
+            setattr(obj, self.private_name, value)
+        elif fset is False:
+            raise self.missing(obj, "setter")
+        else:
+            fset(obj, value)
 
-        return {
-            "getter": getter,
-            "setter": setter,
-            "deleter": deleter,
-        }
+    def __delete__(self, obj):
+        """Delete the attribute."""
+        fdel = self.fdel
+        if fdel is None:
+            delattr(obj, self.private_name)
+        elif fdel is False:
+            raise self.missing(obj, "deleter")
+        else:
+            fdel(obj)
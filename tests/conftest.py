@@ -1 +1,11 @@
 """Blueprint global pytest configuration and fixtures."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path_factory, monkeypatch):
+    """Keep the caches that tests write out of the user's cache directory."""
+    path = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("BLUEPRINT_CACHE_DIR", str(path))
+    return path
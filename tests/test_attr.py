@@ -92,3 +92,46 @@ def test_attr_false_doers():
 
     with pytest.raises(AttributeError):
         del person.limbs
+
+
+def test_attr_unset():
+    """
+    GIVEN: a class attr using all defaults
+    WHEN: it is read before it is set
+    THEN: it should be None
+    AND: the private attribute should not be set
+    """
+    person = Person()
+
+    assert person.age is None
+    assert "_age" not in person.__dict__
+
+
+def test_attr_class_access():
+    """
+    GIVEN: a class attr
+    WHEN: it is accessed on the class
+    THEN: the attr itself should be returned
+    """
+    assert isinstance(Person.age, attr)
+    assert Person.age.__doc__ == "age attribute"
+
+
+def test_attr_slots():
+    """
+    GIVEN: a class with __slots__ for the private attributes
+    WHEN: its attrs are used
+    THEN: the values should be stored in the slots
+    """
+    class Slotted:
+        __slots__ = ("_age",)
+        age = attr("age")
+
+    obj = Slotted()
+    assert obj.age is None
+
+    obj.age = 3
+    assert obj.age == 3
+
+    del obj.age
+    assert obj.age is None
@@ -0,0 +1,154 @@
+import json
+
+import pytest
+
+from blueprint import UserError
+from blueprint.app import App
+from blueprint.batch import Batch, make_project
+
+bp = breakpoint
+
+
+def test_batch():
+    batch = Batch()
+    assert batch
+    assert batch.run() == []
+
+
+def test_batch_load_toml(tmp_path):
+    """
+    GIVEN: a TOML manifest with a default dest and a list of projects
+    WHEN: Batch.load() is called
+    THEN: a spec should be returned for each project
+    AND: the dest should be relative to the manifest
+    """
+    manifest = tmp_path / "projects.toml"
+    manifest.write_text(
+        'dest = "services"\n'
+        "[[project]]\n"
+        'name = "first"\n'
+        "[[project]]\n"
+        'name = "second"\n'
+        'type = "python"\n'
+        'dest = "other"\n'
+    )
+
+    batch = Batch.load(manifest)
+
+    assert [spec["name"] for spec in batch.specs] == ["first", "second"]
+    assert batch.specs[0]["dest"] == tmp_path / "services"
+    assert batch.specs[1]["dest"] == tmp_path / "other"
+    assert batch.specs[1]["type"] == "python"
+
+
+def test_batch_load_json_list(tmp_path):
+    """
+    GIVEN: a JSON manifest that is a list of projects
+    WHEN: Batch.load() is called with a dest
+    THEN: each spec should use that dest
+    """
+    manifest = tmp_path / "projects.json"
+    manifest.write_text(json.dumps([{"name": "first"}]))
+
+    batch = Batch.load(manifest, tmp_path)
+
+    assert batch.specs == [{"name": "first", "dest": tmp_path}]
+
+
+def test_batch_load_dest_cwd(tmp_path, monkeypatch):
+    """
+    GIVEN: a manifest in another directory
+    WHEN: Batch.load() is called with a relative dest
+    THEN: the dest should be relative to the current directory
+    """
+    (tmp_path / "manifests").mkdir()
+    manifest = tmp_path / "manifests" / "projects.json"
+    manifest.write_text(json.dumps([{"name": "first"}]))
+    monkeypatch.chdir(tmp_path)
+
+    batch = Batch.load(manifest, "out")
+
+    assert batch.specs == [{"name": "first", "dest": tmp_path / "out"}]
+
+
+@pytest.mark.parametrize(["data", "message"], [
+    ({"dest": "x", "project": [{"name": "first"}]}, "Project 1 .* has a dest"),
+    ([{"name": "first"}, {"name": "second", "dest": "x"}], "Project 2 .* has a dest"),
+])
+def test_batch_load_dest_conflict(tmp_path, data, message):
+    """
+    GIVEN: a manifest that sets a dest
+    WHEN: Batch.load() is called with a dest as well
+    THEN: a UserError should be raised
+    """
+    manifest = tmp_path / "projects.json"
+    manifest.write_text(json.dumps(data))
+
+    with pytest.raises(UserError, match=message):
+        Batch.load(manifest, tmp_path)
+
+
+@pytest.mark.parametrize(["data", "message"], [
+    ([{"name": "first"}, "second"], "Project 2 in the manifest is not a table"),
+    ({"project": "first"}, "expected a list of projects"),
+    ("first", "expected a list of projects"),
+    ([{"name": "my project"}, {"name": "my-project"}], "Projects 1 and 2"),
+])
+def test_batch_load_invalid(tmp_path, data, message):
+    """
+    GIVEN: a manifest with a project that is not a table, no list of projects,
+           or two projects with the same path
+    WHEN: Batch.load() is called
+    THEN: a UserError should be raised
+    """
+    manifest = tmp_path / "projects.json"
+    manifest.write_text(json.dumps(data))
+
+    with pytest.raises(UserError, match=message):
+        Batch.load(manifest)
+
+
+@pytest.mark.parametrize(["spec", "given"], [
+    ({"summary": "nameless"}, "a spec with no name"),
+    ({"name": "x", "type": "rust"}, "a spec with an unknown type"),
+    ({"name": 5}, "a spec with a name that is not a string"),
+])
+def test_batch_validate_invalid(spec, given):
+    """
+    GIVEN: an invalid spec
+    WHEN: Batch.validate() is called
+    THEN: a UserError should be raised
+    """
+    with pytest.raises(UserError):
+        Batch.validate(spec)
+
+
+def test_batch_make_project_error(tmp_path):
+    """
+    GIVEN: a spec with a dest that does not exist
+    WHEN: make_project() is called
+    THEN: the result should contain the error instead of raising it
+    """
+    res = make_project({"name": "x", "dest": tmp_path / "missing"})
+
+    assert not res.ok
+    assert "Cannot create project in" in res.error
+
+
+def test_app_make_many(tmp_path):
+    """
+    GIVEN: a list of basic project specs
+    WHEN: app.make_many() is called
+    THEN: each project should be created
+    AND: a result should be returned for each spec in order
+    """
+    specs = [{"name": f"project {i}", "dest": tmp_path} for i in range(3)]
+
+    results = App().make_many(specs, jobs=2)
+
+    assert [res.name for res in results] == ["project 0", "project 1", "project 2"]
+    assert all(res.ok for res in results)
+
+    for i in range(3):
+        assert (tmp_path / f"project-{i}" / "README.md").is_file()
+        assert (tmp_path / f"project-{i}" / ".git").is_dir()
@@ -0,0 +1,46 @@
+import json
+
+from benchmarks import make
+
+bp = breakpoint
+
+
+def test_make_run_and_compare(tmp_path, capsys):
+    """
+    GIVEN: the stub poetry and asdf with no latency
+    WHEN: `python -m benchmarks.make run --repeat 1` is run
+    THEN: the time of each step of each project type should be saved
+    WHEN: `compare` is run with those results as both baseline and current
+    THEN: a line should be printed for each step, with no regressions
+    WHEN: a step is slower in current
+    THEN: it should be flagged as a regression
+    """
+    baseline, current = tmp_path / "baseline.json", tmp_path / "current.json"
+    args = ["run", "--repeat", "1", "--latency", "0", "--resolve-latency", "0"]
+
+    assert make.main([*args, "--output", str(baseline)]) == 0
+
+    data = json.loads(baseline.read_text())
+    assert data["meta"]["repeat"] == 1
+    assert data["results"].keys() == make.TYPES.keys()
+    for steps in data["results"].values():
+        assert {"create", "install_all", "save_manifest", "make"} <= steps.keys()
+        assert all(secs >= 0 for secs in steps.values())
+
+    capsys.readouterr()
+    assert make.main(["compare", str(baseline), str(baseline)]) == 0
+
+    lines = capsys.readouterr().out.splitlines()
+    steps = sum(len(steps) for steps in data["results"].values())
+    assert [line for line in lines if not line.startswith(" ")] == list(make.TYPES)
+    assert len(lines) == len(make.TYPES) + steps
+    assert all(line.endswith("ms    +0.0%") for line in lines if line[:1] == " ")
+
+    data["results"]["basic"]["create"] += 1
+    current.write_text(json.dumps(data))
+
+    assert make.main(["compare", str(baseline), str(current)]) == 1
+
+    out = capsys.readouterr().out
+    assert "REGRESSION" in out
+    assert out.splitlines()[-1] == "1 regression(s): basic.create"
@@ -1,11 +1,21 @@
+import json
+import sys
+from os import environ
+from subprocess import run
+from time import perf_counter
+
 import toml
 from typer.testing import CliRunner
 
-from blueprint.cli import new
+from blueprint import ROOT
+from blueprint.cli import cli, new
 
 bp = breakpoint
 runner = CliRunner()
 
+# seconds that `bp --help` may take from a cold interpreter start
+STARTUP_BUDGET = float(environ.get("BLUEPRINT_STARTUP_BUDGET", "1.0"))
+
 
 def test_new_help():
     """bp new --help"""
@@ -145,3 +155,223 @@ def test_new_python(tmp_path):
         assert d in specs["group"]["dev"]["dependencies"]
 
     assert (path / ".python-version").read_text().strip() == "3.10.2"
+
+
+def test_new_batch(tmp_path):
+    """
+    GIVEN: a manifest with two basic projects
+    WHEN: `bp new --batch MANIFEST --jobs 2`
+    THEN: both projects should be created
+    AND: a summary should be printed
+    """
+
+    manifest = tmp_path / "projects.toml"
+    manifest.write_text(
+        "[[project]]\n"
+        'name = "first project"\n'
+        "[[project]]\n"
+        'name = "second project"\n'
+    )
+
+    result = runner.invoke(new, [
+        "--batch", str(manifest),
+        "--dest", str(tmp_path),
+        "--jobs", "2",
+    ], input="y")
+
+    assert result.exit_code == 0
+    assert (tmp_path / "first-project" / "README.md").is_file()
+    assert (tmp_path / "second-project" / "README.md").is_file()
+    assert "2 created, 0 failed." in result.stdout
+
+
+def test_new_batch_manifest_dest(tmp_path, monkeypatch):
+    """
+    GIVEN: a manifest with a dest
+    WHEN: `bp new --batch MANIFEST` is run from another directory without --dest
+    THEN: the project should be made in the dest of the manifest
+    """
+    (tmp_path / "services").mkdir()
+    (tmp_path / "work").mkdir()
+    manifest = tmp_path / "projects.toml"
+    manifest.write_text('dest = "services"\n[[project]]\nname = "first project"\n')
+    monkeypatch.chdir(tmp_path / "work")
+
+    result = runner.invoke(new, ["--batch", str(manifest)], input="y")
+
+    assert result.exit_code == 0, result.stdout
+    assert (tmp_path / "services" / "first-project" / "README.md").is_file()
+
+
+def test_new_python_explain(tmp_path):
+    """
+    WHEN: `bp new python --explain 'my project'`
+    THEN: the setup steps should be printed
+    AND: the project should not be created
+    """
+
+    result = runner.invoke(new, [
+        "python",
+        "--dest", str(tmp_path),
+        "--explain",
+        "my project",
+    ])
+
+    assert result.exit_code == 0
+    assert "1. create" in result.stdout
+    assert "setup_poetry_install <- setup_poetry_lock, install_all" in result.stdout
+    assert not (tmp_path / "my-project").exists()
+
+
+def test_new_basic_trace(tmp_path):
+    """
+    WHEN: `bp new basic --trace trace.json 'my project'`
+    THEN: the project should be created
+    AND: a Chrome trace with a span for each step should be written
+    """
+    trace = tmp_path / "trace.json"
+
+    result = runner.invoke(new, [
+        "basic",
+        "--dest", str(tmp_path),
+        "--trace", str(trace),
+        "my project",
+    ], input="y")
+
+    assert result.exit_code == 0
+    assert (tmp_path / "my-project" / "README.md").is_file()
+
+    events = json.loads(trace.read_text())["traceEvents"]
+    steps = {e["name"] for e in events if e["cat"] == "step"}
+    assert steps == {"create", "setup_git", "install_all", "save_manifest"}
+
+
+def test_new_basic_default_dest(tmp_path, monkeypatch):
+    """
+    GIVEN: the current directory is changed after blueprint.cli was imported
+    WHEN: `bp new basic` is run without --dest
+    THEN: the project should be made in the new current directory
+    """
+    monkeypatch.chdir(tmp_path)
+
+    result = runner.invoke(new, ["basic", "my project"], input="y")
+
+    assert result.exit_code == 0, result.stdout
+    assert (tmp_path / "my-project" / "README.md").is_file()
+
+
+def test_new_basic_resume(tmp_path):
+    """
+    GIVEN: a project made by `bp new basic`
+    WHEN: `bp new basic --resume` is run for it
+    THEN: it should succeed without making the project again
+    """
+    args = ["basic", "--dest", str(tmp_path), "my project"]
+    runner.invoke(new, args, input="y")
+    readme = tmp_path / "my-project" / "README.md"
+    readme.write_text("edited\n")
+
+    result = runner.invoke(new, [*args, "--resume"], input="y")
+
+    assert result.exit_code == 0, result.stdout
+    assert "Resume basic project at" in result.stdout
+    assert readme.read_text() == "edited\n"
+
+
+def test_update(tmp_path):
+    """
+    GIVEN: a project made by `bp new basic`
+    WHEN: a generated file is edited and `bp update` is run on it
+    THEN: the file should be reported as modified
+    AND: nothing should need to be updated
+    """
+    runner.invoke(new, ["basic", "--dest", str(tmp_path), "my project"], input="y")
+    path = tmp_path / "my-project"
+    (path / "README.md").write_text("edited\n")
+
+    result = runner.invoke(cli, ["update", str(path)])
+
+    assert result.exit_code == 0
+    assert "Modified  README.md" in result.stdout
+    assert "0 added, 0 updated, 0 conflict" in result.stdout
+
+
+def test_cli_lazy_imports():
+    """
+    WHEN: blueprint.cli is imported by the `bp` entry point
+    THEN: modules only needed to make projects should not be imported
+    """
+    heavy = (
+        "git", "toml", "rich.console", "concurrent.futures", "more_itertools",
+        "blueprint.app", "blueprint.batch", "blueprint.project",
+        "blueprint.python_project", "blueprint.template",
+    )
+    code = (
+        "import sys, blueprint.daemon, blueprint.cli; "
+        f"print(' '.join(m for m in {heavy!r} if m in sys.modules))"
+    )
+
+    res = run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT)
+
+    assert res.returncode == 0, res.stderr
+    assert res.stdout.strip() == ""
+
+
+def test_cli_help_startup_budget():
+    """
+    WHEN: `bp --help` is run in a new interpreter
+    THEN: the fastest of three runs should finish within STARTUP_BUDGET seconds
+    """
+    # the `bp` script that pyproject.toml installs
+    scripts = toml.loads((ROOT / "pyproject.toml").read_text())["tool"]["poetry"]
+    module, func = scripts["scripts"]["bp"].split(":")
+    code = f"from {module} import {func}; {func}()"
+    command = [sys.executable, "-c", code, "--help"]
+    times = []
+
+    for _ in range(3):
+        start = perf_counter()
+        res = run(command, capture_output=True, text=True, cwd=ROOT)
+        times.append(perf_counter() - start)
+        assert res.returncode == 0, res.stderr
+
+    assert min(times) < STARTUP_BUDGET, (
+        f"bp --help took {min(times):.3f}s, budget is {STARTUP_BUDGET}s"
+    )
+
+
+def test_rollout(tmp_path):
+    """
+    WHEN: `bp rollout DIR` is run on a directory of projects
+    THEN: every project found should be updated
+    AND: a summary should be printed
+    """
+    for name in ("one", "two"):
+        runner.invoke(new, ["basic", "--dest", str(tmp_path), name], input="y")
+
+    result = runner.invoke(cli, ["rollout", "--jobs", "1", str(tmp_path)])
+
+    assert result.exit_code == 0
+    assert "0 updated, 0 conflict, 2 skipped, 0 failed" in result.stdout
+
+
+def test_pool_fill(tmp_path, monkeypatch):
+    """
+    GIVEN: a pool with a virtual env that is older than --max-age
+    WHEN: `bp pool fill --size 0` is run
+    THEN: the pool should be emptied
+    """
+    from blueprint.toolchain import toolchain
+
+    monkeypatch.setattr(toolchain, "asdf_where", lambda pyv: sys.prefix)
+    old = tmp_path / "3.11.1" / "1-1"
+    old.mkdir(parents=True)
+    (old / "blueprint-venv.json").write_text('{"created": 0}')
+
+    result = runner.invoke(cli, [
+        "pool", "fill", "--pyv", "3.11.1", "--size", "0", "--dir", str(tmp_path),
+    ])
+
+    assert result.exit_code == 0, result.stdout
+    assert "0 virtual envs for Python 3.11.1" in result.stdout
+    assert not old.exists()
@@ -0,0 +1,129 @@
+import sys
+from os import environ, utime
+from subprocess import PIPE, Popen, run
+from time import sleep
+
+import pytest
+
+from blueprint import ROOT, UserError
+from blueprint.daemon import Daemon, command, forward, socket_path, sources_stamp
+from blueprint.project import Project
+from blueprint.toolchain import toolchain
+
+bp = breakpoint
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Run `bp serve` in the background and return its socket path."""
+    path = tmp_path / "bp.sock"
+    proc = Popen(
+        [sys.executable, "-c", "from blueprint.cli import run; run()",
+         "serve", "--socket", str(path)],
+        cwd=ROOT, stdout=PIPE, stderr=PIPE, text=True,
+    )
+    for _ in range(200):
+        if path.exists() or proc.poll() is not None:
+            break
+        sleep(0.05)
+
+    assert path.exists(), proc.communicate()
+
+    yield path
+
+    proc.terminate()
+    proc.wait(timeout=10)
+    assert not path.exists()
+
+
+@pytest.mark.parametrize("args, expected", [
+    (["new", "basic", "x"], "new"),
+    (["--lookup-cache", "update"], "update"),
+    (["--help"], None),
+])
+def test_command(args, expected):
+    """
+    GIVEN: command line arguments
+    WHEN: command() is called
+    THEN: the first argument that is not an option should be returned
+    """
+    assert command(args) == expected
+
+
+def test_socket_path(monkeypatch, tmp_path):
+    """
+    GIVEN: $BLUEPRINT_SOCKET is set
+    WHEN: socket_path() is called
+    THEN: it should be returned
+    """
+    assert socket_path().name == "bp.sock"
+
+    monkeypatch.setenv("BLUEPRINT_SOCKET", str(tmp_path / "x.sock"))
+    assert socket_path() == tmp_path / "x.sock"
+
+
+def test_sources_stamp_toolchain(tmp_path, monkeypatch):
+    """
+    GIVEN: a toolchain lookup that depends on a file, like the poetry executable
+    WHEN: the file is modified
+    THEN: the stamp should change, so that the daemon warms up again
+    """
+    exe = tmp_path / "poetry"
+    exe.touch()
+    monkeypatch.setattr(toolchain, "memo", {})
+    toolchain.lookup("poetry_version", lambda: ("Poetry 1.0", [exe]))
+    stamp = sources_stamp()
+
+    assert (str(exe), exe.stat().st_mtime) in stamp
+
+    exe.write_text("upgraded")
+    utime(exe, (1, 1))
+
+    assert sources_stamp() != stamp
+
+
+def test_forward_not_running(tmp_path):
+    """
+    GIVEN: no daemon is listening on the socket
+    WHEN: forward() is called
+    THEN: None should be returned so the command runs in-process
+    """
+    assert forward(["update"], tmp_path / "bp.sock") is None
+
+
+def test_daemon_already_running(daemon):
+    """
+    GIVEN: a daemon is listening on a socket
+    WHEN: another daemon is started on the same socket
+    THEN: a UserError should be raised
+    """
+    with pytest.raises(UserError, match="already running"):
+        Daemon(daemon).bind()
+
+
+def test_daemon_forward(daemon, tmp_path):
+    """
+    GIVEN: a running daemon
+    WHEN: `bp update` is run
+    THEN: it should be run by the daemon, in the working directory of bp
+    AND: its output and exit status should be those of the command
+    """
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    Project("my project", dest).make()
+
+    code = (
+        "import sys; from blueprint.daemon import forward; "
+        "status = forward(sys.argv[1:]); "
+        "print(status, 'blueprint.cli' in sys.modules)"
+    )
+    res = run(
+        [sys.executable, "-c", code, "update", "my-project"],
+        cwd=dest, capture_output=True, text=True,
+        env={**environ, "BLUEPRINT_SOCKET": str(daemon), "PYTHONPATH": str(ROOT)},
+    )
+
+    assert res.returncode == 0, res.stderr
+    lines = res.stdout.splitlines()
+    assert "0 added, 0 updated, 0 conflict, 2 unchanged" in lines
+    assert lines[-1] == "0 False"
@@ -0,0 +1,75 @@
+import pytest
+
+from blueprint import files
+from blueprint.files import copy_file, needs_render
+
+bp = breakpoint
+
+
+@pytest.mark.parametrize(["contents", "expected", "given"], [
+    (b"# ${TITLE_NAME}\n", True, "a text file with a variable"),
+    (b"costs $$5\n", True, "a text file with an escaped $"),
+    (b"{% if X %}x{% endif %}", True, "a text file with a block tag"),
+    (b"plain text\n", False, "a text file with no template syntax"),
+    (b"\x89PNG\r\n\x1a\n\0\0${X}", False, "a binary file"),
+    (b"caf\xe9 ${X}", False, "a file that is not UTF-8"),
+    (b"", False, "an empty file"),
+])
+def test_needs_render(tmp_path, contents, expected, given):
+    """
+    GIVEN: a source file
+    WHEN: needs_render() is called
+    THEN: it should be True only for text files with template syntax
+    """
+    path = tmp_path / "file"
+    path.write_bytes(contents)
+
+    assert needs_render(path) == expected, f"Given {given}"
+
+
+def test_needs_render_split_marker(tmp_path, monkeypatch):
+    """
+    GIVEN: a text file where "{%" is split between two chunks
+    WHEN: needs_render() is called
+    THEN: it should return True
+    """
+    monkeypatch.setattr(files, "CHUNK_SIZE", 4)
+    path = tmp_path / "file"
+    path.write_bytes(b"abc{% if X %}{% endif %}")
+
+    assert needs_render(path)
+
+
+def test_copy_file(tmp_path):
+    """
+    GIVEN: a binary source file that is executable
+    WHEN: copy_file() is called
+    THEN: the destination should have the same bytes
+    AND: the same mode bits
+    """
+    src, dest = tmp_path / "src", tmp_path / "dest"
+    data = bytes(range(256)) * 1000
+    src.write_bytes(data)
+    src.chmod(0o751)
+
+    copy_file(src, dest)
+
+    assert dest.read_bytes() == data
+    assert dest.stat().st_mode & 0o777 == 0o751
+
+
+def test_copy_file_without_copy_file_range(tmp_path, monkeypatch):
+    """
+    GIVEN: a platform without os.copy_file_range(), like macOS
+    WHEN: copy_file() is called
+    THEN: the destination should have the same bytes and mode bits
+    """
+    monkeypatch.setattr(files, "copy_file_range", None)
+    src, dest = tmp_path / "src", tmp_path / "dest"
+    src.write_bytes(b"\x89PNG\0" * 100)
+    src.chmod(0o640)
+
+    copy_file(src, dest)
+
+    assert dest.read_bytes() == b"\x89PNG\0" * 100
+    assert dest.stat().st_mode & 0o777 == 0o640
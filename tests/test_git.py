@@ -0,0 +1,165 @@
+from subprocess import run
+from time import tzset
+
+import pytest
+
+from blueprint import UserError
+from blueprint.git import GitRepo, read_config, timestamp
+
+
+def git(path, *args) -> str:
+    """Run git in path and return its output."""
+    res = run(["git", "-C", str(path), *args], capture_output=True, text=True)
+    assert res.returncode == 0, res.stderr
+    return res.stdout
+
+
+@pytest.fixture
+def identity(monkeypatch):
+    """Set the identity used for commits."""
+    for role in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{role}_NAME", "Jane Doe")
+        monkeypatch.setenv(f"GIT_{role}_EMAIL", "jane@example.com")
+
+
+def test_read_config(tmp_path):
+    """
+    GIVEN: git config files
+    WHEN: read_config() is called
+    THEN: the settings should be returned with later files taking precedence
+    """
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.write_text('[user]\n\tname = "Jane Doe"\n[init]\n\tdefaultBranch = main\n')
+    second.write_text("# comment\n[user]\n  name = Jim\n")
+
+    config = read_config(first, second, tmp_path / "missing")
+
+    assert config == {"user.name": "Jim", "init.defaultbranch": "main"}
+
+
+def test_git_repo_init(tmp_path):
+    """
+    GIVEN: a directory
+    WHEN: GitRepo.init() is called
+    THEN: git should see an empty repository on the given branch
+    """
+    GitRepo(tmp_path, branch="trunk").init()
+
+    assert git(tmp_path, "rev-parse", "--git-dir").strip() == ".git"
+    assert git(tmp_path, "symbolic-ref", "HEAD").strip() == "refs/heads/trunk"
+
+
+def test_git_repo_commit(tmp_path, identity):
+    """
+    GIVEN: an initialized GitRepo with nested, executable and ignored files
+    WHEN: GitRepo.commit() is called
+    THEN: git should see a valid commit of every file that is not ignored
+    AND: the index should match the work tree
+    """
+    (tmp_path / "pkg" / "sub").mkdir(parents=True)
+    (tmp_path / "pkg" / "sub" / "mod.py").write_text("x = 1\n")
+    (tmp_path / "pkg.txt").write_text("sorts before pkg/\n")
+    (tmp_path / "run.sh").write_text("#!/bin/sh\n")
+    (tmp_path / "run.sh").chmod(0o755)
+    (tmp_path / "link").symlink_to("run.sh")
+    (tmp_path / ".gitignore").write_text("*.log\n/build/\n")
+    (tmp_path / "debug.log").write_text("ignored\n")
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "out").write_text("ignored\n")
+    (tmp_path / ".venv").mkdir()
+    (tmp_path / ".venv" / "pyvenv.cfg").write_text("ignored\n")
+
+    repo = GitRepo(tmp_path, branch="main")
+    repo.init()
+    oid = repo.commit("Initial commit")
+
+    assert git(tmp_path, "rev-parse", "HEAD").strip() == oid
+    git(tmp_path, "fsck", "--strict")
+    assert git(tmp_path, "log", "--format=%an <%ae> %s").strip() == (
+        "Jane Doe <jane@example.com> Initial commit"
+    )
+    assert git(tmp_path, "ls-files").split() == [
+        ".gitignore", "link", "pkg.txt", "pkg/sub/mod.py", "run.sh",
+    ]
+    assert git(tmp_path, "status", "--porcelain") == ""
+    assert "100755" in git(tmp_path, "ls-files", "-s", "run.sh")
+    assert "120000" in git(tmp_path, "ls-files", "-s", "link")
+
+
+def test_git_repo_commit_no_identity(tmp_path, monkeypatch):
+    """
+    GIVEN: no git identity is configured
+    WHEN: GitRepo.commit() is called
+    THEN: a UserError should be raised
+    """
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+    for var in ("GIT_AUTHOR_NAME", "GIT_AUTHOR_EMAIL"):
+        monkeypatch.delenv(var, raising=False)
+
+    repo = GitRepo(tmp_path / "project")
+    repo.path.mkdir()
+    repo.init()
+
+    with pytest.raises(UserError):
+        repo.commit("Initial commit")
+
+
+@pytest.mark.parametrize("tz, expected", [
+    ("UTC0", "86400 +0000"),
+    ("EST5", "86400 -0500"),
+    ("IST-5:30", "86400 +0530"),
+])
+def test_timestamp(monkeypatch, tz, expected):
+    """
+    GIVEN: a local time zone
+    WHEN: timestamp() is called
+    THEN: the offset should be that of the local time zone, like git uses
+    """
+    monkeypatch.setenv("TZ", tz)
+    tzset()
+    try:
+        assert timestamp(86400) == expected
+    finally:
+        monkeypatch.undo()
+        tzset()
+
+
+def test_git_repo_commit_gitignore(tmp_path, identity):
+    """
+    GIVEN: a .gitignore with anchored and directory only patterns
+    WHEN: GitRepo.commit() is called
+    THEN: the same files should be committed as git would
+    """
+    for path in ("docs/build/a", "src/docs/build/b", "logs", "src/logs/c", "top"):
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text("x\n")
+    (tmp_path / ".gitignore").write_text("docs/build\nlogs/\n/top\n")
+
+    repo = GitRepo(tmp_path, branch="main")
+    repo.init()
+    repo.commit("Initial commit")
+
+    assert git(tmp_path, "ls-files").split() == [
+        ".gitignore", "logs", "src/docs/build/b",
+    ]
+    assert git(tmp_path, "status", "--porcelain") == ""
+
+
+def test_git_repo_commit_unsupported_gitignore(tmp_path, identity):
+    """
+    GIVEN: a .gitignore with a negation
+    WHEN: GitRepo.commit() is called
+    THEN: git should be used to make the commit
+    """
+    (tmp_path / "a.log").write_text("ignored\n")
+    (tmp_path / "keep.log").write_text("kept\n")
+    (tmp_path / ".gitignore").write_text("*.log\n!keep.log\n")
+
+    repo = GitRepo(tmp_path, branch="main")
+    repo.init()
+    oid = repo.commit("Initial commit")
+
+    assert repo.needs_git()
+    assert git(tmp_path, "rev-parse", "HEAD").strip() == oid
+    assert git(tmp_path, "ls-files").split() == [".gitignore", "keep.log"]
@@ -0,0 +1,77 @@
+import pytest
+
+from blueprint import UserError
+from blueprint.journal import Journal
+from blueprint.manifest import DIRNAME
+
+
+def test_journal_record_load(tmp_path):
+    """
+    GIVEN: a Journal for an existing project directory
+    WHEN: steps are recorded
+    THEN: it should be saved
+    AND: loading it again should return the same journal
+    """
+    journal = Journal(tmp_path)
+    journal.record("create", "abc", "done")
+    journal.record("install_all", "def", "failed", "ProgramError: oops")
+
+    assert (tmp_path / DIRNAME / "journal.json").is_file()
+    assert Journal.load(tmp_path) == journal
+    assert journal.steps["install_all"]["error"] == "ProgramError: oops"
+
+
+def test_journal_record_no_project(tmp_path):
+    """
+    GIVEN: a Journal for a project directory that does not exist yet
+    WHEN: a step is recorded
+    THEN: the directory should not be created
+    """
+    journal = Journal(tmp_path / "project")
+    journal.record("create", "abc", "failed", "AccessError: nope")
+
+    assert not (tmp_path / "project").exists()
+    assert journal.steps["create"]["status"] == "failed"
+
+
+def test_journal_load_missing(tmp_path):
+    """
+    GIVEN: a project without a journal
+    WHEN: Journal.load() is called
+    THEN: an empty journal should be returned
+    """
+    assert Journal.load(tmp_path).steps == {}
+
+
+@pytest.mark.parametrize("content, message", [
+    ("{", "Invalid journal"),
+    ('{"version": 0}', "Unsupported journal version"),
+])
+def test_journal_load_invalid(tmp_path, content, message):
+    """
+    GIVEN: a project with an invalid or unsupported journal
+    WHEN: Journal.load() is called
+    THEN: a UserError should be raised
+    """
+    (tmp_path / DIRNAME).mkdir()
+    (tmp_path / DIRNAME / "journal.json").write_text(content)
+
+    with pytest.raises(UserError, match=message):
+        Journal.load(tmp_path)
+
+
+@pytest.mark.parametrize("entry, inputs, expected", [
+    ({"status": "done", "inputs": "abc"}, "abc", True),
+    ({"status": "done", "inputs": "abc"}, "xyz", False),
+    ({"status": "failed", "inputs": "abc"}, "abc", False),
+    (None, "abc", False),
+])
+def test_journal_completed(tmp_path, entry, inputs, expected):
+    """
+    GIVEN: a Journal
+    WHEN: .completed() is called
+    THEN: it should be True only if the step was done with the same inputs
+    """
+    journal = Journal(tmp_path, {"create": entry} if entry else {})
+
+    assert journal.completed("create", inputs) is expected
@@ -0,0 +1,54 @@
+from blueprint.lock_cache import LockCache
+
+bp = breakpoint
+
+
+def test_lock_cache(tmp_path):
+    cache = LockCache(tmp_path)
+    assert cache
+
+
+def test_lock_cache_key(tmp_path):
+    """
+    GIVEN: a LockCache object
+    WHEN: .key() is called
+    THEN: the key should only change when the inputs to poetry lock do
+    """
+    cache = LockCache(tmp_path)
+    key = cache.key(["a", "b"], ">=3.10", "Poetry (version 1.8.3)")
+
+    assert key == cache.key(["b", "a"], ">=3.10", "Poetry (version 1.8.3)")
+    assert key != cache.key(["a"], ">=3.10", "Poetry (version 1.8.3)")
+    assert key != cache.key(["a", "b"], ">=3.11", "Poetry (version 1.8.3)")
+    assert key != cache.key(["a", "b"], ">=3.10", "Poetry (version 1.8.4)")
+
+
+def test_lock_cache_fetch_miss(tmp_path):
+    """
+    GIVEN: an empty LockCache
+    WHEN: .fetch() is called
+    THEN: it should return False
+    AND: no lock file should be written
+    """
+    cache = LockCache(tmp_path / "cache")
+    lockfile = tmp_path / "poetry.lock"
+
+    assert not cache.fetch("key", lockfile)
+    assert not lockfile.exists()
+
+
+def test_lock_cache_store_fetch(tmp_path):
+    """
+    GIVEN: a lock file that was stored in a LockCache
+    WHEN: .fetch() is called with the same key
+    THEN: the lock file should be written to the new location
+    """
+    cache = LockCache(tmp_path / "cache")
+    orig = tmp_path / "orig.lock"
+    orig.write_text("# lock\n")
+    cache.store("key", orig)
+
+    lockfile = tmp_path / "poetry.lock"
+
+    assert cache.fetch("key", lockfile)
+    assert lockfile.read_text() == "# lock\n"
@@ -0,0 +1,72 @@
+from os import utime
+
+import pytest
+
+from blueprint import UserError
+from blueprint.manifest import DIRNAME, Manifest, jsonable
+
+
+def test_jsonable():
+    """
+    GIVEN: data with values that JSON does not have a type for
+    WHEN: jsonable() is called
+    THEN: the data should be the same as after a JSON round trip
+    """
+    assert jsonable({"a": ("b", 1)}) == {"a": ["b", 1]}
+
+
+def test_manifest_save_load(tmp_path):
+    """
+    GIVEN: a Manifest with a recorded file
+    WHEN: it is saved and loaded again
+    THEN: the loaded manifest should be the same
+    """
+    (tmp_path / "README.md").write_text("# My Project\n")
+    manifest = Manifest(tmp_path, "basic", {"name": "my-project"}, {"A": "b"})
+    manifest.record("README.md", "README.md", "abc")
+    manifest.save()
+
+    assert (tmp_path / DIRNAME / "manifest.json").is_file()
+    assert Manifest.load(tmp_path) == manifest
+
+
+@pytest.mark.parametrize("content, message", [
+    (None, "Not a blueprint project"),
+    ("{", "Invalid manifest"),
+    ('{"version": 0}', "Unsupported manifest version"),
+])
+def test_manifest_load_invalid(tmp_path, content, message):
+    """
+    GIVEN: a directory with a missing, invalid or unsupported manifest
+    WHEN: Manifest.load() is called
+    THEN: a UserError should be raised
+    """
+    if content:
+        (tmp_path / DIRNAME).mkdir()
+        (tmp_path / DIRNAME / "manifest.json").write_text(content)
+
+    with pytest.raises(UserError, match=message):
+        Manifest.load(tmp_path)
+
+
+def test_manifest_modified(tmp_path):
+    """
+    GIVEN: a Manifest with a recorded file
+    WHEN: the file is touched, edited or removed
+    THEN: modified() should be True only if its contents changed
+    """
+    path = tmp_path / "README.md"
+    path.write_text("hello\n")
+    manifest = Manifest(tmp_path)
+    manifest.record("README.md", "README.md", "abc")
+
+    assert not manifest.modified("README.md")
+
+    utime(path, (1, 1))
+    assert not manifest.modified("README.md")
+
+    path.write_text("changed\n")
+    assert manifest.modified("README.md")
+
+    path.unlink()
+    assert manifest.modified("README.md")
@@ -0,0 +1,55 @@
+import pytest
+
+from blueprint.names import ProjectNames
+
+
+@pytest.mark.parametrize("name, dash, snake, title, pascal", [
+    ("my-project", "my-project", "my_project", "My Project", "MyProject"),
+    ("my_project", "my-project", "my_project", "My Project", "MyProject"),
+    ("My Project", "my-project", "my_project", "My Project", "MyProject"),
+    ("project", "project", "project", "Project", "Project"),
+])
+def test_project_names(name, dash, snake, title, pascal):
+    """
+    GIVEN: a project name
+    WHEN: ProjectNames is created
+    THEN: each variant of the name should be set
+    """
+    names = ProjectNames(name)
+
+    assert names.name == name
+    assert names.dash == dash
+    assert names.snake == snake
+    assert names.title == title
+    assert names.pascal == pascal
+
+
+def test_project_names_immutable():
+    """
+    GIVEN: a ProjectNames object
+    WHEN: an attribute is changed, added or deleted
+    THEN: AttributeError should be raised
+    """
+    names = ProjectNames("my-project")
+
+    with pytest.raises(AttributeError):
+        names.dash = "other"
+
+    with pytest.raises(AttributeError):
+        names.other = "other"
+
+    with pytest.raises(AttributeError):
+        del names.dash
+
+    assert not hasattr(names, "__dict__")
+
+
+def test_project_names_eq():
+    """
+    GIVEN: ProjectNames objects
+    WHEN: they are compared
+    THEN: they should be equal if they were made from the same name
+    """
+    assert ProjectNames("a-b") == ProjectNames("a-b")
+    assert ProjectNames("a-b") != ProjectNames("a_b")
+    assert len({ProjectNames("a-b"), ProjectNames("a-b")}) == 1
@@ -0,0 +1,124 @@
+import pytest
+
+from blueprint.attr import attr
+from blueprint.object import Object, SlottedObject, slot_names
+
+
+class Thing(Object):
+    """Class for testing objects with a __dict__."""
+
+
+class Slotted(SlottedObject):
+    """Class for testing objects with __slots__."""
+
+    __slots__ = ("_size", "color", "__secret")
+
+    size = attr("size")
+
+
+class SubSlotted(Slotted):
+    """Class for testing objects with __slots__ in a parent class."""
+
+    __slots__ = ("shape",)
+
+
+def test_slot_names():
+    """
+    GIVEN: classes with __slots__
+    WHEN: slot_names() is called
+    THEN: the slots of the class and its parents should be returned in order
+    AND: private names should be mangled
+    """
+    assert slot_names(Thing) == ()
+    assert slot_names(Slotted) == ("_size", "color", "_Slotted__secret")
+    assert SubSlotted._slot_names == (*Slotted._slot_names, "shape")
+
+
+def test_object():
+    """
+    GIVEN: keyword arguments
+    WHEN: an Object is created with them
+    THEN: they should be set as attributes
+    AND: other attributes can be set later
+    """
+    obj = Object(a=1)
+    obj.b = 2
+
+    assert (obj.a, obj.b) == (1, 2)
+    assert obj == Object(a=1, b=2)
+
+
+def test_object_slots():
+    """
+    GIVEN: a SlottedObject subclass with __slots__
+    WHEN: an object is created
+    THEN: it should not have a __dict__
+    AND: attributes that are not slots should not be allowed
+    """
+    obj = Slotted(size=1, color="red")
+
+    assert obj.size == 1
+    assert not hasattr(obj, "__dict__")
+
+    with pytest.raises(AttributeError):
+        obj.other = 1
+
+
+@pytest.mark.parametrize("obj, expected", [
+    (Thing(a=1, b="x"), "Thing(a=1, b='x')"),
+    (Slotted(size=1), "Slotted(_size=1)"),
+    (SubSlotted(color="red", shape="square"),
+     "SubSlotted(color='red', shape='square')"),
+])
+def test_object_repr(obj, expected):
+    """
+    GIVEN: an object
+    WHEN: repr() is called
+    THEN: the attributes that are set should be included
+    """
+    assert repr(obj) == expected
+
+
+@pytest.mark.parametrize("a, b, equal", [
+    (Thing(a=1), Thing(a=1), True),
+    (Thing(a=1), Thing(a=2), False),
+    (Thing(a=1), Object(), False),
+    (Slotted(size=1, color="red"), Slotted(size=1, color="red"), True),
+    (Slotted(size=1, color="red"), Slotted(size=1, color="blue"), False),
+    (Slotted(size=1), Slotted(size=1), True),
+    (Slotted(size=1), Slotted(size=1, color="red"), False),
+    (SubSlotted(shape="square"), SubSlotted(shape="square"), True),
+    (Slotted(size=1), SubSlotted(size=1), False),
+])
+def test_object_eq(a, b, equal):
+    """
+    GIVEN: two objects
+    WHEN: they are compared
+    THEN: they should be equal if they are of the same type and their
+          attributes that are set are the same
+    """
+    assert (a == b) is equal
+
+
+def test_object_methods_by_layout():
+    """
+    GIVEN: subclasses with only a __dict__, only slots, both, or their own __repr__
+    WHEN: they are created
+    THEN: they should get the __repr__ and __eq__ for how they keep attributes
+    AND: methods they define themselves should be kept
+    """
+    class Mixed(Thing):
+        __slots__ = ("size",)
+
+    class Custom(Slotted):
+        __slots__ = ()
+
+        def __repr__(self):
+            return "custom"
+
+    assert Thing.__eq__ is SlottedObject._dict_eq
+    assert Slotted.__eq__ is SlottedObject._slots_eq
+    assert Mixed.__eq__ is SlottedObject.__eq__
+    assert repr(Mixed(size=1, a=2)) == "Mixed(size=1, a=2)"
+    assert repr(Custom(color="red")) == "custom"
+    assert Custom.__eq__ is SlottedObject._slots_eq
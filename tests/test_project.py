@@ -1,9 +1,13 @@
 from contextlib import contextmanager
+from subprocess import run
 
 import pytest
 
-from blueprint import AccessError, ProgramError
+from blueprint import AccessError, ProgramError, UserError
+from blueprint.manifest import Manifest
 from blueprint.project import Project
+from blueprint.sources import SourceIndex
+from blueprint.trace import Tracer
 
 
 @contextmanager
@@ -265,3 +269,241 @@ def test_project_setup(tmp_path):
     project.setup()
 
     assert (project.path / ".git").is_dir()
+
+
+def test_project_make(tmp_path):
+    """
+    GIVEN: a Project object
+    WHEN: project.make() is called
+    THEN: all steps should run
+    """
+    project = Project("myproject", dest=tmp_path)
+    project.make()
+
+    assert (project.path / ".git").is_dir()
+    assert (project.path / "README.md").is_file()
+    assert (project.path / ".todo").is_dir()
+
+
+def test_project_install_binary(tmp_path):
+    """
+    GIVEN: a source file that is binary and executable
+    WHEN: project.install() is called with that filename
+    THEN: the file should be copied byte for byte
+    AND: its mode bits should be preserved
+    """
+    source_path = tmp_path / "sources"
+    source_path.mkdir()
+    data = b"\x89PNG\r\n\x1a\n\0${SNAKE_NAME}\xff"
+    (source_path / "logo.png").write_bytes(data)
+    (source_path / "logo.png").chmod(0o755)
+
+    with modify_class_sources(Project, source_path):
+        project = Project("my-project", dest=tmp_path)
+        project.create()
+        project.install("logo.png")
+
+    dest = project.path / "logo.png"
+    assert dest.read_bytes() == data
+    assert dest.stat().st_mode & 0o777 == 0o755
+
+
+def test_project_install_all_tree(tmp_path):
+    """
+    GIVEN: a SOURCES directory with nested directories and templated paths
+    WHEN: project.install_all() is called
+    THEN: every directory and file should be installed
+    AND: paths and contents should be rendered
+    AND: cache files should be skipped
+    """
+    source_path = tmp_path / "sources"
+    deep = source_path / "${SNAKE_NAME}" / "a" / "b"
+    deep.mkdir(parents=True)
+    (source_path / "empty").mkdir()
+    (source_path / "__pycache__").mkdir()
+    (source_path / "__pycache__" / "x.pyc").write_bytes(b"\0")
+    (deep / "c.txt").write_text("${TITLE_NAME}\n")
+    for i in range(20):
+        (source_path / "${SNAKE_NAME}" / f"f{i}.txt").write_text(f"{i}\n")
+
+    with modify_class_sources(Project, source_path):
+        project = Project("my-project", dest=tmp_path)
+        project.create()
+        project.install_all()
+
+    assert (project.path / "empty").is_dir()
+    assert (project.path / "my_project/a/b/c.txt").read_text() == "My Project\n"
+    assert (project.path / "my_project/f19.txt").read_text() == "19\n"
+    assert not (project.path / "__pycache__").exists()
+
+
+def test_project_make_trace(tmp_path, monkeypatch):
+    """
+    GIVEN: tracing is enabled
+    WHEN: project.make() is called
+    THEN: a span should be recorded for make, each step and each install
+    """
+    tracer = Tracer(enabled=True)
+    monkeypatch.setattr("blueprint.project.tracer", tracer)
+
+    project = Project("myproject", dest=tmp_path)
+    project.make()
+
+    spans = {(e["cat"], e["name"]) for e in tracer.events}
+    assert ("project", "make") in spans
+    assert {("step", name) for name in Project.STEPS} <= spans
+    assert ("install", "README.md") in spans
+
+
+def test_project_make_git_commit(tmp_path, monkeypatch):
+    """
+    GIVEN: a Project object with git_commit set
+    WHEN: project.make() is called
+    THEN: the generated files should be committed after every other step
+    """
+    for role in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{role}_NAME", "Jane Doe")
+        monkeypatch.setenv(f"GIT_{role}_EMAIL", "jane@example.com")
+
+    project = Project("myproject", dest=tmp_path, git_commit=True)
+    project.make()
+
+    assert project.scheduler.levels[-1] == ["commit_git"]
+    res = run(
+        ["git", "-C", str(project.path), "ls-files"],
+        capture_output=True, text=True
+    )
+    assert "README.md" in res.stdout.split()
+
+
+def test_project_make_manifest(tmp_path):
+    """
+    GIVEN: a Project object
+    WHEN: project.make() is called
+    THEN: a manifest of every installed file should be saved in the project
+    """
+    project = Project("myproject", dest=tmp_path, summary="Stuff.")
+    project.make()
+
+    manifest = Manifest.load(project.path)
+    assert manifest.type == "basic"
+    assert manifest.options["summary"] == "Stuff."
+    assert manifest.files["README.md"]["path"] == "README.md"
+
+
+def test_project_update(tmp_path):
+    """
+    GIVEN: a Project that was made and then its templates were changed
+    WHEN: project.update() is called
+    THEN: only templates that changed should be installed
+    AND: files the user edited should be reported as modified or conflicts
+    """
+    source_path = tmp_path / "sources"
+    source_path.mkdir()
+    for name in ("same", "changed", "edited", "conflict", "gone"):
+        (source_path / name).write_text(f"{name} ${{TITLE_NAME}}\n")
+
+    with modify_class_sources(Project, source_path):
+        project = Project("my-project", dest=tmp_path)
+        project.make()
+        SourceIndex.clear()
+
+        (project.path / "edited").write_text("user edit\n")
+        (project.path / "conflict").write_text("user edit\n")
+        (source_path / "changed").write_text("new ${TITLE_NAME}\n")
+        (source_path / "conflict").write_text("new ${TITLE_NAME}\n")
+        (source_path / "gone").unlink()
+        (source_path / "${SNAKE_NAME}.txt").write_text("added\n")
+
+        dry_run = project.update(dry_run=True)
+        results = project.update()
+        kept = (project.path / "conflict").read_text()
+        again = project.update()
+        forced = project.update(force=True)
+
+    assert dry_run == results
+    assert results == {
+        "added": ["my_project.txt"],
+        "updated": ["changed"],
+        "conflict": ["conflict"],
+        "modified": ["edited"],
+        "removed": ["gone"],
+        "unchanged": ["same"],
+    }
+    assert (project.path / "changed").read_text() == "new My Project\n"
+    assert kept == "user edit\n"
+    assert sorted(again["unchanged"]) == ["changed", "my_project.txt", "same"]
+    assert again["removed"] == []
+    assert forced["updated"] == ["conflict"]
+    assert (project.path / "conflict").read_text() == "new My Project\n"
+
+
+class FlakyProject(Project):
+    """Project with a step that fails until it is fixed."""
+
+    STEPS = {**Project.STEPS, "flaky": ("install_all",)}
+
+    broken = True
+
+    def flaky(self):
+        if self.broken:
+            raise ProgramError("flaky step failed")
+
+
+@pytest.mark.parametrize("summary, expected", [
+    ("", ["flaky", "save_manifest"]),
+    ("Changed.", sorted(FlakyProject("x").scheduler.steps)),
+])
+def test_project_make_resume(tmp_path, monkeypatch, summary, expected):
+    """
+    GIVEN: a project whose make() failed at a step
+    WHEN: it is made again with resume set
+    THEN: only the failed step and the ones after it should run
+    AND: every step should run if the summary changed
+    AND: the journal should be removed once it succeeds
+    """
+    with pytest.raises(ProgramError):
+        FlakyProject("my-project", tmp_path).make()
+
+    ran = []
+    orig = Project.run_step
+
+    def run_step(self, name):
+        if not self.journal.completed(name, self.step_inputs[name]):
+            ran.append(name)
+        return orig(self, name)
+
+    monkeypatch.setattr(Project, "run_step", run_step)
+    monkeypatch.setattr(FlakyProject, "broken", False)
+
+    project = FlakyProject("my-project", tmp_path, summary=summary, resume=True)
+    project.make()
+
+    assert sorted(ran) == expected
+    assert all(x["status"] == "done" for x in project.journal.steps.values())
+    assert not project.journal.file.exists()
+
+
+def test_project_make_no_journal(tmp_path):
+    """
+    GIVEN: a project
+    WHEN: make() succeeds
+    THEN: no journal should be left in the project
+    """
+    project = Project("my-project", tmp_path)
+    project.make()
+
+    assert not project.journal.file.exists()
+    assert project.path.is_dir()
+
+
+def test_project_make_resume_not_started(tmp_path):
+    """
+    GIVEN: a directory that was not made by blueprint
+    WHEN: make() is called with resume set
+    THEN: a UserError should be raised
+    """
+    (tmp_path / "my-project").mkdir()
+
+    with pytest.raises(UserError, match="Nothing to resume"):
+        Project("my-project", tmp_path, resume=True).make()
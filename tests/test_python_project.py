@@ -5,6 +5,10 @@ from subprocess import run
 import pytest
 import toml
 
+from blueprint import AccessError
+from blueprint.lock_cache import LockCache
+from blueprint.manifest import Manifest
+from blueprint.project_factory import ProjectFactory
 from blueprint.python_project import PythonProject
 
 bp = breakpoint
@@ -36,12 +40,42 @@ def test_python_project_create(tmp_path):
     """
     WHEN: project.create is called
     THEN: A new project directory is created
+    AND: The package and tests directories exist
     AND: The pyproject.toml file exists
     """
     project = PythonProject("myproject", dest=tmp_path)
     project.create()
 
     assert project.path.is_dir()
+    assert (project.path / "myproject").is_dir()
+    assert (project.path / "tests").is_dir()
+    assert (project.path / "pyproject.toml").is_file()
+
+
+def test_python_project_create_exists(tmp_path):
+    """
+    GIVEN: the project directory already exists
+    WHEN: project.create is called
+    THEN: an AccessError is raised
+    """
+    (tmp_path / "myproject").mkdir()
+    project = PythonProject("myproject", dest=tmp_path)
+
+    with pytest.raises(AccessError):
+        project.create()
+
+
+def test_python_project_create_resume(tmp_path):
+    """
+    GIVEN: the project directory already exists
+    WHEN: project.create is called on a project with resume set
+    THEN: the project directory should be filled in
+    """
+    (tmp_path / "myproject" / "tests").mkdir(parents=True)
+    project = PythonProject("myproject", dest=tmp_path, resume=True)
+    project.create()
+
+    assert (project.path / "myproject").is_dir()
     assert (project.path / "pyproject.toml").is_file()
 
 
@@ -59,8 +93,6 @@ def test_python_pyproject_toml(tmp_path):
         license="MIT",
     )
     project.create()
-    project.setup_poetry_init()
-    project.setup_pyproject()
 
     with open(project.path/"pyproject.toml") as f:
         specs = toml.load(f)
@@ -70,12 +102,30 @@ def test_python_pyproject_toml(tmp_path):
     assert poetry["name"] == "my-pytest-project"
     assert poetry["description"] == "My pytest project."
     assert poetry["license"] == "MIT"
+    assert poetry["version"] == project.PROJECT_VERSION
     assert poetry["dependencies"]["python"] == ">=3.10.2"
     assert specs["tool"]["pytest"]["ini_options"]["testpaths"] == ["tests"]
     assert specs["tool"]["pytest"]["ini_options"]["addopts"] == "-vvx"
     assert specs["tool"]["black"]["line-length"] == "88"
 
 
+def test_python_pyproject_toml_unicode(tmp_path):
+    """
+    GIVEN: a summary with quotes and a character outside the BMP
+    WHEN: project.create is called
+    THEN: the pyproject.toml file should be valid TOML with that summary
+    """
+    tomllib = pytest.importorskip("tomllib")
+    summary = 'Rocket \U0001F680 "quoted"'
+    project = PythonProject("my proj", dest=tmp_path, summary=summary)
+    project.create()
+
+    specs = tomllib.loads(project.pyproject.read_text())
+
+    assert specs["tool"]["poetry"]["name"] == "my-proj"
+    assert specs["tool"]["poetry"]["description"] == summary
+
+
 def test_python_project_install_all(tmp_path):
     """
     GIVEN: a PythonProject object where create() has been called
@@ -179,29 +229,130 @@ def test_python_project_setup_poetry_use(tmp_path):
     )
 
 
-def test_python_project_poetry_init(tmp_path):
+def test_python_pyproject_toml_dev_dependencies(tmp_path):
     """
-    GIVEN: a PythonProject object where create() has been called
-    WHEN: project.setup_poetry_init() is called
-    THEN: the pyproject.toml should be good
+    WHEN: project.create is called
+    THEN: the pyproject.toml file should list the dev dependencies
+    AND: the sections should be in order
     """
-    project = PythonProject(
-        "my_pytest_project",
-        dest=tmp_path,
-        pyv="3.10.2",
-        summary="My pytest project.",
-        license="MIT",
+    project = PythonProject("my_pytest_project", dest=tmp_path)
+    project.create()
+
+    text = project.pyproject.read_text()
+    specs = toml.loads(text)
+    deps = specs["tool"]["poetry"]["group"]["dev"]["dependencies"]
+
+    assert list(deps) == project.DEV_DEPENDENCIES
+    assert text.index("[tool.poetry]") < text.index("[tool.pytest.ini_options]")
+    assert text.index("[tool.black]") < text.index("[build-system]")
+
+
+def test_python_project_setup_poetry_lock_cached(tmp_path, monkeypatch):
+    """
+    GIVEN: a cached lock file for the project's dependencies
+    WHEN: project.setup_poetry_lock() is called
+    THEN: the cached lock file should be used without running poetry lock
+    """
+    monkeypatch.setenv("BLUEPRINT_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(PythonProject, "poetry_version", "Poetry (version 1.8.3)")
+
+    project = PythonProject("my-pytest-project", dest=tmp_path)
+    project.create()
+
+    cache = LockCache()
+    orig = tmp_path / "orig.lock"
+    orig.write_text("# cached\n")
+    key = cache.key(
+        project.DEV_DEPENDENCIES, project.pyv_constraint, project.poetry_version
     )
+    cache.store(key, orig)
+
+    assert project.setup_poetry_lock() is None
+    assert project.lockfile.read_text() == "# cached\n"
+
+
+@pytest.mark.parametrize("config, expected", [
+    ("[user]\n\tname = Jo Doe\n\temail = jo@example.com\n", "Jo Doe <jo@example.com>"),
+    ("[user]\n\tname = Jo Doe\n", "Jo Doe"),
+    ("", ""),
+])
+def test_python_project_author(tmp_path, monkeypatch, config, expected):
+    """
+    GIVEN: a git config with or without the user name and email
+    WHEN: PythonProject.author is accessed
+    THEN: it should be the name and email, the name, or empty
+    """
+    gitconfig = tmp_path / "gitconfig"
+    gitconfig.write_text(config)
+    monkeypatch.setenv("GIT_CONFIG_GLOBAL", str(gitconfig))
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+    monkeypatch.chdir(tmp_path)
+
+    assert PythonProject("my project", tmp_path).author == expected
+
+
+def git_user(monkeypatch, path, name):
+    """Use a git config at path with the user name and email for name."""
+    path.write_text(f"[user]\n\tname = {name}\n\temail = {name}@example.com\n")
+    monkeypatch.setenv("GIT_CONFIG_GLOBAL", str(path))
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+    # away from the config of the repo the tests are run in
+    monkeypatch.chdir(path.parent)
+
+
+def test_python_project_update_author(tmp_path, monkeypatch):
+    """
+    GIVEN: a PythonProject made under one git user
+    WHEN: it is loaded and updated under another git user
+    THEN: no files should be updated
+    AND: the author should be the one it was made with
+    """
+    git_user(monkeypatch, tmp_path / "maker", "maker")
+    project = PythonProject("my-project", tmp_path)
     project.create()
-    res = project.setup_poetry_init()
+    project.install_all()
+    project.save_manifest()
+    pyproject = (project.path / "pyproject.toml").read_text()
 
-    with open(project.path/"pyproject.toml") as f:
-        specs = toml.load(f)
-        poetry = specs["tool"]["poetry"]
+    git_user(monkeypatch, tmp_path / "other", "other")
+    loaded = ProjectFactory.load(project.path)
+    results = loaded.update()
 
-    assert res.returncode == 0
-    assert project.pyproject.is_file()
-    assert poetry["name"] == "my-pytest-project"
-    assert poetry["description"] == "My pytest project."
-    assert poetry["license"] == "MIT"
-    assert poetry["dependencies"]["python"] == ">=3.10.2"
+    assert loaded.author == "maker <maker@example.com>"
+    assert results["added"] == results["updated"] == results["conflict"] == []
+    assert (project.path / "pyproject.toml").read_text() == pyproject
+    assert Manifest.load(project.path).substitutions["AUTHOR"] == loaded.author
+
+
+def test_python_project_author_no_git(tmp_path, monkeypatch):
+    """
+    GIVEN: git is not installed
+    WHEN: PythonProject.author is accessed
+    THEN: it should be empty
+    """
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+    assert PythonProject("my project", tmp_path).author == ""
+
+
+def test_python_project_setup(tmp_path, monkeypatch):
+    """
+    GIVEN: a PythonProject with its setup steps replaced by ones that are recorded
+    WHEN: project.setup() is called
+    THEN: every step in STEPS besides create and install_all should run
+    AND: each should run after the steps it depends on
+    """
+    called = []
+    names = set(PythonProject.STEPS) - {"create", "install_all"}
+    for name in names:
+        monkeypatch.setattr(
+            PythonProject, name, lambda self, name=name: called.append(name)
+        )
+
+    PythonProject("my project", tmp_path, wheelhouse=True).setup()
+
+    assert sorted(called) == sorted(names)
+    for name in called:
+        for required in PythonProject.STEPS[name]:
+            if required in names:
+                assert called.index(required) < called.index(name)
@@ -0,0 +1,66 @@
+import json
+
+from blueprint.manifest import DIRNAME, Manifest
+from blueprint.project import Project
+from blueprint.rollout import Rollout, discover
+
+
+def make_projects(dest, *names):
+    """Make a basic project for each name in dest and return their paths."""
+    paths = []
+    for name in names:
+        project = Project(name, dest=dest)
+        project.make()
+        paths.append(project.path)
+    return paths
+
+
+def outdate(path, file="README.md"):
+    """Make the manifest of project at path look like file's template changed."""
+    manifest = path / DIRNAME / Manifest.FILENAME
+    data = json.loads(manifest.read_text())
+    data["files"][file]["source"] = "0" * 64
+    manifest.write_text(json.dumps(data))
+
+
+def test_discover(tmp_path):
+    """
+    GIVEN: projects at different depths, one with a nested project inside it
+    WHEN: discover() is called with directories and glob patterns
+    THEN: each top level project should be found once
+    """
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    one, = make_projects(tmp_path / "a", "one")
+    two, = make_projects(tmp_path / "a" / "b", "two")
+    nested, = make_projects(one, "nested")
+    (tmp_path / "a" / ".venv").mkdir()
+    make_projects(tmp_path / "a" / ".venv", "hidden")
+
+    found = discover([tmp_path, str(tmp_path / "a" / "*"), tmp_path / "missing"])
+
+    assert found == [two, one]
+
+
+def test_rollout_run(tmp_path):
+    """
+    GIVEN: projects that are up to date, out of date, and edited by the user
+    WHEN: Rollout.run() is called
+    THEN: each project should get the matching status
+    """
+    current, outdated, edited, broken = make_projects(
+        tmp_path, "current", "outdated", "edited", "broken"
+    )
+    outdate(outdated)
+    outdate(edited)
+    (edited / "README.md").write_text("user edit\n")
+    (broken / DIRNAME / Manifest.FILENAME).write_text("{")
+
+    results = Rollout([current, outdated, edited, broken], jobs=2).run()
+
+    assert [res.status for res in results] == [
+        "skipped", "updated", "conflict", "failed"
+    ]
+    assert results[1].files["updated"] == ["README.md"]
+    assert results[2].files["conflict"] == ["README.md"]
+    assert "Invalid manifest" in results[3].error
+    assert (edited / "README.md").read_text() == "user edit\n"
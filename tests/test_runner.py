@@ -0,0 +1,126 @@
+import asyncio
+import sys
+from time import perf_counter
+
+import pytest
+
+from blueprint import ProgramError
+from blueprint.project import Project
+from blueprint.runner import LINE_LIMIT, AsyncRunner
+
+
+def python(code: str) -> list:
+    """Return a command that runs code with this Python."""
+    return [sys.executable, "-c", code]
+
+
+def test_async_runner_run():
+    """
+    GIVEN: an AsyncRunner
+    WHEN: a command that succeeds is run
+    THEN: its output should be returned
+    """
+    res = asyncio.run(AsyncRunner().run(python("print('hello')")))
+
+    assert res.returncode == 0
+    assert res.stdout == "hello\n"
+    assert res.stderr == ""
+
+
+def test_async_runner_run_failed():
+    """
+    GIVEN: an AsyncRunner
+    WHEN: a command that fails is run
+    THEN: a ProgramError should be raised with the exit code and stderr
+    """
+    code = "import sys; sys.stderr.write('oops'); sys.exit(3)"
+    with pytest.raises(ProgramError) as excinfo:
+        asyncio.run(AsyncRunner().run(python(code)))
+
+    assert "[3]" in excinfo.value.message
+    assert "oops" in excinfo.value.message
+
+
+def test_async_runner_run_timeout():
+    """
+    GIVEN: an AsyncRunner with a timeout
+    WHEN: a command that takes longer than the timeout is run
+    THEN: a ProgramError should be raised without waiting for it to finish
+    """
+    start = perf_counter()
+    with pytest.raises(ProgramError, match="Timed out"):
+        asyncio.run(AsyncRunner(timeout=0.2).run(python("import time; time.sleep(10)")))
+
+    assert perf_counter() - start < 5
+
+
+def test_async_runner_run_long_line():
+    """
+    GIVEN: an AsyncRunner
+    WHEN: a command writes a line longer than LINE_LIMIT and keeps running
+    THEN: a ProgramError should be raised without waiting for it to finish
+    """
+    code = (
+        f"import sys, time; sys.stdout.write('x' * {LINE_LIMIT + 1}); "
+        "sys.stdout.flush(); time.sleep(10)"
+    )
+    start = perf_counter()
+    with pytest.raises(ProgramError, match="longer than"):
+        asyncio.run(AsyncRunner().run(python(code)))
+
+    assert perf_counter() - start < 5
+
+
+def test_async_runner_run_cancelled():
+    """
+    GIVEN: a command running in an AsyncRunner task
+    WHEN: the task is cancelled
+    THEN: the command should be killed
+    """
+    async def main():
+        runner = AsyncRunner()
+        task = asyncio.create_task(runner.run(python("import time; time.sleep(10)")))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    start = perf_counter()
+    asyncio.run(main())
+
+    assert perf_counter() - start < 5
+
+
+def test_async_runner_run_on_line():
+    """
+    GIVEN: an AsyncRunner with an on_line callback
+    WHEN: a command writes to stdout and stderr
+    THEN: each line should be passed to the callback with its stream name
+    """
+    lines = []
+    code = "import sys; print('a'); print('b'); sys.stderr.write('c\\n')"
+    asyncio.run(AsyncRunner(on_line=lambda *x: lines.append(x)).run(python(code)))
+
+    assert ("stdout", "a\n") in lines
+    assert ("stdout", "b\n") in lines
+    assert ("stderr", "c\n") in lines
+
+
+def test_project_arun(tmp_path):
+    """
+    GIVEN: a Project object
+    WHEN: several commands are awaited at the same time with project.arun()
+    THEN: they should run concurrently in the project directory
+    """
+    project = Project("myproject", dest=tmp_path)
+    project.create()
+    code = "import os, time; time.sleep(0.5); print(os.getcwd())"
+
+    async def main():
+        return await asyncio.gather(*(project.arun(python(code)) for _ in range(4)))
+
+    start = perf_counter()
+    results = asyncio.run(main())
+
+    assert perf_counter() - start < 1.5
+    assert {res.stdout.strip() for res in results} == {str(project.path)}
@@ -1,5 +1,6 @@
 import pytest
 
+from blueprint import ProgramError
 from blueprint.shell_command import ShellCommand
 
 bp = breakpoint
@@ -81,3 +82,29 @@ def test_shell_command_():
     WHEN: ...
     THEN: ...
     """
+
+
+def test_shell_command_run():
+    """
+    GIVEN: A ShellCommand object with a command that succeeds
+    WHEN: .run() is called
+    THEN: it should return the result with the captured output
+    """
+    cmd = ShellCommand("echo", "hello")
+
+    assert cmd.run().stdout == "hello\n"
+
+
+def test_shell_command_run_error():
+    """
+    GIVEN: A ShellCommand object with a command that fails
+    WHEN: .run() is called
+    THEN: a ProgramError should be raised
+    """
+    cmd = ShellCommand("sh", "-c", "echo oops >&2; exit 3")
+
+    with pytest.raises(ProgramError) as info:
+        cmd.run()
+
+    assert "[3]" in info.value.message
+    assert "oops" in info.value.message
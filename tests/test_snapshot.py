@@ -0,0 +1,138 @@
+from os import utime
+
+import pytest
+
+from blueprint import AccessError
+from blueprint.project import Project
+from blueprint.python_project import PythonProject
+from blueprint.snapshot import SENTINEL_NAME, SnapshotCache
+from blueprint.sources import SourceIndex
+from blueprint.template import variables
+from blueprint.venv_cache import rename_prompt
+
+
+class SnapshotProject(Project):
+    """Project with its own sources so that tests can change them."""
+
+
+def make_sources(path):
+    """Write a SOURCES dir with templated paths and contents."""
+    (path / "${SNAKE_NAME}").mkdir(parents=True)
+    (path / "${SNAKE_NAME}" / "__init__.py").write_text('"""${TITLE_NAME}."""\n')
+    (path / "LICENSE").write_text("${LICENSE}\n")
+    (path / "README.md").write_text('# ${DASH_NAME}\n\nsummary = ${SUMMARY|toml}\n')
+    (path / "logo.png").write_bytes(b"\x89PNG\0")
+    return path
+
+
+def test_variables():
+    """
+    GIVEN: template text with variables, filters, escapes and block tags
+    WHEN: variables() is called
+    THEN: the names of the variables it uses should be returned
+    """
+    text = "$$ESCAPED $A ${B|upper}\n{% if C %}\n{% for X in D %}${X}{% endfor %}\n"
+    text += "{% endif %}\n"
+
+    assert variables(text) == {"A", "B", "C", "D", "X"}
+
+
+def test_snapshot_make(tmp_path, monkeypatch):
+    """
+    GIVEN: two projects with different names and summaries but the same options
+    WHEN: both are made from a snapshot
+    THEN: the snapshot should only be baked once
+    AND: paths and contents should use the names of each project
+    """
+    monkeypatch.setattr(SnapshotProject, "SOURCES", make_sources(tmp_path / "src"))
+    bakes = []
+    bake = SnapshotCache.bake
+    monkeypatch.setattr(
+        SnapshotCache, "bake", lambda *args: bakes.append(args) or bake(*args)
+    )
+
+    first = SnapshotProject(
+        "first-project", tmp_path, summary='Say "hi"', license="MIT", snapshot=True
+    )
+    first.make()
+    second = SnapshotProject(
+        "second_project", tmp_path, summary="Other", license="MIT", snapshot=True
+    )
+    second.make()
+
+    assert len(bakes) == 1
+    assert (second.path / ".git").is_dir()
+    assert (second.path / "second_project" / "__init__.py").read_text() == (
+        '"""Second Project."""\n'
+    )
+    assert (second.path / "README.md").read_text() == (
+        '# second-project\n\nsummary = "Other"\n'
+    )
+    assert (first.path / "README.md").read_text() == (
+        '# first-project\n\nsummary = "Say \\"hi\\""\n'
+    )
+    assert (second.path / "LICENSE").read_text() == "MIT\n"
+    assert (second.path / "logo.png").read_bytes() == b"\x89PNG\0"
+    assert not list(second.path.rglob(f"*{SENTINEL_NAME[:10]}*"))
+
+
+def test_snapshot_key(tmp_path, monkeypatch):
+    """
+    GIVEN: projects made from the same sources
+    WHEN: the snapshot key is computed
+    THEN: it should only change when an option other than the names changes
+    AND: when a source file changes
+    """
+    sources = make_sources(tmp_path / "src")
+    monkeypatch.setattr(SnapshotProject, "SOURCES", sources)
+    cache = SnapshotCache()
+
+    key = cache.key(SnapshotProject("one", tmp_path, summary="a", license="MIT"))
+
+    two = SnapshotProject("two", tmp_path, summary="b", license="MIT")
+    assert key == cache.key(two)
+    assert key != cache.key(SnapshotProject("one", tmp_path, license="BSD"))
+
+    SourceIndex.clear()
+    (sources / "LICENSE").write_text("changed ${LICENSE}\n")
+    utime(sources / "LICENSE", (1, 1))
+
+    assert key != cache.key(SnapshotProject("one", tmp_path, license="MIT"))
+
+
+def test_snapshot_restore_exists(tmp_path, monkeypatch):
+    """
+    GIVEN: a python project directory that already exists
+    WHEN: the project is restored from a snapshot
+    THEN: an AccessError is raised before anything is copied
+    """
+    monkeypatch.setattr(SnapshotCache, "get", lambda *args: pytest.fail("copied"))
+    (tmp_path / "myproject").mkdir()
+    project = PythonProject("myproject", tmp_path, snapshot=True)
+
+    with pytest.raises(AccessError):
+        project.restore_snapshot()
+
+
+def test_snapshot_rename_prompt(tmp_path):
+    """
+    GIVEN: a venv restored from a snapshot with the placeholder name in its prompt
+    WHEN: rename_prompt() is called
+    THEN: the prompt should use the project name in pyvenv.cfg and activate scripts
+    AND: hardlinked copies in the snapshot should not be modified
+    """
+    venv = tmp_path / ".venv"
+    (venv / "bin").mkdir(parents=True)
+    (venv / "pyvenv.cfg").write_text(f"prompt = {SENTINEL_NAME}-py3.10\n")
+    activate = venv / "bin" / "activate"
+    activate.write_text(f'VIRTUAL_ENV_PROMPT="{SENTINEL_NAME}-py3.10"\n')
+    orig = tmp_path / "activate"
+    orig.hardlink_to(activate)
+
+    project = Project("my-project", tmp_path)
+    metadata = {"names": {"DASH_NAME": SENTINEL_NAME}}
+    rename_prompt(venv, SnapshotCache.renames(metadata, project))
+
+    assert (venv / "pyvenv.cfg").read_text() == "prompt = my-project-py3.10\n"
+    assert activate.read_text() == 'VIRTUAL_ENV_PROMPT="my-project-py3.10"\n'
+    assert orig.read_text() == f'VIRTUAL_ENV_PROMPT="{SENTINEL_NAME}-py3.10"\n'
@@ -0,0 +1,143 @@
+from os import utime
+
+import pytest
+
+from blueprint.project import Project
+from blueprint.python_project import PythonProject
+from blueprint.sources import SourceIndex, SourceIndexCache, scan
+
+bp = breakpoint
+
+
+@pytest.fixture
+def layers(tmp_path):
+    """Create a base layer and a layer that overrides it."""
+    base, top = tmp_path / "base", tmp_path / "top"
+    (base / "docs").mkdir(parents=True)
+    (base / "docs" / "index.md").write_text("base")
+    (base / "README.md").write_text("base")
+    top.mkdir()
+    (top / "README.md").write_text("top")
+    (top / "setup.cfg").write_text("top")
+    return top, base
+
+
+def test_source_index(layers):
+    index = SourceIndex(layers)
+    assert index
+
+
+def test_source_index_scan(layers):
+    """
+    GIVEN: a source directory
+    WHEN: scan() is called
+    THEN: it should return every file and directory under it
+    AND: whether each file needs to be rendered
+    AND: the mtimes of the directories
+    """
+    top, base = layers
+    (base / "docs" / "index.md").write_text("# ${TITLE_NAME}")
+    entries, mtimes = scan(base)
+
+    assert entries == {
+        "docs": (True, False),
+        "docs/index.md": (False, True),
+        "README.md": (False, False),
+    }
+    assert set(mtimes) == {".", "docs", "docs/index.md", "README.md"}
+
+
+def test_source_index_resolve(layers):
+    """
+    GIVEN: a SourceIndex with two layers
+    WHEN: .resolve() is called
+    THEN: it should return the source from the first layer that has it
+    """
+    top, base = layers
+    index = SourceIndex(layers)
+
+    assert index.resolve("README.md") == top / "README.md"
+    assert index.resolve("setup.cfg") == top / "setup.cfg"
+    assert index.resolve("docs/index.md") == base / "docs" / "index.md"
+    assert index.resolve("docs/") == base / "docs"
+    assert index.is_dir("docs")
+    assert index.resolve("missing") is None
+
+
+def test_source_index_listing(layers):
+    """
+    GIVEN: a SourceIndex with two layers
+    WHEN: .listing is accessed
+    THEN: it should list every path in either layer once
+    """
+    index = SourceIndex(layers)
+
+    assert index.listing == ["README.md", "docs", "docs/index.md", "setup.cfg"]
+
+
+def test_source_index_persist(layers):
+    """
+    GIVEN: a SourceIndex was built with persist=True
+    WHEN: a layer has not changed
+    THEN: the saved scan should be used
+    WHEN: a file is added to the layer
+    THEN: the saved scan should be out of date
+    """
+    top, base = layers
+    SourceIndex(layers, persist=True)
+
+    assert SourceIndexCache().load(base) == {
+        "docs": (True, False),
+        "docs/index.md": (False, False),
+        "README.md": (False, False),
+    }
+
+    (base / "docs" / "new.md").touch()
+
+    assert SourceIndexCache().load(base) is None
+    assert SourceIndex(layers, persist=True).resolve("docs/new.md")
+
+
+def test_source_index_persist_modified(layers):
+    """
+    GIVEN: a SourceIndex was built with persist=True
+    WHEN: a template variable is added to a file in a layer
+    THEN: the file should need to be rendered in a new index
+    """
+    top, base = layers
+    SourceIndex(layers, persist=True)
+    readme = base / "docs" / "index.md"
+    readme.write_text("# ${TITLE_NAME}")
+    stamp = readme.stat().st_mtime + 10
+    utime(readme, (stamp, stamp))
+
+    assert SourceIndex(layers, persist=True).needs_render("docs/index.md")
+
+
+def test_source_index_get():
+    """
+    WHEN: SourceIndex.get() is called twice with the same layers
+    THEN: the same index should be returned
+    """
+    assert SourceIndex.get(Project.layers()) is SourceIndex.get(Project.layers())
+
+
+def test_project_layers():
+    """
+    WHEN: .layers() is called on a Project class
+    THEN: it should return the SOURCES for that class and its parents
+    """
+    assert Project.layers() == (Project.SOURCES,)
+    assert PythonProject.layers() == (PythonProject.SOURCES, Project.SOURCES)
+
+
+def test_project_source_index_listing():
+    """
+    WHEN: PythonProject.source_index().listing is accessed
+    THEN: it should list the files from both python and bare sources
+    """
+    listing = PythonProject.source_index().listing
+
+    assert "README.md" in listing
+    assert "setup.cfg" in listing
+    assert "${SNAKE_NAME}/object.py" in listing
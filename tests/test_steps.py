@@ -0,0 +1,112 @@
+from threading import Event
+
+import pytest
+
+from blueprint import ProgramError
+from blueprint.steps import Scheduler
+
+bp = breakpoint
+
+
+def test_scheduler():
+    scheduler = Scheduler()
+    assert scheduler
+    scheduler.run(lambda name: None)
+
+
+def test_scheduler_levels():
+    """
+    GIVEN: a Scheduler with steps that depend on each other
+    WHEN: .levels is accessed
+    THEN: steps should be grouped by the round in which they can run
+    """
+    scheduler = Scheduler({
+        "a": (),
+        "b": ("a",),
+        "c": ("a",),
+        "d": ("b", "c"),
+    })
+
+    assert scheduler.levels == [["a"], ["b", "c"], ["d"]]
+
+
+def test_scheduler_explain():
+    """
+    GIVEN: a Scheduler with steps that depend on each other
+    WHEN: .explain() is called
+    THEN: it should return a line for each step with its dependencies
+    """
+    scheduler = Scheduler({"a": (), "b": ("a",)})
+
+    assert scheduler.explain() == ["1. a", "2. b <- a"]
+
+
+@pytest.mark.parametrize(["steps", "given"], [
+    ({"a": ("missing",)}, "a step that requires an unknown step"),
+    ({"a": ("b",), "b": ("a",)}, "steps that require each other"),
+])
+def test_scheduler_validate_invalid(steps, given):
+    """
+    GIVEN: an invalid step graph
+    WHEN: .validate() is called
+    THEN: a ProgramError should be raised
+    """
+    with pytest.raises(ProgramError):
+        Scheduler(steps).validate()
+
+
+def test_scheduler_run_order():
+    """
+    GIVEN: a Scheduler with steps that depend on each other
+    WHEN: .run() is called
+    THEN: each step should be called after the steps it depends on
+    """
+    calls = []
+    scheduler = Scheduler({
+        "d": ("b", "c"),
+        "c": ("a",),
+        "b": ("a",),
+        "a": (),
+    })
+
+    scheduler.run(calls.append)
+
+    assert sorted(calls) == ["a", "b", "c", "d"]
+    assert calls[0] == "a"
+    assert calls[-1] == "d"
+
+
+def test_scheduler_run_concurrent():
+    """
+    GIVEN: a Scheduler with two independent steps
+    WHEN: .run() is called
+    THEN: the steps should run at the same time
+    """
+    started = {"a": Event(), "b": Event()}
+
+    def call(name):
+        started[name].set()
+        other = "b" if name == "a" else "a"
+        assert started[other].wait(timeout=5), f"{other} did not run concurrently"
+
+    Scheduler({"a": (), "b": ()}).run(call)
+
+
+def test_scheduler_run_error():
+    """
+    GIVEN: a Scheduler where a step raises an exception
+    WHEN: .run() is called
+    THEN: the exception should be raised
+    AND: steps that depend on the failed step should not be called
+    """
+    calls = []
+
+    def call(name):
+        calls.append(name)
+        if name == "a":
+            raise ProgramError("a failed")
+
+    with pytest.raises(ProgramError):
+        Scheduler({"a": (), "b": ("a",)}).run(call)
+
+    assert calls == ["a"]
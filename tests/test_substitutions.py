@@ -0,0 +1,138 @@
+import pytest
+
+from blueprint.project import Project
+from blueprint.python_project import PythonProject
+from blueprint.substitutions import Substitutions
+
+
+def test_substitutions_lazy():
+    """
+    GIVEN: a Substitutions mapping
+    WHEN: a variable is looked up more than once
+    THEN: its function should only be called the first time
+    AND: other variables should not be computed
+    """
+    calls = []
+
+    def count(project):
+        calls.append(project)
+        return len(calls)
+
+    subs = Substitutions("project", {"A": count, "B": lambda p: 1 / 0})
+
+    assert subs["A"] == 1
+    assert subs["A"] == 1
+    assert calls == ["project"]
+    assert list(subs) == ["A", "B"]
+    assert len(subs) == 2
+
+
+def test_substitutions_missing():
+    """
+    GIVEN: a Substitutions mapping
+    WHEN: a variable that was not registered is looked up
+    THEN: KeyError should be raised
+    """
+    subs = Substitutions(None, {})
+
+    with pytest.raises(KeyError):
+        subs["A"]
+
+    assert subs.get("A") is None
+
+
+def test_project_substitutions():
+    """
+    GIVEN: a Project object
+    WHEN: .substitutions is accessed
+    THEN: it should have the values of the project
+    """
+    project = Project("my-project", summary="A project.")
+
+    assert dict(project.substitutions) == {
+        "DASH_NAME": "my-project",
+        "TITLE_NAME": "My Project",
+        "SNAKE_NAME": "my_project",
+        "PASCAL_NAME": "MyProject",
+        "VERSION": Project.PROJECT_VERSION,
+        "SUMMARY": "A project.",
+        "LICENSE": "",
+    }
+    assert project.substitutions is project.substitutions
+
+
+def test_project_substitutions_name_changed():
+    """
+    GIVEN: a Project object whose substitutions were used
+    WHEN: the name is changed
+    THEN: the substitutions should use the new name
+    """
+    project = Project("my-project")
+    assert project.substitutions["DASH_NAME"] == "my-project"
+
+    project.name = "other_project"
+
+    assert project.substitutions["DASH_NAME"] == "other-project"
+
+
+@pytest.mark.parametrize("attr, var, value", [
+    ("summary", "SUMMARY", "Changed."),
+    ("license", "LICENSE", "MIT"),
+    ("pyv", "PYV", "3.12.1"),
+    ("pyv_constraint", "PYV_CONSTRAINT", ">=3.12"),
+])
+def test_project_substitutions_changed(tmp_path, attr, var, value):
+    """
+    GIVEN: a PythonProject object whose substitutions and step hashes were used
+    WHEN: an attribute that a template variable comes from is changed
+    THEN: the substitutions should use the new value
+    AND: the step hashes should change
+    """
+    project = PythonProject("my-project", tmp_path)
+    assert project.substitutions[var] != value
+    inputs = project.step_inputs
+
+    setattr(project, attr, value)
+
+    assert project.substitutions[var] == value
+    assert project.step_inputs != inputs
+
+
+def test_project_variable():
+    """
+    GIVEN: a Project subclass
+    WHEN: a variable is registered with .variable()
+    THEN: it should be in the substitutions of that class and its subclasses
+    AND: not in those of its parent classes
+    """
+    class MyProject(Project):
+        pass
+
+    class SubProject(MyProject):
+        pass
+
+    @MyProject.variable("UPPER_NAME")
+    def upper_name(project):
+        return project.name.upper()
+
+    SubProject.variable("DASH_NAME", lambda project: "overridden")
+
+    assert MyProject("a-b").substitutions["UPPER_NAME"] == "A-B"
+    assert SubProject("a-b").substitutions["UPPER_NAME"] == "A-B"
+    assert SubProject("a-b").substitutions["DASH_NAME"] == "overridden"
+    assert MyProject("a-b").substitutions["DASH_NAME"] == "a-b"
+    assert "UPPER_NAME" not in Project("a-b").substitutions
+    assert "UPPER_NAME" not in Project.VARIABLES
+
+
+def test_python_project_substitutions():
+    """
+    GIVEN: a PythonProject object
+    WHEN: .substitutions is accessed
+    THEN: it should have the Project variables and the Python ones
+    """
+    project = PythonProject("my-project", pyv="3.11.1")
+
+    assert set(Project.VARIABLES) < set(project.substitutions)
+    assert project.substitutions["PYV"] == "3.11.1"
+    assert project.substitutions["DEV_DEPENDENCIES"] == PythonProject.DEV_DEPENDENCIES
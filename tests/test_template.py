@@ -0,0 +1,278 @@
+import tracemalloc
+from string import Template as StringTemplate
+
+import pytest
+
+from blueprint import ProgramError
+from blueprint.template import Template, TemplateCache, render, render_file
+
+bp = breakpoint
+
+
+def test_template():
+    template = Template("")
+    assert template
+    assert template.render({}) == ""
+
+
+@pytest.mark.parametrize("text", [
+    "${NAME} is ${AGE}",
+    "$NAME is $AGE years",
+    "costs $$5 for ${NAME}",
+    "${MISSING} and $MISSING stay",
+    "a lone $ and $1 and ${ stay",
+    "${NAME}${NAME}$NAME_x",
+])
+def test_template_safe_substitute_compat(text):
+    """
+    GIVEN: a template that only uses string.Template syntax
+    WHEN: it is rendered
+    THEN: the result should be the same as string.Template.safe_substitute()
+    """
+    mapping = {"NAME": "Joe", "AGE": 42}
+    expected = StringTemplate(text).safe_substitute(mapping)
+
+    assert render(text, mapping) == expected
+
+
+def test_template_filter():
+    """
+    GIVEN: a template variable with a filter
+    WHEN: it is rendered
+    THEN: the filter should be applied to the value
+    """
+    text = "name = ${NAME|toml} ${NAME|upper}"
+
+    assert render(text, {"NAME": 'say "hi"'}) == 'name = "say \\"hi\\"" SAY "HI"'
+
+
+@pytest.mark.parametrize("value", [
+    'Rocket \U0001F680 "quoted"',
+    "back\\slash\nnew line\ttab\x00\x7f",
+    "caf\u00e9",
+])
+def test_template_filter_toml(value):
+    """
+    GIVEN: a value with quotes, control characters or characters outside the BMP
+    WHEN: it is rendered with the toml filter
+    THEN: it should be a TOML string that reads back as the same value
+    """
+    # toml accepts the surrogate pairs that tomllib (Python 3.11+) rejects
+    tomllib = pytest.importorskip("tomllib")
+    text = render("x = ${VALUE|toml}", {"VALUE": value})
+
+    assert tomllib.loads(text) == {"x": value}
+
+
+@pytest.mark.parametrize(["value", "expected"], [
+    ("x", "yes"),
+    ("", "no"),
+    (None, "no"),
+])
+def test_template_if(value, expected):
+    """
+    GIVEN: a template with an if/else block
+    WHEN: it is rendered
+    THEN: the block for the truthiness of the value should be included
+    """
+    text = "{% if VAR %}yes{% else %}no{% endif %}"
+
+    assert render(text, {"VAR": value}) == expected
+
+
+def test_template_if_not_missing():
+    """
+    GIVEN: a template with an if not block for a variable that is missing
+    WHEN: it is rendered
+    THEN: the block should be included
+    """
+    assert render("{% if not VAR %}missing{% endif %}", {}) == "missing"
+
+
+def test_template_for():
+    """
+    GIVEN: a template with a for loop on lines by themselves
+    WHEN: it is rendered
+    THEN: the loop body should be repeated for each item
+    AND: the block tags should not leave blank lines
+    """
+    text = (
+        "[deps]\n"
+        "{% for DEP in DEPS %}\n"
+        '${DEP} = "*"\n'
+        "{% endfor %}\n"
+        "end\n"
+    )
+
+    assert render(text, {"DEPS": ["a", "b"]}) == '[deps]\na = "*"\nb = "*"\nend\n'
+
+
+@pytest.mark.parametrize("text", [
+    "{% if X %}",
+    "{% endif %}",
+    "{% for X in Y %}{% endif %}",
+    "{% else %}",
+])
+def test_template_invalid(text):
+    """
+    GIVEN: an invalid template
+    WHEN: it is compiled
+    THEN: a ProgramError should be raised
+    """
+    with pytest.raises(ProgramError):
+        Template(text)
+
+
+@pytest.mark.parametrize("text", [
+    "${X|nope} stays",
+    "{% while X %}stays{% endwhile %}",
+    "{% if X %}${X|nope}{% endif %}",
+])
+def test_template_unknown_passed_through(text):
+    """
+    GIVEN: a template with an unknown filter or tag
+    WHEN: it is rendered
+    THEN: the unknown filter or tag should be left as-is, like safe_substitute()
+    """
+    expected = text.replace("{% if X %}", "").replace("{% endif %}", "")
+
+    assert render(text, {"X": "x"}) == expected
+    assert Template(text).render({"X": "x"}) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "no variables",
+    "${X} and $X and $$ and {%% and ${X|upper} and ${Y}",
+    "{% if X %}${X}{% endif %}",
+])
+def test_render_direct(monkeypatch, text):
+    """
+    GIVEN: a template shorter than DIRECT_SIZE
+    WHEN: render() is called
+    THEN: it should only be compiled if it has block tags
+    AND: it should render the same as a compiled Template
+    """
+    monkeypatch.setattr(Template, "_compiled", type(Template._compiled)())
+
+    assert render(text, {"X": "x"}) == Template(text).render({"X": "x"})
+    assert bool(Template._compiled) == ("{% if" in text)
+
+
+def test_template_get():
+    """
+    WHEN: Template.get() is called twice with the same text
+    THEN: the template should only be compiled once
+    """
+    assert Template.get("${X}") is Template.get("${X}")
+
+
+def test_template_get_not_persisted(monkeypatch):
+    """
+    WHEN: Template.get() is called without persist
+    THEN: the compiled template should not be saved in the TemplateCache
+    """
+    template = Template.get("not saved ${NAME}")
+
+    assert TemplateCache().load(template.key) is None
+
+
+def test_template_get_bounded(monkeypatch):
+    """
+    GIVEN: Template.get() keeps at most MAX_COMPILED templates
+    WHEN: more templates than that are compiled
+    THEN: the least recently used should be dropped
+    """
+    monkeypatch.setattr(Template, "MAX_COMPILED", 2)
+    monkeypatch.setattr(Template, "_compiled", type(Template._compiled)())
+
+    first = Template.get("one ${X}")
+    Template.get("two ${X}")
+    assert Template.get("one ${X}") is first
+    Template.get("three ${X}")
+
+    assert len(Template._compiled) == 2
+    assert Template.get("one ${X}") is first
+    assert Template.get("two ${X}").text == "two ${X}"
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("{%% if x %}{{ x }}{%% endif %}", "{% if x %}{{ x }}{% endif %}"),
+    ("  {%% block body %}\n${X}\n", "  {% block body %}\nx\n"),
+    ("{%% raw %}{% if X %}${X}{% endif %}", "{% raw %}x"),
+])
+def test_template_escaped_tag(text, expected):
+    """
+    GIVEN: a template with {%% escapes, like one that renders a Jinja template
+    WHEN: it is rendered
+    THEN: each {%% should be a literal {%
+    """
+    assert render(text, {"X": "x"}) == expected
+    assert Template(text).render({"X": "x"}) == expected
+
+
+def test_template_persist():
+    """
+    GIVEN: a Template created with persist=True
+    WHEN: another Template is created with the same text
+    THEN: the compiled code should be loaded from the TemplateCache
+    """
+    template = Template("hello ${NAME}", persist=True)
+
+    assert TemplateCache().load(template.key) is not None
+    assert Template("hello ${NAME}", persist=True).render({"NAME": "x"}) == "hello x"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 8, 13])
+def test_render_file_chunks(tmp_path, chunk_size):
+    """
+    GIVEN: a template file with variables, filters and escapes
+    WHEN: render_file() is called with a chunk size smaller than the file
+    THEN: tokens split between chunks should be rendered the same as render()
+    """
+    text = "$$A ${A} $A$$ ${A|upper}-$AB {$A}\n$$$A $\n${B}$"
+    src, dest = tmp_path / "src.txt", tmp_path / "dest.txt"
+    src.write_text(text)
+    mapping = {"A": "a", "AB": "ab"}
+
+    render_file(src, dest, mapping, chunk_size=chunk_size)
+
+    assert dest.read_text() == render(text, mapping)
+
+
+def test_render_file_block_tags(tmp_path):
+    """
+    GIVEN: a large template file with block tags
+    WHEN: render_file() is called
+    THEN: it should be rendered in memory the same as render()
+    """
+    text = "x ${A}\n" * 10 + "{% if A %}\nyes\n{% endif %}\n" + "$A\n" * 10
+    src, dest = tmp_path / "src.txt", tmp_path / "dest.txt"
+    src.write_text(text)
+
+    render_file(src, dest, {"A": "a"}, chunk_size=7)
+
+    assert dest.read_text() == render(text, {"A": "a"})
+
+
+def test_render_file_memory(tmp_path):
+    """
+    GIVEN: a template file that is much larger than the chunk size
+    WHEN: render_file() is called
+    THEN: peak memory should stay close to the chunk size
+    """
+    line = "value = ${SNAKE_NAME} $$ ${TITLE_NAME|toml}\n"
+    src, dest = tmp_path / "src.txt", tmp_path / "dest.txt"
+    with open(src, "w") as fh:
+        for _ in range(50):
+            fh.write(line * 500)
+    mapping = {"SNAKE_NAME": "my_project", "TITLE_NAME": "My Project"}
+
+    tracemalloc.start()
+    render_file(src, dest, mapping, chunk_size=16 * 1024)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert src.stat().st_size > 1024 * 1024
+    assert peak < 512 * 1024
+    with open(dest) as fh:
+        assert fh.readline() == 'value = my_project $ "My Project"\n'
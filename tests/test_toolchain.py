@@ -0,0 +1,162 @@
+import sys
+from os import environ, utime
+from subprocess import Popen
+from threading import Event, Thread
+
+import pytest
+
+from blueprint import ROOT
+from blueprint.toolchain import LookupCache, Toolchain
+
+bp = breakpoint
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Use a temp dir for the on-disk caches."""
+    monkeypatch.setenv("BLUEPRINT_CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+def test_toolchain():
+    toolchain = Toolchain()
+    assert toolchain
+    assert toolchain.which("sh")
+
+
+def test_toolchain_lookup_memoized():
+    """
+    GIVEN: a Toolchain object
+    WHEN: .lookup() is called twice with the same key
+    THEN: the lookup function should only be called once
+    """
+    calls = []
+
+    def find():
+        calls.append(1)
+        return "value", []
+
+    toolchain = Toolchain(persist=False)
+
+    assert toolchain.lookup("key", find) == "value"
+    assert toolchain.lookup("key", find) == "value"
+    assert len(calls) == 1
+
+
+def test_toolchain_lookup_memo_stale(tmp_path):
+    """
+    GIVEN: a memoized lookup
+    WHEN: a path the value depends on has been modified, like a reinstall
+    THEN: it should be looked up again
+    AND: the paths it depends on should be listed
+    """
+    dep = tmp_path / "dep"
+    dep.touch()
+    toolchain = Toolchain(persist=False)
+    toolchain.lookup("key", lambda: ("first", [dep]))
+
+    assert toolchain.lookup("key", lambda: ("second", [dep])) == "first"
+    assert toolchain.paths() == [str(dep)]
+
+    stamp = dep.stat().st_mtime + 10
+    utime(dep, (stamp, stamp))
+
+    assert toolchain.lookup("key", lambda: ("second", [dep])) == "second"
+
+
+def test_toolchain_which_path(tmp_path, monkeypatch):
+    """
+    GIVEN: a memoized which() lookup
+    WHEN: $PATH changes, like in a command sent to the daemon
+    THEN: the program should be looked up on the new $PATH
+    """
+    for name in ("one", "two"):
+        (tmp_path / name).mkdir()
+        exe = tmp_path / name / "prog"
+        exe.write_text("#!/bin/sh\n")
+        exe.chmod(0o755)
+
+    toolchain = Toolchain(persist=False)
+    monkeypatch.setenv("PATH", str(tmp_path / "one"))
+    assert toolchain.which("prog") == str(tmp_path / "one" / "prog")
+
+    monkeypatch.setenv("PATH", str(tmp_path / "two"))
+    assert toolchain.which("prog") == str(tmp_path / "two" / "prog")
+
+
+def test_toolchain_lookup_parallel():
+    """
+    GIVEN: a lookup that waits for another lookup of a different key
+    WHEN: both are looked up in different threads
+    THEN: they should run at the same time instead of one after the other
+    """
+    toolchain = Toolchain(persist=False)
+    entered, done = Event(), Event()
+    results = []
+
+    def slow():
+        entered.set()
+        return done.wait(timeout=5), []
+
+    def fast():
+        done.set()
+        return "fast", []
+
+    thread = Thread(target=lambda: results.append(toolchain.lookup("slow", slow)))
+    thread.start()
+    entered.wait(timeout=5)
+    toolchain.lookup("fast", fast)
+    thread.join()
+
+    assert results == [True]
+
+
+def test_lookup_cache_set_processes(cache_dir):
+    """
+    GIVEN: several processes
+    WHEN: each saves a different lookup at the same time
+    THEN: all of them should be saved
+    """
+    code = (
+        "import sys; from blueprint.toolchain import LookupCache; "
+        "[LookupCache().set(f'{sys.argv[1]}-{i}', i, []) for i in range(20)]"
+    )
+    env = {**environ, "PYTHONPATH": str(ROOT)}
+    procs = [Popen([sys.executable, "-c", code, str(n)], env=env) for n in range(4)]
+    assert all(proc.wait(timeout=60) == 0 for proc in procs)
+
+    assert len(LookupCache().load()) == 80
+
+
+def test_toolchain_lookup_persist(cache_dir, tmp_path):
+    """
+    GIVEN: a lookup was saved to disk by a Toolchain with persist=True
+    WHEN: .lookup() is called by another Toolchain
+    THEN: the saved value should be returned
+    WHEN: a path the value depends on has been modified
+    THEN: it should be looked up again
+    """
+    dep = tmp_path / "dep"
+    dep.touch()
+
+    Toolchain(persist=True).lookup("key", lambda: ("first", [dep]))
+
+    assert Toolchain(persist=True).lookup("key", lambda: ("second", [])) == "first"
+    assert LookupCache().get("key") == "first"
+
+    stamp = dep.stat().st_mtime + 10
+    utime(dep, (stamp, stamp))
+
+    assert LookupCache().get("key") is None
+    assert Toolchain(persist=True).lookup("key", lambda: ("third", [])) == "third"
+
+
+def test_toolchain_lookup_no_persist(cache_dir):
+    """
+    GIVEN: a Toolchain object with persist=False
+    WHEN: .lookup() is called
+    THEN: nothing should be saved to disk
+    """
+    Toolchain(persist=False).lookup("key", lambda: ("value", [sys.executable]))
+
+    assert not LookupCache().file.exists()
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from blueprint.trace import Tracer
+
+
+def test_tracer_disabled():
+    """
+    GIVEN: a Tracer that is not enabled
+    WHEN: a span is recorded
+    THEN: no events should be recorded
+    """
+    tracer = Tracer()
+    with tracer.span("step", "test") as span:
+        span["returncode"] = 0
+
+    assert tracer.events == []
+
+
+def test_tracer_span():
+    """
+    GIVEN: an enabled Tracer
+    WHEN: a span is recorded with args added inside the block
+    THEN: a complete event should be recorded with the args
+    """
+    tracer = Tracer(enabled=True)
+    with tracer.span("poetry", "run", command="poetry lock") as span:
+        span["returncode"] = 0
+
+    event, = tracer.events
+    assert event["name"] == "poetry"
+    assert event["cat"] == "run"
+    assert event["ph"] == "X"
+    assert event["dur"] >= 0
+    assert event["args"] == {"command": "poetry lock", "returncode": 0}
+
+
+def test_tracer_span_error():
+    """
+    GIVEN: an enabled Tracer
+    WHEN: the block of a span raises an exception
+    THEN: the exception should be re-raised
+    AND: the span should be recorded with the error
+    """
+    tracer = Tracer(enabled=True)
+    with pytest.raises(ValueError):
+        with tracer.span("step", "test"):
+            raise ValueError("oops")
+
+    assert tracer.events[0]["args"] == {"error": "ValueError: oops"}
+
+
+def test_tracer_write(tmp_path):
+    """
+    GIVEN: an enabled Tracer with recorded spans
+    WHEN: tracer.write() is called
+    THEN: a Chrome trace-event document should be written
+    """
+    tracer = Tracer(enabled=True)
+    with tracer.span("outer", "test"):
+        with tracer.span("inner", "test"):
+            pass
+
+    path = tmp_path / "trace.json"
+    tracer.write(path)
+
+    data = json.loads(path.read_text())
+    assert [e["name"] for e in data["traceEvents"]] == ["outer", "inner"]
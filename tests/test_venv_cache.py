@@ -0,0 +1,94 @@
+import json
+import sys
+from subprocess import run
+
+import pytest
+
+from blueprint.venv_cache import VenvCache, relocate
+
+bp = breakpoint
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Return a VenvCache in a temp dir."""
+    return VenvCache(tmp_path / "cache")
+
+
+def test_venv_cache(cache):
+    assert cache
+    assert cache.key("3.10.2", ["b", "a"]) == cache.key("3.10.2", ["a", "b"])
+    assert cache.key("3.10.2", ["a"]) != cache.key("3.11.1", ["a"])
+
+
+def test_venv_cache_relocate(tmp_path):
+    """
+    GIVEN: a venv with scripts that contain the original prefix
+    WHEN: relocate() is called
+    THEN: the prefix should be replaced with the new one
+    AND: the file mode should be preserved
+    AND: hardlinked copies of the file should not be modified
+    """
+    old, new = tmp_path / "old", tmp_path / "new"
+    (new / "bin").mkdir(parents=True)
+    script = new / "bin" / "pip"
+    script.write_text(f"#!{old}/bin/python\n")
+    script.chmod(0o755)
+    (new / "pyvenv.cfg").write_text(f"command = python -m venv {old}\n")
+    orig = tmp_path / "orig-pip"
+    orig.hardlink_to(script)
+
+    relocate(new, old, new)
+
+    assert script.read_text() == f"#!{new}/bin/python\n"
+    assert script.stat().st_mode & 0o777 == 0o755
+    assert (new / "pyvenv.cfg").read_text() == f"command = python -m venv {new}\n"
+    assert orig.read_text() == f"#!{old}/bin/python\n"
+
+
+def test_venv_cache_get_clone(cache, tmp_path):
+    """
+    GIVEN: an empty VenvCache
+    WHEN: .get() is called
+    THEN: a virtual env should be built
+    AND: calling .get() again should reuse it
+    WHEN: .clone() is called
+    THEN: a working copy should be made at the destination
+
+    NOTE: This one creates real virtual envs, so it's slow.
+    """
+    entry = cache.get(sys.executable, "test", [])
+    marker = entry / "marker"
+    marker.touch()
+
+    assert not cache.is_stale(entry, sys.executable, "test", [])
+    assert cache.get(sys.executable, "test", []) == entry
+    assert marker.exists()
+
+    dest = cache.clone(entry, tmp_path / "project" / ".venv")
+    res = run(
+        [dest / "bin" / "python", "-c", "import sys; print(sys.prefix)"],
+        capture_output=True,
+        text=True,
+    )
+
+    assert res.stdout.strip() == str(dest)
+    assert not (dest / cache.METADATA).exists()
+    assert str(entry) not in (dest / "bin" / "pip").read_text()
+
+
+def test_venv_cache_is_stale(cache):
+    """
+    GIVEN: a VenvCache entry built for a different dependency set
+    WHEN: .is_stale() is called
+    THEN: it should return True
+    """
+    entry = cache.path("entry")
+    (entry / "bin").mkdir(parents=True)
+    (entry / "bin" / "python").symlink_to(sys.executable)
+    meta = cache.metadata(sys.executable, "test", ["a"])
+    (entry / cache.METADATA).write_text(json.dumps(meta))
+
+    assert not cache.is_stale(entry, sys.executable, "test", ["a"])
+    assert cache.is_stale(entry, sys.executable, "test", ["a", "b"])
+    assert cache.is_stale(cache.path("missing"), sys.executable, "test", ["a"])
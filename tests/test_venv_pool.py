@@ -0,0 +1,225 @@
+import json
+import sys
+from subprocess import run
+from time import time
+
+import pytest
+
+from blueprint import venv_pool
+from blueprint.python_project import PythonProject
+from blueprint.venv_pool import VenvPool, alive
+
+bp = breakpoint
+
+# a pid that is higher than any process can have
+DEAD_PID = 2**22 + 1
+
+
+@pytest.fixture
+def pool(tmp_path):
+    """Return a VenvPool of size 1 in a temp dir."""
+    return VenvPool(tmp_path / "pool", size=1, max_age=1)
+
+
+def add_entry(pool, name, created=None, python=sys.executable, pyv="test"):
+    """Add a fake virtual env to pool that was made under a .tmp name."""
+    entry = pool.path(pyv) / name
+    tmp = entry.with_name(f"{name}.tmp")
+    (entry / "bin").mkdir(parents=True)
+    (entry / "bin" / "activate").write_text(
+        f"VIRTUAL_ENV={tmp}\nVIRTUAL_ENV_PROMPT=({tmp.name})\n"
+    )
+    (entry / "pyvenv.cfg").write_text(f"command = python -m venv {tmp}\n")
+    metadata = {
+        **pool.metadata(python, pyv),
+        "path": str(tmp),
+        "created": time() if created is None else created,
+    }
+    (entry / pool.METADATA).write_text(json.dumps(metadata))
+    return entry
+
+
+def test_alive():
+    """
+    GIVEN: the pid of this process, and one that can't exist
+    WHEN: alive() is called
+    THEN: it should return if the process is running
+    """
+    assert alive(venv_pool.getpid())
+    assert not alive(DEAD_PID)
+
+
+def test_venv_pool_settings(monkeypatch, tmp_path):
+    """
+    GIVEN: $BLUEPRINT_VENV_POOL_SIZE and $BLUEPRINT_VENV_POOL_MAX_AGE
+    WHEN: a VenvPool is created without size or max_age
+    THEN: they should be used
+    """
+    assert VenvPool(tmp_path).size == VenvPool.SIZE
+
+    monkeypatch.setenv("BLUEPRINT_VENV_POOL_SIZE", "5")
+    monkeypatch.setenv("BLUEPRINT_VENV_POOL_MAX_AGE", "0.5")
+    pool = VenvPool(tmp_path)
+
+    assert (pool.size, pool.max_age) == (5, 0.5)
+    assert VenvPool(tmp_path, size=1).size == 1
+
+
+def test_venv_pool_claim(pool, tmp_path):
+    """
+    GIVEN: a pool with virtual envs in it
+    WHEN: .claim() is called
+    THEN: the oldest one should be moved to dest
+    AND: the paths in it should be changed to dest
+    AND: the prompt should be changed from the build name to the prompt given
+    """
+    add_entry(pool, "2-1")
+    old = add_entry(pool, "1-1")
+    dest = tmp_path / "project" / ".venv"
+    dest.parent.mkdir()
+
+    assert pool.claim(sys.executable, "test", dest, "project") == dest
+
+    assert not old.exists()
+    assert [entry.name for entry in pool.entries("test")] == ["2-1"]
+    assert (dest / "bin" / "activate").read_text() == (
+        f"VIRTUAL_ENV={dest}\nVIRTUAL_ENV_PROMPT=(project)\n"
+    )
+    assert not (dest / pool.METADATA).exists()
+
+
+def test_venv_pool_claim_empty_or_stale(pool, tmp_path):
+    """
+    GIVEN: a pool with only a virtual env older than max_age
+    WHEN: .claim() is called
+    THEN: None should be returned
+    AND: the old virtual env should be removed
+    """
+    add_entry(pool, "1-1", created=time() - 2 * 24 * 60 * 60)
+
+    assert pool.claim(sys.executable, "test", tmp_path / ".venv") is None
+    assert pool.entries("test") == []
+    assert not (tmp_path / ".venv").exists()
+
+
+def test_venv_pool_evict(pool):
+    """
+    GIVEN: a pool with stale and extra virtual envs, and leftovers of a dead
+           build and claim
+    WHEN: .evict() is called
+    THEN: all but the newest good virtual env should be removed
+    """
+    stale = add_entry(pool, "1-1", python=venv_pool.__file__)
+    extra = add_entry(pool, "2-1")
+    newest = add_entry(pool, "3-1")
+    build = pool.path("test") / f"4-{DEAD_PID}.tmp"
+    claim = pool.path("test") / f"5-1.claimed-{DEAD_PID}"
+    running = pool.path("test") / f"6-{venv_pool.getpid()}.tmp"
+    for path in (build, claim, running):
+        path.mkdir()
+
+    removed = pool.evict(sys.executable, "test")
+
+    assert sorted(removed) == sorted([stale, extra, build, claim])
+    assert pool.entries("test") == [newest]
+    assert running.exists()
+
+
+def test_venv_pool_refill(pool, monkeypatch):
+    """
+    GIVEN: a VenvPool
+    WHEN: .refill() is called
+    THEN: `bp pool fill` should be started with the same settings
+    """
+    started = []
+    monkeypatch.setattr(venv_pool, "Popen", lambda cmd, **kw: started.append(cmd))
+
+    pool.refill("3.11.1")
+
+    assert started[0][1:] == [
+        "-m", "blueprint.cli", "pool", "fill", "--pyv", "3.11.1",
+        "--size", "1", "--max-age", "1", "--dir", str(pool.root),
+    ]
+
+
+def test_venv_pool_refill_filling(pool, monkeypatch):
+    """
+    GIVEN: a VenvPool that is being filled by another process
+    WHEN: .refill() is called
+    THEN: no process should be started
+    """
+    started = []
+    monkeypatch.setattr(venv_pool, "Popen", lambda cmd, **kw: started.append(cmd))
+
+    with pool.lock("3.11.1"):
+        code = (
+            "import sys; from blueprint.venv_pool import VenvPool; "
+            "print(VenvPool(sys.argv[1]).is_locked('3.11.1'))"
+        )
+        res = run([sys.executable, "-c", code, str(pool.root)],
+                  capture_output=True, text=True)
+
+    assert res.stdout.strip() == "True", res.stderr
+    assert not pool.is_locked("3.11.1")
+
+    monkeypatch.setattr(VenvPool, "is_locked", lambda self, key: True)
+    assert pool.refill("3.11.1") is None
+    assert not started
+
+
+def test_venv_pool_fill(pool, tmp_path):
+    """
+    GIVEN: an empty VenvPool
+    WHEN: .fill() is called
+    THEN: size virtual envs should be made
+    AND: a claimed one should work at its new path
+
+    NOTE: This one creates a real virtual env, so it's slow.
+    """
+    entries = pool.fill(sys.executable, "test")
+    assert len(entries) == 1
+    assert pool.fill(sys.executable, "test") == entries
+
+    dest = pool.claim(sys.executable, "test", tmp_path / ".venv")
+    res = run(
+        [dest / "bin" / "python", "-c", "import sys; print(sys.prefix)"],
+        capture_output=True,
+        text=True,
+    )
+
+    assert res.stdout.strip() == str(dest)
+    assert ".tmp" not in (dest / "bin" / "pip").read_text()
+    assert ".tmp" not in (dest / "bin" / "activate").read_text()
+    assert "(.venv)" in (dest / "bin" / "activate").read_text()
+
+
+def test_python_project_setup_venv_pool(tmp_path, monkeypatch):
+    """
+    GIVEN: a PythonProject with venv_pool set, and a pool with a virtual env
+    WHEN: .setup_venv_pool() is called
+    THEN: the virtual env should be moved into the project
+    AND: the pool should be filled again
+    WHEN: the pool is empty
+    THEN: it should not be filled again
+    """
+    monkeypatch.setattr(PythonProject, "python_where", sys.executable)
+    refilled = []
+    monkeypatch.setattr(VenvPool, "refill", lambda self, pyv: refilled.append(pyv))
+    add_entry(VenvPool(), "1-1", pyv="3.11.1")
+
+    project = PythonProject("my-project", tmp_path, pyv="3.11.1", venv_pool=True)
+    project.path.mkdir()
+
+    assert project.setup_venv_pool() == project.in_project_venv
+    assert (project.in_project_venv / "pyvenv.cfg").is_file()
+    activate = (project.in_project_venv / "bin" / "activate").read_text()
+    assert "VIRTUAL_ENV_PROMPT=(my-project)" in activate
+    assert refilled == ["3.11.1"]
+
+    assert PythonProject("other", tmp_path).setup_venv_pool() is None
+
+    empty = PythonProject("empty", tmp_path, pyv="3.11.1", venv_pool=True)
+    empty.path.mkdir()
+
+    assert empty.setup_venv_pool() is None
+    assert refilled == ["3.11.1"]
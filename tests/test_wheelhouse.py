@@ -0,0 +1,213 @@
+import csv
+import json
+import sys
+from subprocess import run
+from zipfile import ZipFile, ZipInfo
+
+import pytest
+
+from blueprint import ProgramError
+from blueprint.python_project import PythonProject
+from blueprint.wheelhouse import (Wheelhouse, install_wheel, locked_versions,
+                                  record_entry, site_packages)
+
+LOCKFILE = """\
+[[package]]
+name = "black"
+version = "24.2.0"
+
+[[package]]
+name = "mine"
+version = "0.1.0"
+
+[package.source]
+type = "directory"
+url = "../mine"
+
+[metadata]
+content-hash = "abc"
+"""
+
+
+def make_wheel(path, name="demo", version="1.0"):
+    """Write a wheel with a module, a script and a console script to path."""
+    wheel = path / f"{name}-{version}-py3-none-any.whl"
+    dist_info = f"{name}-{version}.dist-info"
+    script = ZipInfo(f"{name}-{version}.data/scripts/{name}-script")
+    script.external_attr = 0o755 << 16
+
+    with ZipFile(wheel, "w") as zf:
+        zf.writestr(f"{name}/__init__.py", "def main():\n    print('hello')\n")
+        zf.writestr(script, "#!python\nprint('script')\n")
+        zf.writestr(f"{dist_info}/METADATA", f"Name: {name}\nVersion: {version}\n")
+        zf.writestr(f"{dist_info}/entry_points.txt",
+                    f"[console_scripts]\n{name} = {name}:main\n")
+    return wheel
+
+
+@pytest.fixture
+def venv(tmp_path):
+    """Return a new virtual env without pip."""
+    path = tmp_path / "venv"
+    run([sys.executable, "-m", "venv", "--without-pip", str(path)], check=True)
+    return path
+
+
+def test_install_wheel(tmp_path, venv):
+    """
+    GIVEN: a wheel with a package, a data script and a console script
+    WHEN: install_wheel() is called
+    THEN: the package should be importable in the venv
+    AND: the scripts should be executable with the venv python
+    """
+    install_wheel(make_wheel(tmp_path), venv)
+
+    site = site_packages(venv)
+    assert (site / "demo" / "__init__.py").is_file()
+    assert (site / "demo-1.0.dist-info" / "INSTALLER").read_text() == "blueprint\n"
+
+    res = run([str(venv / "bin" / "demo")], capture_output=True, text=True)
+    assert res.stdout == "hello\n"
+
+    res = run([str(venv / "bin" / "demo-script")], capture_output=True, text=True)
+    assert res.stdout == "script\n"
+
+
+def test_install_wheel_record(tmp_path, venv):
+    """
+    GIVEN: a wheel with a data script and a console script
+    WHEN: install_wheel() is called
+    THEN: RECORD should list the generated console script and INSTALLER
+    AND: the data script with the shebang it was installed with
+    """
+    install_wheel(make_wheel(tmp_path), venv)
+
+    site = site_packages(venv)
+    with open(site / "demo-1.0.dist-info" / "RECORD", newline="") as fh:
+        rows = {row[0]: row for row in csv.reader(fh)}
+
+    for path in (venv / "bin" / "demo", venv / "bin" / "demo-script",
+                 site / "demo-1.0.dist-info" / "INSTALLER"):
+        expected = [str(x) for x in record_entry(path, path.read_bytes(), site)]
+        assert rows[expected[0]] == expected
+
+    assert rows["demo-1.0.dist-info/RECORD"] == ["demo-1.0.dist-info/RECORD", "", ""]
+
+
+def test_locked_versions(tmp_path):
+    """
+    GIVEN: a poetry.lock file with a package from an index and a local one
+    WHEN: locked_versions() is called
+    THEN: only the version of the package from the index should be returned
+    """
+    lockfile = tmp_path / "poetry.lock"
+    lockfile.write_text(LOCKFILE)
+
+    assert locked_versions(lockfile) == {"black": "24.2.0"}
+
+
+def test_wheelhouse_is_built(tmp_path):
+    """
+    GIVEN: a Wheelhouse built for a set of deps and a Python constraint
+    WHEN: Wheelhouse.is_built() is called
+    THEN: it should only be True for the same deps and constraint
+    """
+    wheelhouse = Wheelhouse(tmp_path / "wheels")
+    wheelhouse.path("3.11").mkdir(parents=True)
+    (wheelhouse.path("3.11") / Wheelhouse.METADATA).write_text(
+        json.dumps({"deps": ["a", "b"], "pyv_constraint": ">=3.11"})
+    )
+
+    assert wheelhouse.is_built("3.11", ["b", "a"], ">=3.11")
+    assert not wheelhouse.is_built("3.11", ["a"], ">=3.11")
+    assert not wheelhouse.is_built("3.11", ["a", "b"], ">=3.10")
+    assert not wheelhouse.is_built("3.10", ["a", "b"], ">=3.11")
+
+
+def test_python_project_setup_wheelhouse(tmp_path, monkeypatch):
+    """
+    GIVEN: a wheelhouse built for the dev dependencies of a python project
+    WHEN: setup_wheelhouse() and setup_poetry_lock() are called
+    THEN: the wheels should be installed in the project venv
+    AND: the lock file of the wheelhouse should be used without `poetry lock`
+    """
+    monkeypatch.setenv("BLUEPRINT_WHEELHOUSE", str(tmp_path / "wheels"))
+    project = PythonProject("myproject", tmp_path, wheelhouse=True)
+    wheelhouse = Wheelhouse()
+    path = wheelhouse.path(project.pyv)
+    path.mkdir(parents=True)
+    make_wheel(path)
+    wheelhouse.lockfile(project.pyv).write_text(LOCKFILE)
+    (path / Wheelhouse.METADATA).write_text(json.dumps({
+        "deps": sorted(project.DEV_DEPENDENCIES),
+        "pyv_constraint": project.pyv_constraint,
+    }))
+    run([sys.executable, "-m", "venv", "--without-pip",
+         str(project.in_project_venv)], check=True)
+    monkeypatch.setattr(project, "run", lambda *args: pytest.fail("ran poetry"))
+
+    project.setup_wheelhouse()
+    project.setup_poetry_lock()
+
+    assert (site_packages(project.in_project_venv) / "demo").is_dir()
+    assert project.lockfile.read_text() == LOCKFILE
+
+
+def test_python_project_setup_wheelhouse_stale(tmp_path, monkeypatch):
+    """
+    GIVEN: a wheelhouse built for other dev dependencies
+    WHEN: setup_wheelhouse() is called
+    THEN: a ProgramError should be raised instead of installing it
+    """
+    monkeypatch.setenv("BLUEPRINT_WHEELHOUSE", str(tmp_path / "wheels"))
+    project = PythonProject("myproject", tmp_path, wheelhouse=True)
+    path = Wheelhouse().path(project.pyv)
+    path.mkdir(parents=True)
+    make_wheel(path)
+    (path / Wheelhouse.METADATA).write_text(json.dumps({"deps": ["black"]}))
+
+    with pytest.raises(ProgramError, match="bp wheelhouse build"):
+        project.setup_wheelhouse()
+
+
+def test_wheelhouse_install(tmp_path, venv):
+    """
+    GIVEN: a Wheelhouse with several wheels for a Python version
+    WHEN: Wheelhouse.install() is called
+    THEN: every wheel should be installed in the venv
+    """
+    wheelhouse = Wheelhouse(tmp_path / "wheels")
+    path = wheelhouse.path("3.11")
+    path.mkdir(parents=True)
+    for name in ("one", "two", "three"):
+        make_wheel(path, name)
+    (path / Wheelhouse.METADATA).write_text(json.dumps({"deps": ["one"]}))
+
+    wheelhouse.install(venv, "3.11", jobs=2)
+
+    assert wheelhouse.is_built("3.11", ["one"])
+    site = site_packages(venv)
+    assert {p.name for p in site.glob("*.dist-info")} == {
+        "one-1.0.dist-info", "two-1.0.dist-info", "three-1.0.dist-info"
+    }
+
+
+def test_wheelhouse_install_not_built(tmp_path, venv):
+    """
+    GIVEN: a Wheelhouse that has not been built
+    WHEN: Wheelhouse.install() is called
+    THEN: a ProgramError should be raised
+    """
+    with pytest.raises(ProgramError, match="bp wheelhouse build"):
+        Wheelhouse(tmp_path / "wheels").install(venv, "3.11")
+
+
+def test_wheelhouse_root(tmp_path, monkeypatch):
+    """
+    GIVEN: $BLUEPRINT_WHEELHOUSE is set
+    WHEN: a Wheelhouse is created without a root
+    THEN: its root should be the directory from the environment
+    """
+    monkeypatch.setenv("BLUEPRINT_WHEELHOUSE", str(tmp_path))
+
+    assert Wheelhouse().root == tmp_path